@@ -0,0 +1,383 @@
+"""
+Config-driven leaderboard registry and generic runner.
+
+Each leaderboard is declared in a `leaderboard.toml` next to its adapters
+(`analyzer/src/leaderboards/<id>/leaderboard.toml`): the leaderboard class,
+its datasets with their eval-name mapping, the leaderboard JSONL and the
+metric list. Classes are named as "module:Class" strings and imported only
+when a run instantiates them, so a run only parses the config of the
+leaderboard it asks for and only imports the adapters and metrics of the
+datasets and metrics it selects.
+
+Usage:
+    python -m analyzer.src.automation.registry list
+    python -m analyzer.src.automation.registry run helm --datasets boolq,mmlu
+    python -m analyzer.src.automation.registry run hf_openllm_v2 --metrics top_5_models
+    python -m analyzer.src.automation.registry run helm --profile results/run_profile.json --trace results/run_trace.json
+"""
+
+import argparse
+import importlib
+import json
+import os
+import sys
+from contextlib import nullcontext
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+if sys.version_info >= (3, 11):
+    import tomllib
+else:
+    import tomli as tomllib
+
+from analyzer.src.automation.runner import EXECUTORS, failed_datasets, run_leaderboard
+from analyzer.src.metrics.base import Dataset, Leaderboard, Metric
+from analyzer.src.processing.result_cache import get_default_cache
+from analyzer.src.processing.run_profile import profile_run, profiled, stage
+
+PROJECT_ROOT = Path(__file__).resolve().parents[3]
+LEADERBOARDS_DIR = Path(__file__).resolve().parents[1] / "leaderboards"
+CONFIG_NAME = "leaderboard.toml"
+
+# Leaderboard-level values a metric can ask for through `context`
+CONTEXT_KEYS = ("jsonl_path", "output_dir", "dataset_to_eval_map")
+# Dataset entry keys consumed by the registry rather than the dataset class
+_DATASET_SPEC_KEYS = ("class", "catalog_key", "eval_name", "allow_missing_metadata")
+_METRIC_SPEC_KEYS = ("class", "context", "enabled")
+
+
+def import_object(path: str) -> Any:
+    """
+    Import an object named as "package.module:attribute".
+
+    Args:
+        path: Dotted module path and attribute, separated by a colon
+
+    Returns:
+        Any: The imported attribute
+    """
+    module_name, _, attribute = path.partition(":")
+    if not attribute:
+        raise ValueError(f"Expected 'module:attribute', got {path!r}")
+    return getattr(importlib.import_module(module_name), attribute)
+
+
+def _resolve_path(path: str) -> str:
+    return str(PROJECT_ROOT / path)
+
+
+def list_leaderboards() -> List[str]:
+    """
+    List registered leaderboard ids (directories with a leaderboard.toml).
+
+    Returns:
+        List[str]: Sorted leaderboard ids
+    """
+    return sorted(path.parent.name for path in LEADERBOARDS_DIR.glob(f"*/{CONFIG_NAME}"))
+
+
+def load_config(leaderboard_id: str) -> Dict[str, Any]:
+    """
+    Read one leaderboard's config.
+
+    Args:
+        leaderboard_id: Directory name under analyzer/src/leaderboards, e.g. "helm"
+
+    Returns:
+        Dict with "leaderboard", "datasets" and "metrics" entries
+
+    Raises:
+        KeyError: If no such leaderboard is registered
+    """
+    path = LEADERBOARDS_DIR / leaderboard_id / CONFIG_NAME
+    if not path.is_file():
+        raise KeyError(
+            f"Unknown leaderboard {leaderboard_id!r}, expected one of {list_leaderboards()}"
+        )
+    with open(path, "rb") as f:
+        config = tomllib.load(f)
+    config.setdefault("datasets", [])
+    config.setdefault("metrics", [])
+    return config
+
+
+def list_output_dirs() -> List[str]:
+    """
+    List the trajectory output directories of all registered leaderboards.
+
+    Returns:
+        List[str]: Resolved output_dir paths, without duplicates
+    """
+    dirs = []
+    for leaderboard_id in list_leaderboards():
+        spec = load_config(leaderboard_id)["leaderboard"]
+        if "output_dir" in spec and _resolve_path(spec["output_dir"]) not in dirs:
+            dirs.append(_resolve_path(spec["output_dir"]))
+    return dirs
+
+
+def _select(specs: List[Dict[str, Any]], names: Optional[Sequence[str]], kind: str) -> List[Dict[str, Any]]:
+    if names is None:
+        return [spec for spec in specs if spec.get("enabled", True)]
+    by_name = {spec["name"]: spec for spec in specs}
+    unknown = [name for name in names if name not in by_name]
+    if unknown:
+        raise KeyError(f"Unknown {kind} {unknown}, expected some of {list(by_name)}")
+    return [by_name[name] for name in names]
+
+
+def build_leaderboard(
+    config: Dict[str, Any], datasets: Optional[Sequence[str]] = None
+) -> Tuple[Leaderboard, Dict[str, str]]:
+    """
+    Instantiate a leaderboard and the selected datasets, loading their metadata.
+
+    Datasets whose metadata is missing from the catalog are skipped with a
+    warning, unless their entry sets `allow_missing_metadata`.
+
+    Args:
+        config: Leaderboard config from load_config
+        datasets: Dataset names to include (None for all)
+
+    Returns:
+        (leaderboard, dataset_to_eval_map) for the datasets that were added
+    """
+    spec = config["leaderboard"]
+    leaderboard_cls = import_object(spec["class"])
+    leaderboard = leaderboard_cls(name=spec["name"], description=spec.get("description", ""))
+    static_data_path = spec.get("static_data_path")
+
+    dataset_to_eval_map = {}
+    for dataset_spec in _select(config["datasets"], datasets, "datasets"):
+        kwargs = {key: value for key, value in dataset_spec.items() if key not in _DATASET_SPEC_KEYS}
+        if static_data_path and "static_data_path" not in kwargs:
+            kwargs["static_data_path"] = _resolve_path(static_data_path)
+        dataset_cls = import_object(dataset_spec["class"])
+        dataset: Dataset = dataset_cls(**kwargs)
+
+        catalog_key = dataset_spec.get("catalog_key", dataset.hf_dataset_id)
+        try:
+            with stage("download", dataset=dataset.name):
+                catalog = dataset.download()
+            if catalog_key in catalog:
+                with stage("process", dataset=dataset.name):
+                    dataset.process(catalog[catalog_key])
+            elif dataset_spec.get("allow_missing_metadata"):
+                with stage("process", dataset=dataset.name):
+                    dataset.process({})
+            else:
+                print(f"✗ Warning: No metadata found for {catalog_key}")
+                continue
+        except Exception as e:
+            print(f"✗ Error processing {dataset.name}: {e}")
+            continue
+
+        leaderboard.add_dataset(dataset)
+        if "eval_name" in dataset_spec:
+            dataset_to_eval_map[dataset.name] = dataset_spec["eval_name"]
+    return leaderboard, dataset_to_eval_map
+
+
+def build_metrics(
+    config: Dict[str, Any],
+    dataset_to_eval_map: Dict[str, str],
+    metrics: Optional[Sequence[str]] = None,
+) -> List[Metric]:
+    """
+    Instantiate the selected metrics.
+
+    Args:
+        config: Leaderboard config from load_config
+        dataset_to_eval_map: Eval names of the datasets being run
+        metrics: Metric names to include (None for every enabled metric)
+
+    Returns:
+        List[Metric]: Metrics in config order (or the order they were asked for)
+    """
+    spec = config["leaderboard"]
+    context = {
+        "jsonl_path": _resolve_path(spec["jsonl_path"]) if "jsonl_path" in spec else None,
+        "output_dir": _resolve_path(spec["output_dir"]) if "output_dir" in spec else None,
+        "dataset_to_eval_map": dataset_to_eval_map,
+    }
+
+    instances = []
+    for metric_spec in _select(config["metrics"], metrics, "metrics"):
+        kwargs = {key: value for key, value in metric_spec.items() if key not in _METRIC_SPEC_KEYS}
+        for key in metric_spec.get("context", ()):
+            if key not in CONTEXT_KEYS:
+                raise KeyError(f"Metric {metric_spec['name']!r} asks for unknown context {key!r}")
+            kwargs[key] = context[key]
+        instances.append(import_object(metric_spec["class"])(**kwargs))
+    return instances
+
+
+@profiled("export_csv")
+def export_results_csv(metrics_data: Dict[str, Dict[str, Any]], filename: str) -> None:
+    """
+    Export metric results to CSV, one row per dataset and one column per metric.
+
+    List and dict values are written as JSON strings.
+
+    Args:
+        metrics_data: {metric_name: {dataset_name: value}}
+        filename: Output CSV filename
+    """
+    import pandas as pd
+
+    dataset_names = list(dict.fromkeys(
+        dataset_name for metric_result in metrics_data.values() for dataset_name in metric_result
+    ))
+    rows = []
+    for dataset_name in dataset_names:
+        row = {"dataset": dataset_name}
+        for metric_name, metric_result in metrics_data.items():
+            value = metric_result.get(dataset_name)
+            row[metric_name] = json.dumps(value) if isinstance(value, (list, dict)) else value
+        rows.append(row)
+
+    df = pd.DataFrame(rows, columns=["dataset"] + list(metrics_data))
+    df.to_csv(filename, index=False)
+    print(f"\n✓ Metrics exported to {filename}")
+    print(f"  DataFrame shape: {df.shape}")
+
+
+def run_registered_leaderboard(
+    leaderboard_id: str,
+    datasets: Optional[Sequence[str]] = None,
+    metrics: Optional[Sequence[str]] = None,
+    executor: str = "thread",
+    max_workers: Optional[int] = None,
+    output_csv: Optional[str] = None,
+    use_cache: bool = True,
+    profile_path: Optional[str] = None,
+    trace_path: Optional[str] = None,
+    print_rankings: Optional[bool] = None,
+) -> Dict[str, Dict[str, Any]]:
+    """
+    Build a registered leaderboard and run its metrics.
+
+    Cacheable metrics reuse results from the process-wide result cache
+    (analyzer.src.processing.result_cache) when their parameters, the
+    dataset metadata and the leaderboard dump are unchanged.
+
+    With a profile or trace path, the run records per-stage timings and
+    memory (analyzer.src.processing.run_profile): dataset download and
+    processing, each metric task, the JSONL parse, window computation and
+    the export.
+
+    Args:
+        leaderboard_id: Registered leaderboard, e.g. "helm"
+        datasets: Dataset names to run (None for all)
+        metrics: Metric names to run (None for every enabled metric)
+        executor: "thread", "process" or "serial"
+        max_workers: Pool size (None lets the pool decide)
+        output_csv: CSV to write (defaults to the config's output_csv, relative
+            to the project root; "" to skip)
+        use_cache: Reuse and store cached results (METRIC_CACHE=off also disables it)
+        profile_path: Write a JSON run profile here (defaults to ANALYZER_PROFILE)
+        trace_path: Write a Chrome trace here (defaults to ANALYZER_TRACE)
+        print_rankings: Print the leaderboard's compute_rankings() after the
+            run (defaults to the config's print_rankings)
+
+    Returns:
+        Dict of {metric_name: {dataset_name: result}}
+    """
+    profile_path = profile_path or os.environ.get("ANALYZER_PROFILE")
+    trace_path = trace_path or os.environ.get("ANALYZER_TRACE")
+    with profile_run(profile_path, trace_path) if profile_path or trace_path else nullcontext():
+        return _run(
+            leaderboard_id, datasets, metrics, executor, max_workers, output_csv, use_cache, print_rankings
+        )
+
+
+def _run(
+    leaderboard_id: str,
+    datasets: Optional[Sequence[str]],
+    metrics: Optional[Sequence[str]],
+    executor: str,
+    max_workers: Optional[int],
+    output_csv: Optional[str],
+    use_cache: bool,
+    print_rankings: Optional[bool],
+) -> Dict[str, Dict[str, Any]]:
+    config = load_config(leaderboard_id)
+    leaderboard, dataset_to_eval_map = build_leaderboard(config, datasets)
+    print(f"Loaded {len(leaderboard.datasets)} datasets for {leaderboard.name}")
+    metric_objects = build_metrics(config, dataset_to_eval_map, metrics)
+
+    cache = get_default_cache() if use_cache else None
+    hits_before = cache.hits if cache is not None else 0
+    results = run_leaderboard(
+        leaderboard, metric_objects, executor=executor, max_workers=max_workers, cache=cache
+    )
+    if cache is not None and cache.hits > hits_before:
+        print(f"✓ Reused {cache.hits - hits_before} cached results")
+    for metric_name, metric_results in results.items():
+        failed = failed_datasets(metric_results)
+        for dataset_name in failed:
+            error = metric_results[dataset_name]["error"]
+            print(f"✗ Error running metric {metric_name} on {dataset_name}: {error}")
+        if not failed:
+            print(f"✓ {metric_name}")
+
+    if print_rankings is None:
+        print_rankings = config["leaderboard"].get("print_rankings", False)
+    if print_rankings:
+        print(f"\n=== {leaderboard.name} Dataset Rankings ===")
+        print(leaderboard.compute_rankings())
+
+    if output_csv is None and config["leaderboard"].get("output_csv"):
+        output_csv = _resolve_path(config["leaderboard"]["output_csv"])
+    if output_csv:
+        export_results_csv(results, output_csv)
+    return results
+
+
+def _split_names(value: Optional[str]) -> Optional[List[str]]:
+    return [name.strip() for name in value.split(",") if name.strip()] if value else None
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run registered leaderboards")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    subparsers.add_parser("list", help="List registered leaderboards")
+    run_parser = subparsers.add_parser("run", help="Run a leaderboard's metrics")
+    run_parser.add_argument("leaderboard", help="Leaderboard id, e.g. helm")
+    run_parser.add_argument("--datasets", help="Comma-separated dataset names (default: all)")
+    run_parser.add_argument("--metrics", help="Comma-separated metric names (default: all enabled)")
+    run_parser.add_argument("--executor", choices=EXECUTORS, default="thread")
+    run_parser.add_argument("--workers", type=int, default=None, help="Pool size")
+    run_parser.add_argument("--output", default=None, help="Output CSV (default from the config)")
+    run_parser.add_argument("--no-cache", action="store_true", help="Recompute every metric")
+    run_parser.add_argument("--profile", default=None, help="Write a JSON run profile here")
+    run_parser.add_argument("--trace", default=None, help="Write a Chrome trace here")
+    run_parser.add_argument(
+        "--rankings",
+        action=argparse.BooleanOptionalAction,
+        default=None,
+        help="Print the leaderboard's dataset rankings (default from the config)",
+    )
+    args = parser.parse_args()
+
+    if args.command == "list":
+        for leaderboard_id in list_leaderboards():
+            print(leaderboard_id)
+        return
+
+    run_registered_leaderboard(
+        args.leaderboard,
+        datasets=_split_names(args.datasets),
+        metrics=_split_names(args.metrics),
+        executor=args.executor,
+        max_workers=args.workers,
+        output_csv=args.output,
+        use_cache=not args.no_cache,
+        profile_path=args.profile,
+        trace_path=args.trace,
+        print_rankings=args.rankings,
+    )
+
+
+if __name__ == "__main__":
+    main()
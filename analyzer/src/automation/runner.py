@@ -0,0 +1,290 @@
+"""
+Parallel execution engine for metric runs.
+
+Every metric in this project computes each dataset independently, so a
+leaderboard run is a flat set of (metric, dataset) tasks with no
+dependencies between them. This module builds that task list for one or
+more leaderboards, runs it on a thread or process pool, and merges the
+results back into the usual {metric_name: {dataset_name: value}} shape in a
+deterministic order. Given a ResultCache, tasks whose inputs haven't changed
+are answered from it and only the rest are run. Under an active run profile
+(analyzer.src.processing.run_profile), each task and cache lookup is timed as
+a stage, including tasks run in pool workers.
+"""
+
+import os
+from concurrent.futures import Executor, ThreadPoolExecutor
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from analyzer.src.metrics.base import Dataset, Leaderboard, Metric
+from analyzer.src.processing.result_cache import ResultCache, result_key
+from analyzer.src.processing.run_profile import RunProfiler, get_profiler, stage
+
+EXECUTORS = ("thread", "process", "serial")
+
+_MISSING = object()
+
+
+class MetricTask:
+    """
+    One unit of work: a single metric on a single dataset.
+    """
+
+    __slots__ = ("leaderboard_name", "metric", "dataset")
+
+    def __init__(self, leaderboard_name: str, metric: Metric, dataset: Dataset):
+        self.leaderboard_name = leaderboard_name
+        self.metric = metric
+        self.dataset = dataset
+
+    @property
+    def key(self) -> Tuple[str, str, str]:
+        """(leaderboard, metric, dataset) names identifying the task."""
+        return (self.leaderboard_name, self.metric.name, self.dataset.name)
+
+    def __repr__(self) -> str:
+        return f"MetricTask{self.key}"
+
+
+def build_tasks(
+    jobs: Sequence[Tuple[Leaderboard, Sequence[Metric]]],
+) -> List[MetricTask]:
+    """
+    Expand leaderboards and their metrics into independent tasks.
+
+    Tasks are ordered leaderboard by leaderboard, then metric by metric, then
+    by the leaderboard's dataset order; results are merged in the same order.
+
+    Args:
+        jobs: (leaderboard, metrics) pairs to run
+
+    Returns:
+        List[MetricTask]: One task per (leaderboard, metric, dataset)
+    """
+    tasks = []
+    for leaderboard, metrics in jobs:
+        datasets = list(leaderboard.datasets.values())
+        for metric in metrics:
+            for dataset in datasets:
+                tasks.append(MetricTask(leaderboard.name, metric, dataset))
+    return tasks
+
+
+def _run_task(metric: Metric, dataset: Dataset) -> Tuple[bool, Any]:
+    """
+    Run one metric on one dataset, capturing failures as values.
+
+    Module-level so it can be pickled for process pools.
+    """
+    try:
+        return True, metric.run_on_dataset(dataset)
+    except Exception as e:
+        return False, {"error": str(e)}
+
+
+def _run_batch(metric: Metric, datasets: Sequence[Dataset]) -> List[Tuple[bool, Any]]:
+    """
+    Run a batched metric on several datasets at once, capturing failures as values.
+
+    A failure fails every dataset of the batch. Module-level so it can be
+    pickled for process pools.
+    """
+    if len(datasets) == 1 and not metric.batched:
+        return [_run_task(metric, datasets[0])]
+    try:
+        return [(True, value) for value in metric.run_batch(datasets)]
+    except Exception as e:
+        return [(False, {"error": str(e)})] * len(datasets)
+
+
+def _run_profiled_batch(
+    metric: Metric, datasets: Sequence[Dataset]
+) -> Tuple[List[Tuple[bool, Any]], Dict[str, Any]]:
+    """
+    Run tasks under a profiler of their own and return its profile too.
+
+    Pool workers don't see the run's profiler (threads start with an empty
+    context, processes with a copy), so the caller merges the snapshot.
+    """
+    profiler = RunProfiler()
+    dataset_name = datasets[0].name if len(datasets) == 1 else None
+    with profiler.activate(), profiler.stage("metric", metric.name, dataset_name):
+        outcomes = _run_batch(metric, datasets)
+    return outcomes, profiler.snapshot()
+
+
+def _group_batches(pending: Sequence[MetricTask]) -> List[List[MetricTask]]:
+    # Batched metrics get one unit per (leaderboard, metric); others one per task
+    units: List[List[MetricTask]] = []
+    batches: Dict[Tuple[str, int], List[MetricTask]] = {}
+    for task in pending:
+        if not task.metric.batched:
+            units.append([task])
+            continue
+        key = (task.leaderboard_name, id(task.metric))
+        if key not in batches:
+            batches[key] = []
+            units.append(batches[key])
+        batches[key].append(task)
+    return units
+
+
+def _make_executor(executor: str, max_workers: Optional[int]) -> Optional[Executor]:
+    if executor not in EXECUTORS:
+        raise ValueError(f"Unknown executor {executor!r}, expected one of {EXECUTORS}")
+    if executor == "serial" or max_workers == 1:
+        return None
+    if executor == "process":
+        # Imported here: it pulls in multiprocessing, which thread runs never need
+        from concurrent.futures import ProcessPoolExecutor
+
+        return ProcessPoolExecutor(max_workers=max_workers)
+    return ThreadPoolExecutor(max_workers=max_workers or min(32, (os.cpu_count() or 1) + 4))
+
+
+def run_tasks(
+    tasks: Sequence[MetricTask],
+    executor: str = "thread",
+    max_workers: Optional[int] = None,
+    cache: Optional[ResultCache] = None,
+) -> Dict[Tuple[str, str, str], Tuple[bool, Any]]:
+    """
+    Execute tasks and collect their outcomes.
+
+    Cacheable metrics are looked up in `cache` first. Only misses are sent
+    to the pool, and their successful results are stored afterwards. A
+    batched metric's pending datasets are sent as one unit per leaderboard
+    and run through Metric.run_batch.
+
+    Args:
+        tasks: Tasks to run
+        executor: "thread", "process" or "serial"
+        max_workers: Pool size (None lets the pool decide)
+        cache: Result cache to read and fill (None to run every task)
+
+    Returns:
+        Dict mapping each task key to (succeeded, result or error dict)
+    """
+    outcomes: Dict[Tuple[str, str, str], Tuple[bool, Any]] = {}
+    cache_keys: Dict[Tuple[str, str, str], str] = {}
+    pending = []
+    profiler = get_profiler()
+    for task in tasks:
+        if cache is not None and task.metric.cacheable:
+            with stage("cache_lookup", task.metric.name, task.dataset.name):
+                cache_key = result_key(task.metric, task.dataset)
+                value = cache.get(cache_key, _MISSING)
+            if value is not _MISSING and task.metric.accepts_cached(value):
+                outcomes[task.key] = (True, value)
+                continue
+            cache_keys[task.key] = cache_key
+        pending.append(task)
+
+    units = _group_batches(pending)
+    pool = _make_executor(executor, max_workers) if units else None
+    if pool is None:
+        for unit in units:
+            metric = unit[0].metric
+            dataset_name = unit[0].dataset.name if len(unit) == 1 else None
+            with stage("metric", metric.name, dataset_name):
+                unit_outcomes = _run_batch(metric, [task.dataset for task in unit])
+            outcomes.update(zip((task.key for task in unit), unit_outcomes))
+    else:
+        run = _run_batch if profiler is None else _run_profiled_batch
+        with pool:
+            futures = [
+                (unit, pool.submit(run, unit[0].metric, [task.dataset for task in unit]))
+                for unit in units
+            ]
+            for unit, future in futures:
+                if profiler is None:
+                    unit_outcomes = future.result()
+                else:
+                    unit_outcomes, snapshot = future.result()
+                    profiler.merge(snapshot)
+                outcomes.update(zip((task.key for task in unit), unit_outcomes))
+
+    for key, cache_key in cache_keys.items():
+        succeeded, value = outcomes[key]
+        if succeeded:
+            cache.set(cache_key, value)
+    return {task.key: outcomes[task.key] for task in tasks}
+
+
+def run_leaderboards(
+    jobs: Sequence[Tuple[Leaderboard, Sequence[Metric]]],
+    executor: str = "thread",
+    max_workers: Optional[int] = None,
+    cache: Optional[ResultCache] = None,
+) -> Dict[str, Dict[str, Dict[str, Any]]]:
+    """
+    Run metrics over several leaderboards on one shared pool.
+
+    Note:
+        With the "process" executor each task runs on a pickled copy of its
+        metric, so state a metric keeps in memory while running stays in the
+        worker process. UpdatableMetric history goes to its persistent
+        backend and is shared, except with InMemoryHistory.
+
+    Args:
+        jobs: (leaderboard, metrics) pairs to run
+        executor: "thread", "process" or "serial"
+        max_workers: Pool size (None lets the pool decide)
+        cache: Result cache to read and fill (None to run every task)
+
+    Returns:
+        Dict of {leaderboard_name: {metric_name: {dataset_name: result}}}.
+        A failed task's result is {"error": message}.
+    """
+    tasks = build_tasks(jobs)
+    outcomes = run_tasks(tasks, executor=executor, max_workers=max_workers, cache=cache)
+
+    results: Dict[str, Dict[str, Dict[str, Any]]] = {}
+    for leaderboard, metrics in jobs:
+        results[leaderboard.name] = {metric.name: {} for metric in metrics}
+    for task in tasks:
+        leaderboard_name, metric_name, dataset_name = task.key
+        results[leaderboard_name][metric_name][dataset_name] = outcomes[task.key][1]
+    return results
+
+
+def run_leaderboard(
+    leaderboard: Leaderboard,
+    metrics: Sequence[Metric],
+    executor: str = "thread",
+    max_workers: Optional[int] = None,
+    cache: Optional[ResultCache] = None,
+) -> Dict[str, Dict[str, Any]]:
+    """
+    Run metrics over every dataset of one leaderboard in parallel.
+
+    Args:
+        leaderboard: The leaderboard to analyze
+        metrics: Metrics to run
+        executor: "thread", "process" or "serial"
+        max_workers: Pool size (None lets the pool decide)
+        cache: Result cache to read and fill (None to run every task)
+
+    Returns:
+        Dict of {metric_name: {dataset_name: result}}, ordered like `metrics`
+        and the leaderboard's datasets
+    """
+    results = run_leaderboards([(leaderboard, metrics)], executor, max_workers, cache=cache)
+    return results[leaderboard.name]
+
+
+def failed_datasets(metric_results: Dict[str, Any]) -> List[str]:
+    """
+    List datasets whose result for a metric is an error placeholder.
+
+    Args:
+        metric_results: {dataset_name: result} for one metric
+
+    Returns:
+        List[str]: Names of datasets that failed
+    """
+    return [
+        dataset_name
+        for dataset_name, value in metric_results.items()
+        if isinstance(value, dict) and set(value) == {"error"}
+    ]
@@ -0,0 +1,487 @@
+"""
+Catalog-wide saturation sweep.
+
+The registry runs the handful of datasets wired into each leaderboard. This
+module instead visits every record of the metadata catalog
+(`data/all_datasets.json`, or its JSON Lines / Arrow variants) as a
+CatalogDataset and runs the static and popularity metrics over it in
+batches. Each batch is computed with the metrics' `run_batch` (array
+operations, one history write per metric) and streamed to its own part file,
+so memory is bounded by the batch size rather than the catalog size.
+
+Datasets that back an evaluation in a registered leaderboard also get their
+saturation index, computed in one vectorized pass per batch. Every row gets
+a popularity decay: how far downloads have fallen since the previous sweep
+or refresh recorded them. The popularity metrics key their history by
+hf_dataset_id, so values recorded through a leaderboard adapter and through
+the sweep's CatalogDataset are one series.
+
+Output (one row per dataset):
+    results/catalog_sweep/part-00000.parquet, part-00001.parquet, ...
+    results/catalog_sweep/_manifest.json
+
+Usage:
+    python -m analyzer.src.automation.sweep
+    python -m analyzer.src.automation.sweep --catalog data/all_datasets.jsonl --format jsonl
+    python -m analyzer.src.automation.sweep --batch-size 2000 --no-history
+"""
+
+import argparse
+import datetime
+import json
+import os
+import time
+from pathlib import Path
+from typing import Any, Dict, List, NamedTuple, Optional, Sequence
+
+import numpy as np
+
+from analyzer.src.automation.registry import PROJECT_ROOT, list_leaderboards, load_config
+from analyzer.src.leaderboards.catalog_dataset import DEFAULT_CATALOG_PATH, CatalogDataset
+from analyzer.src.metrics.base import Metric
+from analyzer.src.metrics.dynamic.base import metadata_column
+from analyzer.src.metrics.dynamic.dataset_downloads_metric import DatasetDownloadsMetric
+from analyzer.src.metrics.dynamic.dataset_freshness_metric import DatasetFreshnessMetric
+from analyzer.src.metrics.dynamic.dataset_likes_metric import DatasetLikesMetric
+from analyzer.src.metrics.dynamic.saturation_utils import (
+    SATURATION_CATEGORIES,
+    compute_saturation_metrics_batch,
+)
+from analyzer.src.metrics.dynamic.trending_score_metric import TrendingScoreMetric
+from analyzer.src.metrics.static.created_at_metric import CreatedAtMetric
+from analyzer.src.metrics.static.is_public_metric import IsPublicMetric
+from analyzer.src.metrics.static.language_metric import LanguageMetric
+from analyzer.src.metrics.static.modality_detail_metric import ModalityMetric
+from analyzer.src.metrics.static.task_category_metric import TaskCategoryMetric
+from analyzer.src.metrics.static.total_len_dataset_metric import TotalLenDatasetMetric
+from analyzer.src.processing.hub_metadata import load_refreshed_catalog
+from analyzer.src.processing.leaderboard_store import load_leaderboard_table
+from analyzer.src.processing.metric_history import HistoryBackend, InMemoryHistory
+from analyzer.src.processing.run_profile import profiled
+from analyzer.src.processing.split_sizes import eval_split_size, get_split_sizes
+
+DEFAULT_OUTPUT_DIR = PROJECT_ROOT / "results" / "catalog_sweep"
+DEFAULT_BATCH_SIZE = 5000
+FORMATS = ("parquet", "jsonl")
+MANIFEST_NAME = "_manifest.json"
+
+
+class SaturationTarget(NamedTuple):
+    """Where a catalog dataset's leaderboard scores live."""
+
+    leaderboard_id: str
+    jsonl_path: str
+    eval_name: str
+
+
+def default_metrics(history: Optional[HistoryBackend] = None) -> List[Metric]:
+    """
+    Build the metrics a sweep runs by default.
+
+    Args:
+        history: History backend for the popularity metrics (defaults to the
+            process-wide one)
+
+    Returns:
+        List[Metric]: Static metrics, then the popularity metrics
+    """
+    return [
+        LanguageMetric("language"),
+        ModalityMetric("modality"),
+        IsPublicMetric("is_public"),
+        CreatedAtMetric("created_at"),
+        TaskCategoryMetric("task_categories"),
+        TotalLenDatasetMetric("total_samples"),
+        DatasetDownloadsMetric(history=history),
+        DatasetLikesMetric(history=history),
+        TrendingScoreMetric(history=history),
+        DatasetFreshnessMetric(history=history),
+    ]
+
+
+def load_saturation_targets(
+    leaderboard_ids: Optional[Sequence[str]] = None,
+) -> Dict[str, SaturationTarget]:
+    """
+    Map catalog datasetIds to the leaderboard evaluations that score them.
+
+    Only the leaderboard configs are read. When several leaderboards score the
+    same dataset, the first registered one wins.
+
+    Args:
+        leaderboard_ids: Leaderboards to use (None for every registered one)
+
+    Returns:
+        Dict mapping datasetId to its SaturationTarget
+    """
+    targets: Dict[str, SaturationTarget] = {}
+    for leaderboard_id in list_leaderboards() if leaderboard_ids is None else leaderboard_ids:
+        config = load_config(leaderboard_id)
+        jsonl_path = config["leaderboard"].get("jsonl_path")
+        if not jsonl_path:
+            continue
+        for spec in config["datasets"]:
+            catalog_key = spec.get("catalog_key", spec.get("hf_dataset_id"))
+            if catalog_key and spec.get("eval_name"):
+                targets.setdefault(
+                    catalog_key,
+                    SaturationTarget(leaderboard_id, str(PROJECT_ROOT / jsonl_path), spec["eval_name"]),
+                )
+    return targets
+
+
+class CatalogSweep:
+    """
+    One sweep over a catalog: batches datasets, runs metrics, writes parts.
+    """
+
+    def __init__(
+        self,
+        catalog_path: Optional[str] = None,
+        output_dir: Optional[str] = None,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        output_format: str = "parquet",
+        metrics: Optional[List[Metric]] = None,
+        history: Optional[HistoryBackend] = None,
+        saturation_targets: Optional[Dict[str, SaturationTarget]] = None,
+        top_n: int = 5,
+        alpha: float = 0.5,
+        z: float = 1.96,
+    ):
+        """
+        Initialize the sweep.
+
+        Args:
+            catalog_path: Catalog file (.json, .jsonl or .arrow; defaults to
+                data/all_datasets.json)
+            output_dir: Directory for the part files (defaults to results/catalog_sweep)
+            batch_size: Datasets per batch, which is also the rows per part file
+            output_format: "parquet" (requires pyarrow) or "jsonl"
+            metrics: Metrics to run (defaults to default_metrics(history))
+            history: History backend for the default metrics and popularity decay
+            saturation_targets: datasetId -> leaderboard evaluation (defaults
+                to every registered leaderboard)
+            top_n: Models compared by the saturation index (top 1 vs top N)
+            alpha: Exponent for effective sample size
+            z: Standard normal quantile for confidence
+        """
+        if output_format not in FORMATS:
+            raise ValueError(f"Unknown output format {output_format!r}, expected one of {FORMATS}")
+        if batch_size < 1:
+            raise ValueError(f"batch_size must be positive, got {batch_size}")
+        self.catalog_path = str(catalog_path or DEFAULT_CATALOG_PATH)
+        self.output_dir = str(output_dir or DEFAULT_OUTPUT_DIR)
+        self.batch_size = batch_size
+        self.output_format = output_format
+        self.metrics = metrics if metrics is not None else default_metrics(history)
+        self.saturation_targets = (
+            load_saturation_targets() if saturation_targets is None else saturation_targets
+        )
+        self.top_n = top_n
+        self.alpha = alpha
+        self.z = z
+        # Evaluations to load per leaderboard file, so each is parsed once
+        self._evaluations: Dict[str, set] = {}
+        for target in self.saturation_targets.values():
+            self._evaluations.setdefault(target.jsonl_path, set()).add(target.eval_name)
+        self._split_sizes: Dict[str, int] = {}
+        self._unavailable_leaderboards: set = set()
+
+    def run(self, limit: Optional[int] = None) -> Dict[str, Any]:
+        """
+        Sweep the catalog and write one part file per batch.
+
+        Part files from an earlier sweep in the same directory are replaced.
+
+        Args:
+            limit: Stop after this many datasets (None for the whole catalog)
+
+        Returns:
+            The manifest: part file names, row count, columns and timings
+        """
+        started = time.perf_counter()
+        self._clear_parts()
+        catalog = load_refreshed_catalog(self.catalog_path)
+
+        parts: List[str] = []
+        columns: List[str] = []
+        rows = 0
+        batch: List[CatalogDataset] = []
+        for hf_dataset_id, record in catalog.iter_records():
+            if limit is not None and rows + len(batch) >= limit:
+                break
+            if not isinstance(record, dict):
+                continue
+            batch.append(CatalogDataset.from_record(hf_dataset_id, record))
+            if len(batch) == self.batch_size:
+                columns = self._write_batch(batch, len(parts), parts)
+                rows += len(batch)
+                batch = []
+        if batch:
+            columns = self._write_batch(batch, len(parts), parts)
+            rows += len(batch)
+
+        manifest = {
+            "catalog": self.catalog_path,
+            "format": self.output_format,
+            "created_at": datetime.datetime.now().isoformat(timespec="seconds"),
+            "rows": rows,
+            "parts": parts,
+            "columns": columns,
+            "seconds": round(time.perf_counter() - started, 3),
+        }
+        os.makedirs(self.output_dir, exist_ok=True)
+        with open(os.path.join(self.output_dir, MANIFEST_NAME), "w", encoding="utf-8") as f:
+            json.dump(manifest, f, indent=2)
+        return manifest
+
+    def compute_batch(self, datasets: Sequence[CatalogDataset]) -> Dict[str, List[Any]]:
+        """
+        Compute every output column for one batch of datasets.
+
+        Args:
+            datasets: Processed catalog datasets
+
+        Returns:
+            Dict of column name -> one value per dataset
+        """
+        columns: Dict[str, List[Any]] = {"dataset_id": [d.hf_dataset_id for d in datasets]}
+        previous_downloads = self._previous_downloads(datasets)
+        for metric in self.metrics:
+            try:
+                columns[metric.name] = list(metric.run_batch(datasets))
+            except Exception as e:
+                print(f"✗ Error running metric {metric.name} on a batch of {len(datasets)}: {e}")
+                columns[metric.name] = [None] * len(datasets)
+        columns["popularity_decay"] = self._popularity_decay(datasets, previous_downloads)
+        columns.update(self._saturation_columns(datasets))
+        return columns
+
+    def _downloads_metric(self) -> Optional[DatasetDownloadsMetric]:
+        for metric in self.metrics:
+            if isinstance(metric, DatasetDownloadsMetric):
+                return metric
+        return None
+
+    def _previous_downloads(self, datasets: Sequence[CatalogDataset]) -> Dict[str, Any]:
+        # Read before this batch's values are appended to the history
+        metric = self._downloads_metric()
+        if metric is None:
+            return {}
+        target_ids = [metric._get_target_id(dataset) for dataset in datasets]
+        return metric.history.latest_values(metric.name, target_ids)
+
+    def _popularity_decay(
+        self, datasets: Sequence[CatalogDataset], previous: Dict[str, Any]
+    ) -> List[float]:
+        """
+        Relative drop in downloads since the previously recorded value.
+
+        Positive values mean the dataset is losing downloads (0.25 is a
+        quarter fewer), negative values mean it is growing, and NaN means
+        there is no earlier non-zero value to compare with.
+        """
+        metric = self._downloads_metric()
+        decay = np.full(len(datasets), np.nan)
+        if metric is None or not previous:
+            return decay.tolist()
+        current = metadata_column(datasets, "downloads")
+        baseline = np.full(len(datasets), np.nan)
+        for i, dataset in enumerate(datasets):
+            entry = previous.get(metric._get_target_id(dataset))
+            if entry is not None and isinstance(entry[1], (int, float)):
+                baseline[i] = entry[1]
+        usable = baseline > 0
+        decay[usable] = 1.0 - current[usable] / baseline[usable]
+        return decay.tolist()
+
+    def _test_set_size(self, dataset: CatalogDataset) -> int:
+        if dataset.metadata.total_samples:
+            return int(dataset.metadata.total_samples)
+        hf_dataset_id = dataset.hf_dataset_id
+        if hf_dataset_id not in self._split_sizes:
+            # Only datasets scored by a leaderboard get here, so this stays a handful of lookups
+            try:
+                self._split_sizes[hf_dataset_id] = eval_split_size(get_split_sizes(hf_dataset_id))
+            except Exception as e:
+                print(f"Warning: Could not get dataset info for {hf_dataset_id}: {e}")
+                self._split_sizes[hf_dataset_id] = 0
+        return self._split_sizes[hf_dataset_id]
+
+    def _saturation_columns(self, datasets: Sequence[CatalogDataset]) -> Dict[str, List[Any]]:
+        count = len(datasets)
+        s1 = np.full(count, np.nan)
+        s_n = np.full(count, np.nan)
+        sizes = np.zeros(count)
+        sources: List[Optional[str]] = [None] * count
+
+        for i, dataset in enumerate(datasets):
+            target = self.saturation_targets.get(dataset.hf_dataset_id)
+            if target is None or target.leaderboard_id in self._unavailable_leaderboards:
+                continue
+            try:
+                table = load_leaderboard_table(
+                    target.jsonl_path, evaluations=self._evaluations[target.jsonl_path]
+                )
+                index = table.evaluation_index(target.eval_name)
+            except (OSError, ValueError) as e:
+                print(f"Warning: Skipping saturation from {target.leaderboard_id}: {e}")
+                self._unavailable_leaderboards.add(target.leaderboard_id)
+                continue
+            scores = index.top_n(self.top_n)
+            if len(scores) < self.top_n:
+                continue
+            s1[i], s_n[i] = scores[0], scores[self.top_n - 1]
+            sizes[i] = self._test_set_size(dataset)
+            sources[i] = target.leaderboard_id
+
+        batch = compute_saturation_metrics_batch(s1, s_n, sizes, alpha=self.alpha, z=self.z)
+        valid = batch["valid"]
+        return {
+            "saturation_index": np.where(valid, batch["s_index"], np.nan).tolist(),
+            "saturation_category": [
+                SATURATION_CATEGORIES[code] if code >= 0 else None
+                for code in batch["category_code"].tolist()
+            ],
+            "saturation_leaderboard": [
+                source if is_valid else None for source, is_valid in zip(sources, valid.tolist())
+            ],
+        }
+
+    def _write_batch(
+        self, datasets: Sequence[CatalogDataset], part_number: int, parts: List[str]
+    ) -> List[str]:
+        columns = self.compute_batch(datasets)
+        name = f"part-{part_number:05d}.{self.output_format}"
+        path = os.path.join(self.output_dir, name)
+        os.makedirs(self.output_dir, exist_ok=True)
+        if self.output_format == "parquet":
+            _write_parquet(columns, path)
+        else:
+            _write_jsonl(columns, path)
+        parts.append(name)
+        print(f"✓ {name} ({len(datasets)} datasets)")
+        return list(columns)
+
+    def _clear_parts(self) -> None:
+        if not os.path.isdir(self.output_dir):
+            return
+        for name in os.listdir(self.output_dir):
+            if name.startswith("part-") or name == MANIFEST_NAME:
+                os.remove(os.path.join(self.output_dir, name))
+
+
+def _json_default(value: Any) -> Any:
+    if hasattr(value, "tolist"):
+        return value.tolist()
+    return str(value)
+
+
+@profiled("export_jsonl")
+def _write_jsonl(columns: Dict[str, List[Any]], path: str) -> None:
+    names = list(columns)
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        for row in zip(*columns.values()):
+            record = {
+                name: None if isinstance(value, float) and value != value else value
+                for name, value in zip(names, row)
+            }
+            f.write(json.dumps(record, ensure_ascii=False, default=_json_default) + "\n")
+    os.replace(tmp_path, path)
+
+
+@profiled("export_parquet")
+def _write_parquet(columns: Dict[str, List[Any]], path: str) -> None:
+    try:
+        # Imported here so JSON Lines sweeps don't need pyarrow
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError as e:
+        raise ImportError(
+            "Parquet output needs pyarrow; install it with `pip install pyarrow` "
+            "or use --format jsonl"
+        ) from e
+
+    arrays = {}
+    for name, values in columns.items():
+        # Lists and dicts are written as JSON strings, as in the registry's CSV export
+        if any(isinstance(value, (list, dict)) for value in values):
+            values = [
+                json.dumps(value, default=_json_default) if isinstance(value, (list, dict)) else value
+                for value in values
+            ]
+        array = pa.array(values, from_pandas=True)
+        if pa.types.is_null(array.type):
+            # An all-empty column in this part; keep the schema readable across parts
+            array = array.cast(pa.string())
+        arrays[name] = array
+    tmp_path = path + ".tmp"
+    pq.write_table(pa.table(arrays), tmp_path)
+    os.replace(tmp_path, path)
+
+
+def sweep_catalog(
+    catalog_path: Optional[str] = None,
+    output_dir: Optional[str] = None,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    output_format: str = "parquet",
+    history: Optional[HistoryBackend] = None,
+    limit: Optional[int] = None,
+) -> Dict[str, Any]:
+    """
+    Run the default metrics over every dataset in a catalog.
+
+    Args:
+        catalog_path: Catalog file (defaults to data/all_datasets.json)
+        output_dir: Directory for the part files (defaults to results/catalog_sweep)
+        batch_size: Datasets per batch and per part file
+        output_format: "parquet" or "jsonl"
+        history: History backend for the popularity metrics (defaults to the
+            process-wide one)
+        limit: Stop after this many datasets (None for the whole catalog)
+
+    Returns:
+        The sweep's manifest
+    """
+    sweep = CatalogSweep(
+        catalog_path=catalog_path,
+        output_dir=output_dir,
+        batch_size=batch_size,
+        output_format=output_format,
+        history=history,
+    )
+    return sweep.run(limit=limit)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run metrics over every dataset in the catalog")
+    parser.add_argument("--catalog", default=None, help="Catalog file (default: data/all_datasets.json)")
+    parser.add_argument("--output-dir", default=None, help="Part file directory (default: results/catalog_sweep)")
+    parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE, help="Datasets per part file")
+    parser.add_argument("--format", choices=FORMATS, default="parquet", help="Part file format")
+    parser.add_argument("--limit", type=int, default=None, help="Stop after this many datasets")
+    parser.add_argument(
+        "--no-history",
+        action="store_true",
+        help="Don't record popularity values in the metric history (no popularity decay)",
+    )
+    args = parser.parse_args()
+
+    manifest = sweep_catalog(
+        catalog_path=args.catalog,
+        output_dir=args.output_dir,
+        batch_size=args.batch_size,
+        output_format=args.format,
+        history=InMemoryHistory() if args.no_history else None,
+        limit=args.limit,
+    )
+    output_dir = Path(args.output_dir or DEFAULT_OUTPUT_DIR)
+    print(
+        f"\n✓ Swept {manifest['rows']} datasets into {len(manifest['parts'])} parts "
+        f"in {output_dir} ({manifest['seconds']}s)"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+"""
+Generic adapter that turns any catalog record into a Dataset.
+
+The leaderboard adapters each wrap one hand-picked benchmark; this one wraps
+an arbitrary entry of `data/all_datasets.json`, so catalog-wide sweeps
+(analyzer/src/automation/sweep.py) can run the usual metrics on every
+dataset on the Hub. It reads only the catalog record and never calls the Hub.
+"""
+
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+from analyzer.src.metrics.base import Dataset, DatasetMetadata
+from analyzer.src.processing.hub_metadata import load_refreshed_catalog, refresh_datasets
+
+PROJECT_ROOT = Path(__file__).resolve().parents[3]
+DEFAULT_CATALOG_PATH = PROJECT_ROOT / "data" / "all_datasets.json"
+HF_DATASETS_URL = "https://huggingface.co/datasets/"
+
+
+class CatalogDataset(Dataset):
+    """
+    Dataset backed by one Hugging Face catalog record.
+
+    The dataset is named after its hf_dataset_id. Fields the catalog doesn't
+    carry keep the DatasetMetadata defaults; total_samples is the record's
+    own count, or 0 when it has none.
+    """
+
+    def __init__(
+        self,
+        hf_dataset_id: str,
+        name: Optional[str] = None,
+        paper_url: Optional[str] = None,
+        dataset_url: Optional[str] = None,
+        **kwargs,
+    ):
+        super().__init__(
+            name or hf_dataset_id,
+            paper_url=paper_url,
+            dataset_url=dataset_url or HF_DATASETS_URL + hf_dataset_id,
+            hf_dataset_id=hf_dataset_id,
+            **kwargs,
+        )
+        self.static_data_path = kwargs.get("static_data_path") or str(DEFAULT_CATALOG_PATH)
+
+    @classmethod
+    def from_record(cls, hf_dataset_id: str, record: Dict[str, Any]) -> "CatalogDataset":
+        """
+        Build and process a dataset from a catalog record in one step.
+
+        Args:
+            hf_dataset_id: The record's datasetId
+            record: Catalog record
+
+        Returns:
+            CatalogDataset: Dataset with its metadata set
+        """
+        dataset = cls(hf_dataset_id)
+        dataset.process(record)
+        return dataset
+
+    def refresh(self) -> None:
+        refresh_datasets([self])
+
+    def download(self):
+        return load_refreshed_catalog(self.static_data_path)
+
+    def process(self, data: Dict[str, Any]) -> DatasetMetadata:
+        metadata = DatasetMetadata(
+            paper_url=self.paper_url,
+            dataset_url=self.dataset_url,
+            language=data.get("language_from_tags"),
+            is_public=not (data.get("private") or data.get("gated")),
+            modality=data.get("modality_from_tags"),
+            data_created=data.get("createdAt"),
+            leaderboard_detail=None,
+            total_samples=data.get("total_samples") or 0,
+            task_categories=data.get("task_categories", []),
+            # Dynamic metrics fields
+            downloads=data.get("downloads", 0),
+            likes=data.get("likes", 0),
+            last_modified=data.get("last_modified", ""),
+            trending_score=data.get("trending_score", 0.0),
+        )
+        self.metadata = metadata
+        return metadata
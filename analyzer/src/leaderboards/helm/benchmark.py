@@ -1,5 +1,5 @@
 from analyzer.src.metrics.base import Leaderboard
-import pandas as pd
+from analyzer.src.processing.hub_metadata import refresh_datasets
 
 
 class HELMLeaderboard(Leaderboard):
@@ -18,22 +18,30 @@ class HELMLeaderboard(Leaderboard):
         """
         pass
 
-    def compute_rankings(self) -> pd.DataFrame:
+    def refresh_all(self) -> None:
+        """
+        Refresh Hub metadata for all datasets in one concurrent pass.
+        """
+        refresh_datasets(self._datasets.values())
+
+    def compute_rankings(self) -> "pd.DataFrame":
         """
         Compute rankings across all datasets.
 
         Returns:
             pd.DataFrame: Rankings data
         """
+        import pandas as pd
+
         # Placeholder implementation - can be extended with actual ranking logic
         rankings_data = []
         
         for dataset_name, dataset in self._datasets.items():
-            if dataset.data is not None:
+            if dataset.metadata is not None:
                 row = {
                     "dataset_name": dataset_name,
-                    "total_samples": dataset.data.iloc[0].get("total_samples", 0),
-                    "leaderboard_detail": dataset.data.iloc[0].get("leaderboard_detail", ""),
+                    "total_samples": dataset.metadata.total_samples or 0,
+                    "leaderboard_detail": dataset.metadata.leaderboard_detail or "",
                 }
                 rankings_data.append(row)
         
@@ -1,8 +1,7 @@
-from analyzer.src.metrics.base import Dataset
+from analyzer.src.metrics.base import Dataset, DatasetMetadata
 from typing import Optional, Any, Dict
-import json
-import pandas as pd
-from datasets import get_dataset_config_info
+from analyzer.src.processing.hub_metadata import load_refreshed_catalog, refresh_datasets
+from analyzer.src.processing.split_sizes import eval_split_size, get_split_sizes
 
 
 class NaturalQuestionsDataset(Dataset):
@@ -11,19 +10,17 @@ class NaturalQuestionsDataset(Dataset):
     ):
         super().__init__(name, paper_url, dataset_url, hf_dataset_id, **kwargs)
         self.static_data_path = kwargs.get("static_data_path")
-        self.data = None
+        self.metadata = None
         self.hf_dataset_id = hf_dataset_id
         self.paper_url = paper_url
         self.dataset_url = dataset_url
         self.config = kwargs.get("config", "default")  # "default" for closed-book, or specific config for open-book
 
     def refresh(self) -> None:
-        pass
+        refresh_datasets([self])
 
     def download(self):
-        with open(self.static_data_path, "r") as f:
-            all_datasets = json.load(f)
-        return all_datasets
+        return load_refreshed_catalog(self.static_data_path)
 
     def process(self, data: Dict[str, Any]):
         paper_url = self.paper_url
@@ -45,48 +42,31 @@ class NaturalQuestionsDataset(Dataset):
         # NaturalQuestions has different configs for closed-book vs open-book
         try:
             config_name = None if self.config == "default" else self.config
-            dataset_info = get_dataset_config_info(self.hf_dataset_id, config_name=config_name)
-            
-            # If there's only 1 split, use that regardless of name
-            if len(dataset_info.splits) == 1:
-                split_name = list(dataset_info.splits.keys())[0]
-                total_len = dataset_info.splits[split_name].num_examples
-            else:
-                # Only count test or validation splits (prioritize test > validation/valid)
-                total_len = 0
-                if "test" in dataset_info.splits:
-                    total_len = dataset_info.splits["test"].num_examples
-                elif "validation" in dataset_info.splits:
-                    total_len = dataset_info.splits["validation"].num_examples
-                elif "valid" in dataset_info.splits:
-                    total_len = dataset_info.splits["valid"].num_examples
-                else:
-                    total_len = 0
+            split_sizes = get_split_sizes(self.hf_dataset_id, config_name=config_name)
+            total_len = eval_split_size(split_sizes)
         except Exception as e:
             print(f"Warning: Could not get dataset info for {self.hf_dataset_id}: {e}")
             total_len = data.get("total_samples", 0)
         
         leaderboard_detail = "HELM Classic"
         
-        final_df = pd.DataFrame(
-            {
-                "paper_url": [paper_url],
-                "dataset_url": [dataset_url],
-                "language": [language],
-                "is_public": [is_public],
-                "modality": [modality],
-                "data_created": [data_created],
-                "leaderboard_detail": [leaderboard_detail],
-                "total_samples": [total_len],
-                "task_categories": [task_categories],
-                # Dynamic metrics fields
-                "downloads": [downloads],
-                "likes": [likes],
-                "last_modified": [last_modified],
-                "trending_score": [trending_score],
-            }
+        metadata = DatasetMetadata(
+            paper_url=paper_url,
+            dataset_url=dataset_url,
+            language=language,
+            is_public=is_public,
+            modality=modality,
+            data_created=data_created,
+            leaderboard_detail=leaderboard_detail,
+            total_samples=total_len,
+            task_categories=task_categories,
+            # Dynamic metrics fields
+            downloads=downloads,
+            likes=likes,
+            last_modified=last_modified,
+            trending_score=trending_score,
         )
         
-        self._data = final_df
-        return final_df
+        self.metadata = metadata
+        return metadata
 
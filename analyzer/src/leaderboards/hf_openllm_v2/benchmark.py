@@ -1,4 +1,5 @@
 from analyzer.src.metrics.base import Leaderboard
+from analyzer.src.processing.hub_metadata import refresh_datasets
 
 
 class HFOpenLLMVB2Leaderboard(Leaderboard):
@@ -8,5 +9,11 @@ class HFOpenLLMVB2Leaderboard(Leaderboard):
     def refresh(self):
         pass
 
+    def refresh_all(self) -> None:
+        """
+        Refresh Hub metadata for all datasets in one concurrent pass.
+        """
+        refresh_datasets(self._datasets.values())
+
     def compute_rankings(self):
         pass
@@ -1,8 +1,7 @@
-from analyzer.src.metrics.base import Dataset
+from analyzer.src.metrics.base import Dataset, DatasetMetadata
 from typing import Optional, Any, Dict
-import json
-from datasets import get_dataset_config_info
-import pandas as pd
+from analyzer.src.processing.hub_metadata import load_refreshed_catalog, refresh_datasets
+from analyzer.src.processing.split_sizes import eval_split_size, get_split_sizes
 
 
 class HendrycksMathDataset(Dataset):
@@ -11,18 +10,16 @@ class HendrycksMathDataset(Dataset):
     ):
         super().__init__(name, paper_url, dataset_url, hf_dataset_id, **kwargs)
         self.static_data_path = kwargs.get("static_data_path")
-        self.data = None
+        self.metadata = None
         self.hf_dataset_id = hf_dataset_id
         self.paper_url = paper_url
         self.dataset_url = dataset_url
 
     def refresh(self) -> None:
-        pass
+        refresh_datasets([self])
 
     def download(self):
-        with open(self.static_data_path, "r") as f:
-            all_datasets = json.load(f)
-        return all_datasets
+        return load_refreshed_catalog(self.static_data_path)
 
     def process(self, data: Dict[str, Any]):
         paper_url = self.paper_url
@@ -49,35 +46,21 @@ class HendrycksMathDataset(Dataset):
         data_len = 0
         for config in configs:
             try:
-                dataset_info = get_dataset_config_info(self.hf_dataset_id, config_name=config)
-                # If there's only 1 split, use that regardless of name
-                if len(dataset_info.splits) == 1:
-                    split_name = list(dataset_info.splits.keys())[0]
-                    data_len += dataset_info.splits[split_name].num_examples
-                else:
-                    # Only count test or validation splits (prioritize test > validation/valid)
-                    if "test" in dataset_info.splits:
-                        data_len += dataset_info.splits["test"].num_examples
-                    elif "validation" in dataset_info.splits:
-                        data_len += dataset_info.splits["validation"].num_examples
-                    elif "valid" in dataset_info.splits:
-                        data_len += dataset_info.splits["valid"].num_examples
-                    # If only train exists, add 0 (skip it)
+                split_sizes = get_split_sizes(self.hf_dataset_id, config_name=config)
+                data_len += eval_split_size(split_sizes)
             except Exception as e:
                 print(f"Warning: Could not get dataset info for {config}: {e}")
         leaderboard_detail = "HF Open LLM v2"
-        final_df = pd.DataFrame(
-            {
-                "paper_url": [paper_url],
-                "dataset_url": [dataset_url],
-                "language": [language],
-                "is_public": [is_public],
-                "modality": [modality],
-                "data_created": [data_created],
-                "leaderboard_detail": [leaderboard_detail],
-                "total_samples": [data_len],
-                "task_categories": [task_categories],
-            }
+        metadata = DatasetMetadata(
+            paper_url=paper_url,
+            dataset_url=dataset_url,
+            language=language,
+            is_public=is_public,
+            modality=modality,
+            data_created=data_created,
+            leaderboard_detail=leaderboard_detail,
+            total_samples=data_len,
+            task_categories=task_categories,
         )
-        self._data = final_df
-        return final_df
+        self.metadata = metadata
+        return metadata
@@ -1,8 +1,7 @@
-from analyzer.src.metrics.base import Dataset
+from analyzer.src.metrics.base import Dataset, DatasetMetadata
 from typing import Optional, Any, Dict
-import json
-import pandas as pd
-from datasets import get_dataset_config_info
+from analyzer.src.processing.hub_metadata import load_refreshed_catalog, refresh_datasets
+from analyzer.src.processing.split_sizes import eval_split_size, get_split_sizes
 
 
 class MMLUProDataset(Dataset):
@@ -11,18 +10,16 @@ class MMLUProDataset(Dataset):
     ):
         super().__init__(name, paper_url, dataset_url, hf_dataset_id, **kwargs)
         self.static_data_path = kwargs.get("static_data_path")
-        self.data = None
+        self.metadata = None
         self.hf_dataset_id = hf_dataset_id
         self.paper_url = paper_url
         self.dataset_url = dataset_url
 
     def download(self):
-        with open(self.static_data_path, "r") as f:
-            all_datasets = json.load(f)
-        return all_datasets
+        return load_refreshed_catalog(self.static_data_path)
 
     def refresh(self) -> None:
-        pass
+        refresh_datasets([self])
 
     def process(self, data: Dict[str, Any]):
         paper_url = self.paper_url
@@ -39,39 +36,23 @@ class MMLUProDataset(Dataset):
         
         # Get dataset info without downloading
         try:
-            dataset_info = get_dataset_config_info(self.hf_dataset_id)
-            # If there's only 1 split, use that regardless of name
-            if len(dataset_info.splits) == 1:
-                split_name = list(dataset_info.splits.keys())[0]
-                data_len = dataset_info.splits[split_name].num_examples
-            else:
-                # Only count test or validation splits (prioritize test > validation/valid)
-                data_len = 0
-                if "test" in dataset_info.splits:
-                    data_len = dataset_info.splits["test"].num_examples
-                elif "validation" in dataset_info.splits:
-                    data_len = dataset_info.splits["validation"].num_examples
-                elif "valid" in dataset_info.splits:
-                    data_len = dataset_info.splits["valid"].num_examples
-                else:
-                    data_len = 0
+            split_sizes = get_split_sizes(self.hf_dataset_id)
+            data_len = eval_split_size(split_sizes)
         except Exception as e:
             print(f"Warning: Could not get dataset info for {self.hf_dataset_id}: {e}")
             data_len = 0
 
         leaderboard_detail = "HF Open LLM v2"
-        final_df = pd.DataFrame(
-            {
-                "paper_url": [paper_url],
-                "dataset_url": [dataset_url],
-                "language": [language],
-                "is_public": [is_public],
-                "modality": [modality],
-                "data_created": [data_created],
-                "leaderboard_detail": [leaderboard_detail],
-                "total_samples": [data_len],
-                "task_categories": [task_categories],
-            }
+        metadata = DatasetMetadata(
+            paper_url=paper_url,
+            dataset_url=dataset_url,
+            language=language,
+            is_public=is_public,
+            modality=modality,
+            data_created=data_created,
+            leaderboard_detail=leaderboard_detail,
+            total_samples=data_len,
+            task_categories=task_categories,
         )
-        self._data = final_df
-        return final_df
+        self.metadata = metadata
+        return metadata
@@ -1,8 +1,7 @@
-from analyzer.src.metrics.base import Dataset
+from analyzer.src.metrics.base import Dataset, DatasetMetadata
 from typing import Optional, Any, Dict
-import json
-import pandas as pd
-from datasets import get_dataset_config_info
+from analyzer.src.processing.hub_metadata import load_refreshed_catalog, refresh_datasets
+from analyzer.src.processing.split_sizes import eval_split_size, get_split_sizes
 
 
 class MUSRDataset(Dataset):
@@ -11,18 +10,16 @@ class MUSRDataset(Dataset):
     ):
         super().__init__(name, paper_url, dataset_url, hf_dataset_id, **kwargs)
         self.static_data_path = kwargs.get("static_data_path")
-        self.data = None
+        self.metadata = None
         self.hf_dataset_id = hf_dataset_id
         self.paper_url = paper_url
         self.dataset_url = dataset_url
 
     def download(self):
-        with open(self.static_data_path, "r") as f:
-            all_datasets = json.load(f)
-        return all_datasets
+        return load_refreshed_catalog(self.static_data_path)
 
     def refresh(self) -> None:
-        pass
+        refresh_datasets([self])
 
     def process(self, data: Dict[str, Any]):
         paper_url = self.paper_url
@@ -47,40 +44,26 @@ class MUSRDataset(Dataset):
         for config in data_configs:
             try:
                 # Note: MUSR uses config names as split names
-                dataset_info = get_dataset_config_info(self.hf_dataset_id)
-                # If there's only 1 split, use that regardless of name
-                if len(dataset_info.splits) == 1:
-                    split_name = list(dataset_info.splits.keys())[0]
-                    total_len += dataset_info.splits[split_name].num_examples
-                # For MUSR, the configs are actually split names
-                # Only count test or validation splits (prioritize test > validation/valid)
-                elif "test" in dataset_info.splits:
-                    total_len += dataset_info.splits["test"].num_examples
-                elif "validation" in dataset_info.splits:
-                    total_len += dataset_info.splits["validation"].num_examples
-                elif "valid" in dataset_info.splits:
-                    total_len += dataset_info.splits["valid"].num_examples
-                # If config is in splits, it might be the test/validation split
-                elif config in dataset_info.splits:
-                    total_len += dataset_info.splits[config].num_examples
-                break  # MUSR has only one dataset_info, don't repeat for each config
+                split_sizes = get_split_sizes(self.hf_dataset_id)
+                # For MUSR, the configs are actually split names, so after the
+                # usual test > validation/valid preference try the config itself
+                total_len += eval_split_size(split_sizes, fallback_splits=(config,))
+                break  # MUSR has only one split-size lookup, don't repeat for each config
             except Exception as e:
                 print(f"Warning: Could not get dataset info for {config}: {e}")
                 break
 
         leaderboard_detail = "HF Open LLM v2"
-        final_df = pd.DataFrame(
-            {
-                "paper_url": [paper_url],
-                "dataset_url": [dataset_url],
-                "language": [language],
-                "is_public": [is_public],
-                "modality": [modality],
-                "data_created": [data_created],
-                "leaderboard_detail": [leaderboard_detail],
-                "total_samples": [total_len],
-                "task_categories": [task_categories],
-            }
+        metadata = DatasetMetadata(
+            paper_url=paper_url,
+            dataset_url=dataset_url,
+            language=language,
+            is_public=is_public,
+            modality=modality,
+            data_created=data_created,
+            leaderboard_detail=leaderboard_detail,
+            total_samples=total_len,
+            task_categories=task_categories,
         )
-        self._data = final_df
-        return final_df
+        self.metadata = metadata
+        return metadata
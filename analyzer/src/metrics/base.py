@@ -1,6 +1,108 @@
+import warnings
 from abc import ABC, abstractmethod
-from typing import Any, Dict, List, Optional, Union
-import pandas as pd
+from dataclasses import asdict, dataclass, field, fields
+from typing import TYPE_CHECKING, Any, Dict, List, Mapping, Optional, Sequence, Union
+
+if TYPE_CHECKING:
+    # Only for annotations; pandas is imported by the code that builds frames
+    import pandas as pd
+
+
+@dataclass(slots=True)
+class DatasetMetadata:
+    """
+    Processed metadata for one dataset, as produced by Dataset.process().
+
+    Metrics read fields by attribute (`dataset.metadata.total_samples`).
+    Fields an adapter doesn't set keep the defaults metrics already assume
+    for missing values. Keys that aren't fields are kept in `extra`.
+    """
+
+    paper_url: Optional[str] = None
+    dataset_url: Optional[str] = None
+    language: Optional[str] = None
+    is_public: Optional[bool] = None
+    modality: Optional[str] = None
+    data_created: Optional[str] = None
+    leaderboard_detail: Optional[str] = None
+    total_samples: Optional[int] = None
+    task_categories: Any = None
+    eval_metrics: Any = None
+    # Hub popularity fields, refreshed by analyzer.src.processing.hub_metadata
+    downloads: Any = 0
+    likes: Any = 0
+    last_modified: Any = ""
+    trending_score: Any = 0.0
+    extra: Dict[str, Any] = field(default_factory=dict)
+
+    @classmethod
+    def from_dict(cls, values: Mapping[str, Any]) -> "DatasetMetadata":
+        """
+        Build a record from a mapping, keeping unknown keys in `extra`.
+
+        Args:
+            values: Field name -> value, e.g. one DataFrame row as a dict
+
+        Returns:
+            DatasetMetadata: The record
+        """
+        known = _METADATA_FIELDS.intersection(values)
+        metadata = cls(**{key: values[key] for key in known})
+        metadata.extra.update({key: value for key, value in values.items() if key not in known})
+        return metadata
+
+    def get(self, key: str, default: Any = None) -> Any:
+        """
+        Dict-style lookup of a field or extra key.
+
+        Args:
+            key: Field or extra key name
+            default: Returned when the key is absent
+
+        Returns:
+            Any: The value
+        """
+        if key in _METADATA_FIELDS:
+            return getattr(self, key)
+        return self.extra.get(key, default)
+
+    def update(self, **values: Any) -> None:
+        """
+        Set fields (or extra keys) in place.
+
+        Args:
+            **values: Field name -> new value
+        """
+        for key, value in values.items():
+            if key in _METADATA_FIELDS:
+                setattr(self, key, value)
+            else:
+                self.extra[key] = value
+
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Flatten into one dict, with extra keys alongside the fields.
+
+        Returns:
+            Dict[str, Any]: Field name -> value
+        """
+        values = asdict(self)
+        values.update(values.pop("extra"))
+        return values
+
+    def to_frame(self) -> "pd.DataFrame":
+        """
+        Convert to the one-row DataFrame adapters used to produce, for export.
+
+        Returns:
+            pd.DataFrame: One row, one column per field
+        """
+        import pandas as pd
+
+        return pd.DataFrame([self.to_dict()])
+
+
+_METADATA_FIELDS = frozenset(f.name for f in fields(DatasetMetadata)) - {"extra"}
 
 
 class Dataset(ABC):
@@ -26,7 +128,7 @@ class Dataset(ABC):
         self.paper_url = paper_url
         self.dataset_url = dataset_url
         self.hf_dataset_id = hf_dataset_id
-        self._data: Optional[pd.DataFrame] = None
+        self.metadata: Optional[DatasetMetadata] = None
 
     @abstractmethod
     def refresh(self) -> None:
@@ -47,15 +149,17 @@ class Dataset(ABC):
         pass
 
     @abstractmethod
-    def process(self, data: Any) -> pd.DataFrame:
+    def process(self, data: Any) -> DatasetMetadata:
         """
-        Process downloaded data into a pandas DataFrame.
+        Process downloaded data into the dataset's metadata record.
+
+        Implementations should also store the record in `self.metadata`.
 
         Args:
             data: The downloaded data
 
         Returns:
-            pd.DataFrame: Processed data
+            DatasetMetadata: Processed metadata
         """
         pass
 
@@ -70,14 +174,38 @@ class Dataset(ABC):
         return 0
 
     @property
-    def data(self) -> Optional[pd.DataFrame]:
-        """Get the processed dataset data."""
-        return self._data
+    def data(self) -> Optional["pd.DataFrame"]:
+        """
+        Deprecated: the processed metadata as a one-row DataFrame.
+
+        The frame is a fresh copy built on each access, so changes to it are
+        not kept. Read and update `metadata` instead.
+        """
+        warnings.warn(
+            "Dataset.data is deprecated and returns a copy; use Dataset.metadata instead",
+            DeprecationWarning,
+            stacklevel=2,
+        )
+        return None if self.metadata is None else self.metadata.to_frame()
 
     @data.setter
-    def data(self, value: pd.DataFrame):
-        """Set the processed dataset data."""
-        self._data = value
+    def data(self, value: Union["pd.DataFrame", DatasetMetadata, None]):
+        """Deprecated: set the processed metadata from a record or a one-row DataFrame."""
+        warnings.warn(
+            "Setting Dataset.data is deprecated; assign a DatasetMetadata to Dataset.metadata instead",
+            DeprecationWarning,
+            stacklevel=2,
+        )
+        if value is None or isinstance(value, DatasetMetadata):
+            self.metadata = value
+        elif value.empty:
+            self.metadata = None
+        elif len(value) > 1:
+            raise ValueError(
+                f"Dataset metadata is one record, got a DataFrame with {len(value)} rows for {self.name}"
+            )
+        else:
+            self.metadata = DatasetMetadata.from_dict(value.iloc[0].to_dict())
 
     def __str__(self) -> str:
         return f"{self.__class__.__name__}({self.name})"
@@ -151,7 +279,7 @@ class Leaderboard(ABC):
         pass
 
     @abstractmethod
-    def compute_rankings(self) -> pd.DataFrame:
+    def compute_rankings(self) -> "pd.DataFrame":
         """
         Compute rankings across all datasets.
 
@@ -183,12 +311,62 @@ class Metric(ABC):
     Metrics analyze datasets and produce numerical scores or other
     quantitative measurements. They can work on individual datasets
     or across multiple datasets in a leaderboard.
+
+    Metrics whose result depends only on their parameters, the dataset's
+    metadata and their input files set `cacheable`, so runners can reuse
+    results from analyzer.src.processing.result_cache.
+
+    Metrics whose run_batch does shared work for all datasets at once (one
+    API request for every dataset, say) set `batched`, so runners hand them
+    a leaderboard's datasets together instead of one task per dataset.
     """
 
+    cacheable = False
+    batched = False
+
     def __init__(self, name: str, description: str = ""):
         self.name = name
         self.description = description
 
+    def cache_params(self) -> Dict[str, Any]:
+        """
+        Get the parameters that determine this metric's results.
+
+        Defaults to every public attribute except the name and description.
+
+        Returns:
+            Dict[str, Any]: JSON-serializable parameters for the cache key
+        """
+        return {
+            key: value
+            for key, value in vars(self).items()
+            if not key.startswith("_") and key not in ("name", "description")
+        }
+
+    def cache_files(self) -> List[str]:
+        """
+        Get the input files this metric's results depend on.
+
+        Defaults to the leaderboard dump (`jsonl_path`) if the metric has one.
+
+        Returns:
+            List[str]: File paths whose fingerprints join the cache key
+        """
+        jsonl_path = getattr(self, "jsonl_path", None)
+        return [jsonl_path] if jsonl_path else []
+
+    def accepts_cached(self, result: Any) -> bool:
+        """
+        Check whether a cached result can still be returned.
+
+        Args:
+            result: Result read from the cache
+
+        Returns:
+            bool: False to recompute instead
+        """
+        return True
+
     @abstractmethod
     def run(
         self, target: Union[Dataset, Leaderboard]
@@ -219,6 +397,21 @@ class Metric(ABC):
             raise ValueError("run_on_dataset should return a single float")
         return result
 
+    def run_batch(self, datasets: Sequence[Dataset]) -> List[Any]:
+        """
+        Run the metric on many datasets at once.
+
+        Subclasses that can compute a whole batch with array operations
+        override this; the default runs the datasets one by one.
+
+        Args:
+            datasets: The datasets to analyze
+
+        Returns:
+            List[Any]: One result per dataset, in order
+        """
+        return [self.run_on_dataset(dataset) for dataset in datasets]
+
     def run_on_leaderboard(self, leaderboard: Leaderboard) -> Dict[str, float]:
         """
         Run the metric on all datasets in a leaderboard.
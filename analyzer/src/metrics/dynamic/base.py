@@ -1,5 +1,10 @@
-from typing import Dict, Union
+import datetime
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
 from analyzer.src.metrics.base import Metric, Dataset, Leaderboard
+from analyzer.src.processing.metric_history import HistoryBackend, get_default_history
 
 
 class UpdatableMetric(Metric):
@@ -8,16 +13,29 @@ class UpdatableMetric(Metric):
 
     Updatable metrics are computed periodically and track historical values
     over time. They may depend on external data sources that change.
+
+    Values are recorded in a persistent history backend (SQLite by default,
+    see analyzer/src/processing/metric_history.py), keyed by the metric name
+    and a stable target id, so history survives across runs and processes.
     """
 
     def __init__(
-        self, name: str, description: str = "", update_frequency_days: int = 7
+        self,
+        name: str,
+        description: str = "",
+        update_frequency_days: int = 7,
+        history: Optional[HistoryBackend] = None,
     ):
         super().__init__(name, description)
         self.update_frequency_days = update_frequency_days
-        self._historical_values: Dict[str, Dict[str, float]] = (
-            {}
-        )  # dataset_id -> {timestamp: value}
+        self._history = history
+
+    @property
+    def history(self) -> HistoryBackend:
+        """The backend values are recorded in (the process-wide default if none was given)."""
+        if self._history is None:
+            self._history = get_default_history()
+        return self._history
 
     def run(self, target: Union[Dataset, Leaderboard]) -> float:
         """
@@ -33,15 +51,42 @@ class UpdatableMetric(Metric):
         current_value = self._compute_current(target)
 
         # Store the historical value
-        if target_id not in self._historical_values:
-            self._historical_values[target_id] = {}
+        self.history.append(self.name, target_id, datetime.datetime.now(), current_value)
+
+        return current_value
 
-        import datetime
+    def run_batch(self, datasets: Sequence[Dataset]) -> List[Any]:
+        """
+        Run the metric on many datasets and record all values in one write.
 
-        timestamp = datetime.datetime.now().isoformat()
-        self._historical_values[target_id][timestamp] = current_value
+        Args:
+            datasets: The datasets to analyze
 
-        return current_value
+        Returns:
+            List[Any]: The current metric score of each dataset, in order
+        """
+        values = list(self._compute_batch(datasets))
+        now = datetime.datetime.now()
+        self.history.append_many(
+            self.name,
+            [(self._get_target_id(dataset), now, value) for dataset, value in zip(datasets, values)],
+        )
+        return values
+
+    def _compute_batch(self, datasets: Sequence[Dataset]) -> Sequence[Any]:
+        """
+        Compute the current value for many datasets.
+
+        Subclasses override this with array operations; the default computes
+        the datasets one by one.
+
+        Args:
+            datasets: The datasets to analyze
+
+        Returns:
+            Sequence[Any]: One value per dataset, in order
+        """
+        return [self._compute_current(dataset) for dataset in datasets]
 
     def _compute_current(self, target: Union[Dataset, Leaderboard]) -> float:
         """
@@ -63,14 +108,38 @@ class UpdatableMetric(Metric):
             target: The dataset or leaderboard
 
         Returns:
-            Dict[str, float]: Historical values with timestamps as keys
+            Dict[str, float]: Historical values with ISO timestamps as keys
         """
-        target_id = self._get_target_id(target)
-        return self._historical_values.get(target_id, {})
+        return {
+            timestamp.isoformat(): value for timestamp, value in self.get_history(target)
+        }
+
+    def get_history(
+        self,
+        target: Union[Dataset, Leaderboard],
+        start: Optional[datetime.datetime] = None,
+        end: Optional[datetime.datetime] = None,
+    ) -> List[Tuple[datetime.datetime, Any]]:
+        """
+        Get historical values for a target within a time range.
+
+        Args:
+            target: The dataset or leaderboard
+            start: Earliest timestamp to include (None for no lower bound)
+            end: Latest timestamp to include (None for no upper bound)
+
+        Returns:
+            List of (timestamp, value) pairs, oldest first
+        """
+        return self.history.query(self.name, self._get_target_id(target), start, end)
 
     def _get_target_id(self, target: Union[Dataset, Leaderboard]) -> str:
         """
-        Get a unique identifier for the target dataset or leaderboard.
+        Get a stable identifier for the target dataset or leaderboard.
+
+        The id is built from the class and name rather than the object
+        identity, so history recorded in one run matches the same dataset in
+        the next.
 
         Args:
             target: The dataset or leaderboard
@@ -79,7 +148,7 @@ class UpdatableMetric(Metric):
             str: Unique identifier
         """
         # Default implementation - subclasses can override
-        return f"{target.__class__.__name__}_{id(target)}"
+        return f"{target.__class__.__name__}:{target.name}"
 
     def needs_update(self, target: Union[Dataset, Leaderboard]) -> bool:
         """
@@ -92,19 +161,55 @@ class UpdatableMetric(Metric):
             bool: True if update is needed
         """
         # Simple implementation - can be overridden for more sophisticated logic
-        import datetime
-
-        target_id = self._get_target_id(target)
-
-        if target_id not in self._historical_values:
-            return True
-
-        if not self._historical_values[target_id]:
+        last_update = self.history.latest_timestamp(self.name, self._get_target_id(target))
+        if last_update is None:
             return True
 
         # Check if the last update was more than update_frequency_days ago
-        last_timestamp = max(self._historical_values[target_id].keys())
-        last_update = datetime.datetime.fromisoformat(last_timestamp)
         days_since_update = (datetime.datetime.now() - last_update).days
 
         return days_since_update >= self.update_frequency_days
+
+
+class HubPopularityMetric(UpdatableMetric):
+    """
+    Updatable metric of a dataset's Hub popularity (downloads, likes, ...).
+
+    The value belongs to the Hub dataset rather than to any one adapter, so
+    history is keyed by hf_dataset_id when the target has one. Values
+    recorded through a leaderboard adapter, a CatalogDataset sweep or
+    refresh_datasets() then extend the same series.
+    """
+
+    def _get_target_id(self, target: Union[Dataset, Leaderboard]) -> str:
+        hf_dataset_id = getattr(target, "hf_dataset_id", None)
+        if hf_dataset_id:
+            return f"hf:{hf_dataset_id}"
+        return super()._get_target_id(target)
+
+
+def metadata_column(datasets: Sequence[Dataset], field: str, default: float = 0.0) -> np.ndarray:
+    """
+    Gather one numeric metadata field of many datasets into a float array.
+
+    Missing metadata, empty values and values that aren't numbers become
+    `default`, matching what the per-dataset metrics return for them.
+
+    Args:
+        datasets: The datasets to read
+        field: DatasetMetadata field name, e.g. "downloads"
+        default: Value for datasets without a usable number
+
+    Returns:
+        np.ndarray: One float per dataset
+    """
+    values = np.full(len(datasets), default, dtype=np.float64)
+    for i, dataset in enumerate(datasets):
+        metadata = dataset.metadata
+        value = getattr(metadata, field, None) if metadata is not None else None
+        if value:
+            try:
+                values[i] = float(value)
+            except (TypeError, ValueError):
+                pass
+    return values
@@ -1,44 +1,72 @@
 from analyzer.src.metrics.dynamic.base import UpdatableMetric
 import os
 from analyzer.src.metrics.base import Dataset, Leaderboard
-from typing import Dict, Optional
-import requests
-from dotenv import load_dotenv
+from analyzer.src.processing.metric_history import HistoryBackend
+from analyzer.src.processing.semantic_scholar import extract_paper_id, fetch_citation_counts
+from typing import Dict, Iterable, List, Optional, Sequence
 
-import time
-from urllib.parse import urlparse
-
-load_dotenv()
 
 class CitationMetric(UpdatableMetric):
     """
     Metric to fetch total citation count for datasets using Semantic Scholar API.
+
+    Lookups go through the batched, rate-limited and cached client in
+    analyzer/src/processing/semantic_scholar.py; a whole leaderboard is
+    fetched in one batch request. Runners call run_batch for the same reason
+    (`batched`), which also records the counts in the metric history in one
+    write.
     """
 
+    batched = True
+
     def __init__(
         self,
         name: str,
         description: str = "Total citation count from Semantic Scholar",
         api_key: Optional[str] = None,
+        base_url: Optional[str] = None,
+        history: Optional[HistoryBackend] = None,
     ):
-        super().__init__(name, description)
+        super().__init__(name, description, history=history)
+        # Imported here so runs without CitationMetric never load dotenv
+        from dotenv import load_dotenv
+
+        load_dotenv()
         self.api_key =  os.getenv("SEMANTIC_SCHOLAR_API_KEY") if api_key is None else api_key
         # print(f"Using Semantic Scholar API Key: {'Provided' if self.api_key else 'Not Provided'}")
-        self.base_url = "https://api.semanticscholar.org/graph/v1"
+        self.base_url = base_url
         self._cache = {}
 
     def _extract_paper_id(self, paper_url: str) -> Optional[str]:
         """Extract paper ID from Semantic Scholar URL."""
         try:
             # URL format: https://www.semanticscholar.org/paper/{title}/{paperId}
-            path = urlparse(paper_url).path
-            parts = path.split('/')
-            if len(parts) >= 3 and parts[1] == 'paper':
-                return parts[-1]  # Last part is the paper ID
+            return extract_paper_id(paper_url)
         except Exception as e:
             print(f"Error extracting paper ID from {paper_url}: {e}")
         return None
 
+    def _fetch_citation_counts(self, paper_ids: Iterable[str]) -> Dict[str, Optional[int]]:
+        """
+        Fetch citation counts for several papers in one batched call.
+
+        Args:
+            paper_ids: Semantic Scholar paper IDs
+
+        Returns:
+            Dict mapping each paper ID to its citation count, or None if error
+        """
+        paper_ids = list(dict.fromkeys(paper_ids))
+        missing = [paper_id for paper_id in paper_ids if paper_id not in self._cache]
+        if missing:
+            try:
+                self._cache.update(
+                    fetch_citation_counts(missing, api_key=self.api_key, base_url=self.base_url)
+                )
+            except Exception as e:
+                print(f"Error fetching data for papers {missing}: {e}")
+        return {paper_id: self._cache.get(paper_id) for paper_id in paper_ids}
+
     def _fetch_citation_count(self, paper_id: str) -> Optional[int]:
         """
         Fetch citation count from Semantic Scholar API.
@@ -49,33 +77,7 @@ class CitationMetric(UpdatableMetric):
         Returns:
             Total citation count or None if error
         """
-        if paper_id in self._cache:
-            return self._cache[paper_id]
-
-        headers = {}
-        if self.api_key:
-            headers['x-api-key'] = self.api_key
-
-        # Only request citationCount field
-        query_params = {"fields": "title,year,abstract,citationCount"}
-        url = f"{self.base_url}/paper/{paper_id}"
-
-        try:
-            response = requests.get(url, headers=headers, params=query_params)
-            response.raise_for_status()
-            data = response.json()
-
-            citation_count = data.get("citationCount", 0)
-            self._cache[paper_id] = citation_count
-            
-            # Rate limiting: be nice to the API
-            time.sleep(0.1)
-            
-            return citation_count
-
-        except requests.exceptions.RequestException as e:
-            print(f"Error fetching data for paper {paper_id}: {e}")
-            return None
+        return self._fetch_citation_counts([paper_id])[paper_id]
 
     def _compute(self, dataset: Dataset) -> Optional[int]:
         """
@@ -110,6 +112,31 @@ class CitationMetric(UpdatableMetric):
         """
         return self._compute(dataset)
 
+    def _compute_batch(self, datasets: Sequence[Dataset]) -> List[Optional[int]]:
+        """
+        Compute citation counts for many datasets with one batched lookup.
+
+        Args:
+            datasets: The datasets to analyze
+
+        Returns:
+            List of citation counts, one per dataset
+        """
+        # Resolve every paper first so all datasets share one batch request
+        paper_ids = []
+        for dataset in datasets:
+            paper_id = None
+            if not getattr(dataset, "paper_url", None):
+                print(f"No paper URL available for dataset {dataset.name}")
+            else:
+                paper_id = self._extract_paper_id(dataset.paper_url)
+                if not paper_id:
+                    print(f"Could not extract paper ID from URL for dataset {dataset.name}")
+            paper_ids.append(paper_id)
+        print(f"Fetching citations for {sum(1 for pid in paper_ids if pid)} datasets...")
+        counts = self._fetch_citation_counts(pid for pid in paper_ids if pid)
+        return [counts.get(paper_id) if paper_id else None for paper_id in paper_ids]
+
     def run_on_leaderboard(self, leaderboard: Leaderboard) -> Dict[str, Optional[int]]:
         """
         Run the metric on all datasets in a leaderboard.
@@ -121,14 +148,7 @@ class CitationMetric(UpdatableMetric):
             Dict mapping dataset names to their citation counts
         """
         datasets = leaderboard.datasets
-        leaderboard_results = {}
-
-        for dataset_name, dataset in datasets.items():
-            print(f"Fetching citations for {dataset_name}...")
-            citation_count = self._compute(dataset)
-            leaderboard_results[dataset_name] = citation_count
-
-        return leaderboard_results
+        return dict(zip(datasets, self.run_batch(list(datasets.values()))))
 
     def _compute_current(self, leaderboard: Leaderboard) -> Dict[str, Optional[int]]:
         """
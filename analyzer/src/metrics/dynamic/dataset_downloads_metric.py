@@ -1,9 +1,11 @@
-from analyzer.src.metrics.dynamic.base import UpdatableMetric
+from analyzer.src.metrics.dynamic.base import HubPopularityMetric, metadata_column
 from analyzer.src.metrics.base import Dataset, Leaderboard
-from typing import Union, Dict
+from typing import Union, Dict, Optional, Sequence
+from analyzer.src.processing.metric_history import HistoryBackend
+import numpy as np
 
 
-class DatasetDownloadsMetric(UpdatableMetric):
+class DatasetDownloadsMetric(HubPopularityMetric):
     """
     Tracks the number of downloads for a dataset over time.
     
@@ -12,9 +14,13 @@ class DatasetDownloadsMetric(UpdatableMetric):
     """
 
     def __init__(
-        self, name: str = "dataset_downloads", description: str = "", update_frequency_days: int = 7
+        self,
+        name: str = "dataset_downloads",
+        description: str = "",
+        update_frequency_days: int = 7,
+        history: Optional[HistoryBackend] = None,
     ):
-        super().__init__(name, description, update_frequency_days)
+        super().__init__(name, description, update_frequency_days, history)
 
     def _compute_current(self, dataset: Dataset) -> float:
         """
@@ -26,15 +32,27 @@ class DatasetDownloadsMetric(UpdatableMetric):
         Returns:
             float: Current download count
         """
-        data = dataset.data
-        if data is None or data.empty:
+        metadata = dataset.metadata
+        if metadata is None:
             return 0.0
         
         # Try to get downloads from the dataset's metadata
         # This would typically be pulled from HuggingFace API or metadata JSON
-        downloads = data.iloc[0].get("downloads", 0)
+        downloads = metadata.downloads
         return float(downloads) if downloads else 0.0
 
+    def _compute_batch(self, datasets: Sequence[Dataset]) -> np.ndarray:
+        """
+        Get the current download counts for many datasets.
+
+        Args:
+            datasets: The datasets to analyze
+
+        Returns:
+            np.ndarray: Current download count of each dataset
+        """
+        return metadata_column(datasets, "downloads")
+
     def run_on_dataset(self, dataset: Dataset) -> float:
         """
         Run the metric on a single dataset.
@@ -1,10 +1,12 @@
-from analyzer.src.metrics.dynamic.base import UpdatableMetric
+from analyzer.src.metrics.dynamic.base import HubPopularityMetric
 from analyzer.src.metrics.base import Dataset, Leaderboard
-from typing import Union, Dict
-from datetime import datetime
+from typing import Union, Dict, Optional, Sequence
+from analyzer.src.processing.metric_history import HistoryBackend
+from datetime import datetime, timezone
+import numpy as np
 
 
-class DatasetFreshnessMetric(UpdatableMetric):
+class DatasetFreshnessMetric(HubPopularityMetric):
     """
     Tracks when a dataset was last modified/updated.
     
@@ -13,9 +15,13 @@ class DatasetFreshnessMetric(UpdatableMetric):
     """
 
     def __init__(
-        self, name: str = "dataset_freshness", description: str = "", update_frequency_days: int = 7
+        self,
+        name: str = "dataset_freshness",
+        description: str = "",
+        update_frequency_days: int = 7,
+        history: Optional[HistoryBackend] = None,
     ):
-        super().__init__(name, description, update_frequency_days)
+        super().__init__(name, description, update_frequency_days, history)
 
     def _compute_current(self, dataset: Dataset) -> float:
         """
@@ -27,12 +33,12 @@ class DatasetFreshnessMetric(UpdatableMetric):
         Returns:
             float: Days since last modification (0 if modified today)
         """
-        data = dataset.data
-        if data is None or data.empty:
+        metadata = dataset.metadata
+        if metadata is None:
             return -1.0  # Unknown freshness
         
         # Try to get last_modified from the dataset's metadata
-        last_modified = data.iloc[0].get("last_modified")
+        last_modified = metadata.last_modified
         
         if not last_modified:
             return -1.0  # Unknown freshness
@@ -46,6 +52,45 @@ class DatasetFreshnessMetric(UpdatableMetric):
         except (ValueError, AttributeError):
             return -1.0  # Error parsing date
 
+    def _compute_batch(self, datasets: Sequence[Dataset]) -> np.ndarray:
+        """
+        Get the days since last modification for many datasets.
+
+        UTC timestamps (the Hub's "...Z" form) are parsed in one numpy pass;
+        anything else goes through the per-dataset path.
+
+        Args:
+            datasets: The datasets to analyze
+
+        Returns:
+            np.ndarray: Days since last modification (-1 where unknown)
+        """
+        days = np.full(len(datasets), -1.0)
+        utc_rows, utc_stamps = [], []
+        for i, dataset in enumerate(datasets):
+            metadata = dataset.metadata
+            last_modified = metadata.last_modified if metadata is not None else None
+            if not last_modified:
+                continue
+            if isinstance(last_modified, str) and last_modified.endswith(("Z", "+00:00")):
+                utc_rows.append(i)
+                utc_stamps.append(last_modified.removesuffix("Z").removesuffix("+00:00"))
+            else:
+                days[i] = self._compute_current(dataset)
+
+        if utc_rows:
+            try:
+                parsed = np.array(utc_stamps, dtype="datetime64[us]")
+            except ValueError:
+                # A malformed timestamp in the batch; parse them one at a time
+                for i in utc_rows:
+                    days[i] = self._compute_current(datasets[i])
+            else:
+                now = np.datetime64(datetime.now(timezone.utc).replace(tzinfo=None), "us")
+                # Whole days elapsed, as timedelta.days gives
+                days[utc_rows] = (now - parsed) // np.timedelta64(1, "D")
+        return days
+
     def run_on_dataset(self, dataset: Dataset) -> float:
         """
         Run the metric on a single dataset.
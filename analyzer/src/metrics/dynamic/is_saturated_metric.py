@@ -1,7 +1,10 @@
 from analyzer.src.metrics.dynamic.base import UpdatableMetric
 from analyzer.src.metrics.base import Dataset, Leaderboard
+from analyzer.src.processing.leaderboard_store import (
+    LeaderboardTable,
+    load_leaderboard_table,
+)
 from typing import Dict, Union, List
-import json
 
 
 class IsSaturatedMetric(UpdatableMetric):
@@ -14,6 +17,9 @@ class IsSaturatedMetric(UpdatableMetric):
     3. Mean performance > (noise_ceiling - 2%)
     """
 
+    # Results depend only on the parameters, the dataset and the JSONL file
+    cacheable = True
+
     def __init__(
         self,
         name: str,
@@ -31,19 +37,15 @@ class IsSaturatedMetric(UpdatableMetric):
         self.min_mean_performance = min_mean_performance
         self.noise_ceiling = noise_ceiling
         self.jsonl_path = jsonl_path
-        self._model_data = None
 
         # Map dataset names to evaluation names in JSONL
         self.dataset_to_eval_map = dataset_to_eval_map or {}
 
-    def _load_model_data(self):
-        """Load JSONL file once and cache it."""
-        if self._model_data is None:
-            self._model_data = []
-            with open(self.jsonl_path, "r") as f:
-                for line in f:
-                    self._model_data.append(json.loads(line))
-        return self._model_data
+    def _load_leaderboard(self) -> LeaderboardTable:
+        """Get the process-wide table for the leaderboard JSONL file."""
+        # Only the mapped evaluations are loaded
+        evaluations = set(self.dataset_to_eval_map.values()) or None
+        return load_leaderboard_table(self.jsonl_path, evaluations=evaluations)
 
     def _get_top_n_scores(self, dataset: Dataset) -> List[float]:
         """
@@ -55,23 +57,14 @@ class IsSaturatedMetric(UpdatableMetric):
         Returns:
             List of top N scores
         """
-        model_data = self._load_model_data()
         eval_name = self.dataset_to_eval_map.get(dataset.name)
 
         if not eval_name:
             return []
 
-        # Extract scores for this evaluation
-        scores = []
-        for model in model_data:
-            for eval_result in model.get("evaluation_results", []):
-                if eval_result["evaluation_name"] == eval_name:
-                    scores.append(eval_result["score_details"]["score"])
-                    break
-
-        # Sort by score (descending) and get top N
-        scores.sort(reverse=True)
-        return scores[: self.top_n]
+        # Scores are pre-sorted per evaluation, so top N is a slice
+        index = self._load_leaderboard().evaluation_index(eval_name)
+        return index.top_n(self.top_n).tolist()
 
     def _compute(self, dataset: Dataset) -> Dict[str, Union[bool, float, str]]:
         """
@@ -7,9 +7,15 @@ on each benchmark evaluation using the statistical framework.
 
 from analyzer.src.metrics.dynamic.base import UpdatableMetric
 from analyzer.src.metrics.base import Dataset, Leaderboard
-from analyzer.src.metrics.dynamic.saturation_utils import compute_saturation_metrics
-from typing import Dict, Union, List
-import json
+from analyzer.src.metrics.dynamic.saturation_utils import (
+    bootstrap_saturation_metrics_batch,
+    compute_saturation_metrics,
+)
+from analyzer.src.processing.leaderboard_store import (
+    LeaderboardTable,
+    load_leaderboard_table,
+)
+from typing import Dict, Union, List, Optional
 
 
 class SaturationIndexMetric(UpdatableMetric):
@@ -32,6 +38,9 @@ class SaturationIndexMetric(UpdatableMetric):
         dataset_to_eval_map: Dict[str, str] = None,
         alpha: float = 0.5,
         z: float = 1.96,
+        bootstrap_resamples: int = 0,
+        confidence: float = 0.95,
+        seed: Optional[int] = None,
     ):
         """
         Initialize the saturation index metric.
@@ -44,6 +53,10 @@ class SaturationIndexMetric(UpdatableMetric):
             dataset_to_eval_map: Mapping from dataset names to evaluation names
             alpha: Exponent for effective sample size (default 0.5)
             z: Standard normal quantile for confidence (default 1.96 for 95%)
+            bootstrap_resamples: Resamples for confidence intervals on S_index
+                and R_norm (0 to report the point estimate only)
+            confidence: Coverage of the bootstrap intervals (default 0.95)
+            seed: Seed for the bootstrap generator (None for fresh entropy)
         """
         super().__init__(name, description)
         self.top_n = top_n
@@ -51,16 +64,20 @@ class SaturationIndexMetric(UpdatableMetric):
         self.dataset_to_eval_map = dataset_to_eval_map or {}
         self.alpha = alpha
         self.z = z
-        self._model_data = None
+        self.bootstrap_resamples = bootstrap_resamples
+        self.confidence = confidence
+        self.seed = seed
 
-    def _load_model_data(self) -> List[dict]:
-        """Load JSONL file once and cache it."""
-        if self._model_data is None:
-            self._model_data = []
-            with open(self.jsonl_path, "r") as f:
-                for line in f:
-                    self._model_data.append(json.loads(line))
-        return self._model_data
+    @property
+    def cacheable(self) -> bool:
+        """Results are reproducible unless the bootstrap draws fresh entropy."""
+        return self.bootstrap_resamples <= 0 or self.seed is not None
+
+    def _load_leaderboard(self) -> LeaderboardTable:
+        """Get the process-wide table for the leaderboard JSONL file."""
+        # Only the mapped evaluations are loaded
+        evaluations = set(self.dataset_to_eval_map.values()) or None
+        return load_leaderboard_table(self.jsonl_path, evaluations=evaluations)
 
     def _get_top_n_scores(self, dataset: Dataset) -> List[float]:
         """
@@ -72,23 +89,14 @@ class SaturationIndexMetric(UpdatableMetric):
         Returns:
             List of top N scores (sorted descending)
         """
-        model_data = self._load_model_data()
         eval_name = self.dataset_to_eval_map.get(dataset.name)
 
         if not eval_name:
             return []
 
-        # Extract scores for this evaluation
-        scores = []
-        for model in model_data:
-            for eval_result in model.get("evaluation_results", []):
-                if eval_result["evaluation_name"] == eval_name:
-                    scores.append(eval_result["score_details"]["score"])
-                    break
-
-        # Sort by score (descending) and get top N
-        scores.sort(reverse=True)
-        return scores[: self.top_n]
+        # Scores are pre-sorted per evaluation, so top N is a slice
+        index = self._load_leaderboard().evaluation_index(eval_name)
+        return index.top_n(self.top_n).tolist()
 
     def _compute(self, dataset: Dataset) -> Union[Dict, None]:
         """
@@ -101,8 +109,8 @@ class SaturationIndexMetric(UpdatableMetric):
             Dict containing saturation metrics, or None if insufficient data
         """
         # Get test set size from dataset
-        data = dataset.data
-        if data is None:
+        metadata = dataset.metadata
+        if metadata is None:
             return {
                 "status": "error",
                 "message": "No data available",
@@ -110,7 +118,7 @@ class SaturationIndexMetric(UpdatableMetric):
                 "saturation_category": None,
             }
 
-        test_set_size = int(data.iloc[0]["total_samples"])
+        test_set_size = int(metadata.total_samples)
 
         # Get top N scores
         top_scores = self._get_top_n_scores(dataset)
@@ -134,7 +142,7 @@ class SaturationIndexMetric(UpdatableMetric):
                 z=self.z,
             )
 
-            return {
+            result = {
                 "status": "success",
                 "S_index": metrics["s_index"],
                 "saturation_category": metrics["category"],
@@ -149,6 +157,9 @@ class SaturationIndexMetric(UpdatableMetric):
                 "is_statistically_similar": metrics["is_statistically_similar"],
                 "num_models": len(top_scores),
             }
+            if self.bootstrap_resamples:
+                result.update(self._bootstrap(metrics["s1"], metrics["s5"], test_set_size))
+            return result
         except Exception as e:
             return {
                 "status": "error",
@@ -157,6 +168,35 @@ class SaturationIndexMetric(UpdatableMetric):
                 "saturation_category": None,
             }
 
+    def _bootstrap(self, s1: float, s5: float, test_set_size: int) -> Dict:
+        """
+        Get bootstrap confidence intervals for one dataset's saturation.
+
+        Args:
+            s1: Top model score
+            s5: 5th model score
+            test_set_size: Size of the test set
+
+        Returns:
+            Dict with S_index_ci and R_norm_ci ([low, high]) and
+            category_stability (share of resamples in the reported category)
+        """
+        intervals = bootstrap_saturation_metrics_batch(
+            s1,
+            s5,
+            test_set_size,
+            n_resamples=self.bootstrap_resamples,
+            alpha=self.alpha,
+            z=self.z,
+            confidence=self.confidence,
+            seed=self.seed,
+        )
+        return {
+            "S_index_ci": [float(intervals["s_index_low"]), float(intervals["s_index_high"])],
+            "R_norm_ci": [float(intervals["r_norm_low"]), float(intervals["r_norm_high"])],
+            "category_stability": float(intervals["category_stability"]),
+        }
+
     def run_on_dataset(self, dataset: Dataset) -> Union[Dict, None]:
         """
         Run the metric on a single dataset.
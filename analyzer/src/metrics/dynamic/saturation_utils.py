@@ -2,11 +2,28 @@
 Statistical utilities for computing saturation metrics.
 
 This module provides functions for calculating saturation indices based on
-the statistical framework for benchmark saturation analysis.
+the statistical framework for benchmark saturation analysis. The scalar
+helpers document the formula step by step; compute_saturation_metrics_batch
+is the vectorized kernel that every caller runs through. compute_r_norm_batch
+is its lean variant for callers that only compare S_index with thresholds
+over very large arrays.
+
+The bootstrap functions resample the scores behind S_index many times and
+report confidence intervals and how stable the saturation category is.
+They run the same kernel over a (rows x resamples) array.
 """
 
+import heapq
 import math
-from typing import List, Tuple
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+# Category labels indexed by the codes returned from the batch kernel
+SATURATION_CATEGORIES = ("very_low", "low", "moderate", "high", "very_high")
+
+# Lower bounds of every category after "very_low"
+_CATEGORY_THRESHOLDS = np.array([0.01, 0.3, 0.7, 0.9])
 
 
 def compute_n_eff(n: int, alpha: float = 0.5) -> float:
@@ -141,6 +158,118 @@ def categorize_saturation(s_index: float) -> str:
         return "very_high"
 
 
+def compute_saturation_metrics_batch(
+    s1,
+    s5,
+    n,
+    alpha: float = 0.5,
+    z: float = 1.96,
+) -> Dict[str, np.ndarray]:
+    """
+    Compute saturation metrics for many (s1, s5, n) triples at once.
+    
+    Args:
+        s1: Array-like of top model scores in [0, 1]
+        s5: Array-like of 5th model scores in [0, 1]
+        n: Array-like of test set sizes (broadcast against s1/s5)
+        alpha: Exponent for effective sample size (default 0.5)
+        z: Standard normal quantile for confidence (default 1.96 for 95%)
+    
+    Returns:
+        Dictionary of equally shaped arrays:
+            - n_eff: Effective sample size n^alpha
+            - se_delta: Standard error of difference
+            - r_norm: Normalized score range (0 when se_delta is 0)
+            - s_index: Saturation index exp(-r_norm^2)
+            - category_code: Index into SATURATION_CATEGORIES
+            - is_statistically_similar: Whether Δ ≤ z * SE_Δ
+            - valid: Whether the row had usable inputs
+        
+    Note:
+        Rows with a missing or non-positive n, or a missing score or one
+        outside [0, 1], are invalid: their float outputs are NaN, their
+        category code is -1 and they are never statistically similar.
+    """
+    if not 0 <= alpha <= 1:
+        raise ValueError(f"Alpha must be in [0, 1], got {alpha}")
+
+    s1, s5, n = np.broadcast_arrays(
+        np.asarray(s1, dtype=np.float64),
+        np.asarray(s5, dtype=np.float64),
+        np.asarray(n, dtype=np.float64),
+    )
+    valid = (
+        np.isfinite(n) & (n > 0)
+        & (s1 >= 0) & (s1 <= 1)
+        & (s5 >= 0) & (s5 <= 1)
+    )
+
+    with np.errstate(invalid="ignore", divide="ignore"):
+        n_eff = np.where(valid, n, np.nan) ** alpha
+        # Scores at 0 or 1 have zero variance, which falls out of s(1-s)
+        se1 = np.sqrt(s1 * (1 - s1) / n_eff)
+        se5 = np.sqrt(s5 * (1 - s5) / n_eff)
+        se_delta = np.sqrt(se1**2 + se5**2)
+        delta = s1 - s5
+        # Both scores at a boundary means no variation is possible:
+        # report maximum compression rather than dividing by zero
+        r_norm = np.divide(
+            delta, se_delta, out=np.zeros_like(delta), where=se_delta > 0
+        )
+        r_norm[~valid] = np.nan
+        s_index = np.exp(-(r_norm**2))
+
+    category_code = _saturation_category_codes(s_index)
+    category_code = np.where(valid, category_code, -1).astype(np.int8)
+    is_statistically_similar = valid & (delta <= z * se_delta)
+
+    return {
+        "n_eff": n_eff,
+        "se_delta": se_delta,
+        "r_norm": r_norm,
+        "s_index": s_index,
+        "category_code": category_code,
+        "is_statistically_similar": is_statistically_similar,
+        "valid": valid,
+    }
+
+
+def compute_r_norm_batch(s1, s5, n, alpha: float = 0.5) -> np.ndarray:
+    """
+    Compute only the normalized score range for many (s1, s5, n) triples.
+    
+    S_index = exp(-r_norm^2), so S_index >= t exactly when r_norm^2 <= -ln(t).
+    Skipping S_index, categories and the other outputs makes this several
+    times faster than compute_saturation_metrics_batch on large arrays.
+    
+    Args:
+        s1: Array-like of top model scores in [0, 1]
+        s5: Array-like of 5th model scores in [0, 1]
+        n: Array-like of test set sizes (broadcast against s1/s5)
+        alpha: Exponent for effective sample size (default 0.5)
+    
+    Returns:
+        Array of r_norm, NaN for invalid rows (as in compute_saturation_metrics_batch)
+    """
+    if not 0 <= alpha <= 1:
+        raise ValueError(f"Alpha must be in [0, 1], got {alpha}")
+
+    s1 = np.asarray(s1, dtype=np.float64)
+    s5 = np.asarray(s5, dtype=np.float64)
+    n = np.asarray(n, dtype=np.float64)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        # n_eff on n's own shape, before it is broadcast against the scores
+        n_eff = np.where(np.isfinite(n) & (n > 0), n, np.nan) ** alpha
+        variance = (s1 * (1 - s1) + s5 * (1 - s5)) / n_eff
+        delta = s1 - s5
+        r_norm = np.divide(
+            delta, np.sqrt(variance), out=np.zeros(np.broadcast(delta, variance).shape), where=variance > 0
+        )
+    valid = np.isfinite(n_eff) & (s1 >= 0) & (s1 <= 1) & (s5 >= 0) & (s5 <= 1)
+    r_norm[~valid] = np.nan
+    return r_norm
+
+
 def compute_saturation_metrics(
     scores: List[float],
     test_set_size: int,
@@ -175,27 +304,347 @@ def compute_saturation_metrics(
     sorted_scores = sorted(scores, reverse=True)
     s1 = sorted_scores[0]
     s5 = sorted_scores[4]
+
+    # Validate up front so bad input raises instead of turning into NaN
+    compute_n_eff(test_set_size, alpha)
+    for score in (s1, s5):
+        if not 0 <= score <= 1:
+            raise ValueError(f"Score must be in [0, 1], got {score}")
     
     # Compute metrics
-    n_eff = compute_n_eff(test_set_size, alpha)
-    se_delta = compute_se_delta(s1, s5, n_eff)
-    r_norm = compute_normalized_range(s1, s5, se_delta)
-    s_index = compute_saturation_index(r_norm)
-    category = categorize_saturation(s_index)
-    
-    # Check statistical similarity
-    delta = s1 - s5
-    is_statistically_similar = delta <= z * se_delta
+    batch = compute_saturation_metrics_batch(s1, s5, test_set_size, alpha, z)
     
     return {
         "s1": s1,
         "s5": s5,
-        "score_range": delta,
+        "score_range": s1 - s5,
         "mean_score": sum(scores) / len(scores),
-        "n_eff": n_eff,
-        "se_delta": se_delta,
-        "r_norm": r_norm,
-        "s_index": s_index,
-        "category": category,
-        "is_statistically_similar": is_statistically_similar,
+        "n_eff": float(batch["n_eff"]),
+        "se_delta": float(batch["se_delta"]),
+        "r_norm": float(batch["r_norm"]),
+        "s_index": float(batch["s_index"]),
+        "category": SATURATION_CATEGORIES[int(batch["category_code"])],
+        "is_statistically_similar": bool(batch["is_statistically_similar"]),
+    }
+
+
+def _saturation_category_codes(s_index: np.ndarray) -> np.ndarray:
+    return np.searchsorted(_CATEGORY_THRESHOLDS, s_index, side="right")
+
+
+def _summarize_resamples(
+    s_index: np.ndarray,
+    r_norm: np.ndarray,
+    point_code: np.ndarray,
+    confidence: float,
+) -> Dict[str, np.ndarray]:
+    """
+    Reduce (rows x resamples) bootstrap draws to per-row intervals.
+
+    Draws are either all finite or, for invalid input rows, all NaN; the
+    NaN rows get NaN bounds and a category stability of NaN.
+    """
+    tail = (1 - confidence) / 2
+    usable = np.isfinite(s_index).all(axis=1) & (s_index.shape[1] > 0)
+    shape = (s_index.shape[0],)
+    s_low, s_high, r_low, r_high = (np.full(shape, np.nan) for _ in range(4))
+    if usable.any():
+        # Plain quantile: nanquantile falls back to a slow per-row loop
+        s_low[usable], s_high[usable] = np.quantile(s_index[usable], [tail, 1 - tail], axis=1)
+        r_low[usable], r_high[usable] = np.quantile(r_norm[usable], [tail, 1 - tail], axis=1)
+
+    codes = _saturation_category_codes(np.nan_to_num(s_index))
+    category_share = np.stack(
+        [(codes == code).mean(axis=1) for code in range(len(SATURATION_CATEGORIES))],
+        axis=1,
+    ) if s_index.shape[1] else np.full((shape[0], len(SATURATION_CATEGORIES)), np.nan)
+    category_share[~usable] = np.nan
+    stability = np.full(shape, np.nan)
+    known = usable & (point_code >= 0)
+    stability[known] = category_share[known, point_code[known]]
+
+    return {
+        "s_index_low": s_low,
+        "s_index_high": s_high,
+        "r_norm_low": r_low,
+        "r_norm_high": r_high,
+        "category_stability": stability,
+        "category_share": category_share,
+    }
+
+
+def _chunk_seeds(seed, count: int) -> List[np.random.SeedSequence]:
+    # One independent stream per chunk, so results don't depend on how
+    # chunks are spread over workers
+    return np.random.SeedSequence(seed).spawn(count)
+
+
+def _map_chunks(function: Callable, tasks: Sequence[tuple], max_workers: Optional[int]) -> List:
+    if max_workers is None or max_workers <= 1 or len(tasks) <= 1:
+        return [function(*task) for task in tasks]
+    # Imported here so single-process callers don't pay for the pool machinery
+    from concurrent.futures import ProcessPoolExecutor
+
+    with ProcessPoolExecutor(max_workers=max_workers) as pool:
+        return list(pool.map(function, *zip(*tasks)))
+
+
+def _bootstrap_score_chunk(
+    s1: np.ndarray,
+    s5: np.ndarray,
+    n: np.ndarray,
+    n_resamples: int,
+    alpha: float,
+    z: float,
+    confidence: float,
+    seed: np.random.SeedSequence,
+) -> Dict[str, np.ndarray]:
+    """Draw binomial resamples for a chunk of rows and summarize them per row."""
+    rng = np.random.default_rng(seed)
+    rows = s1.shape[0]
+    valid = (
+        np.isfinite(n) & (n > 0)
+        & (s1 >= 0) & (s1 <= 1)
+        & (s5 >= 0) & (s5 <= 1)
+    )
+    # One trial per test item, like the per-item bootstrap; S_index itself
+    # is still computed with n_eff
+    trials = np.where(valid, np.maximum(np.rint(np.where(valid, n, 1)), 1), 1)
+    trials = trials.astype(np.int64)[:, None]
+    size = (rows, n_resamples)
+    top = rng.binomial(trials, np.where(valid, s1, 0)[:, None], size=size) / trials
+    nth = rng.binomial(trials, np.where(valid, s5, 0)[:, None], size=size) / trials
+    # The two models are re-ranked in every resample
+    high, low = np.maximum(top, nth), np.minimum(top, nth)
+    batch = compute_saturation_metrics_batch(high, low, n[:, None], alpha, z)
+    s_index, r_norm = batch["s_index"], batch["r_norm"]
+    s_index[~valid] = np.nan
+    r_norm[~valid] = np.nan
+    point_code = compute_saturation_metrics_batch(s1, s5, n, alpha, z)["category_code"]
+    return _summarize_resamples(s_index, r_norm, point_code.astype(np.int64), confidence)
+
+
+def bootstrap_saturation_metrics_batch(
+    s1,
+    s5,
+    n,
+    n_resamples: int = 2000,
+    alpha: float = 0.5,
+    z: float = 1.96,
+    confidence: float = 0.95,
+    seed: Optional[int] = None,
+    chunk_rows: int = 256,
+    max_workers: Optional[int] = None,
+) -> Dict[str, np.ndarray]:
+    """
+    Bootstrap confidence intervals for many (s1, s5, n) triples at once.
+
+    Each score is redrawn as Binomial(n, s) / n, the binomial approximation
+    of resampling the n test items. S_index and R_norm are then recomputed
+    for every resample with the usual n_eff = n^alpha. Rows are processed in
+    chunks of `chunk_rows`, each with its own seeded stream. Results are
+    reproducible for a given seed and chunk size, whether or not a process
+    pool is used.
+
+    Args:
+        s1: Array-like of top model scores in [0, 1]
+        s5: Array-like of 5th model scores in [0, 1]
+        n: Array-like of test set sizes (broadcast against s1/s5)
+        n_resamples: Resamples per row
+        alpha: Exponent for effective sample size (default 0.5)
+        z: Standard normal quantile for confidence (default 1.96 for 95%)
+        confidence: Coverage of the reported intervals (default 0.95)
+        seed: Seed for the generator (None for fresh entropy)
+        chunk_rows: Rows resampled together; bounds memory at
+            chunk_rows * n_resamples draws
+        max_workers: Process pool size for the chunks (None or 1 runs inline)
+
+    Returns:
+        Dictionary of arrays shaped like the broadcast inputs:
+            - s_index_low, s_index_high: Percentile interval for S_index
+            - r_norm_low, r_norm_high: Percentile interval for R_norm
+            - category_stability: Share of resamples in the point
+              estimate's category
+            - category_share: Share of resamples per category (extra
+              trailing axis, indexed like SATURATION_CATEGORIES)
+        Invalid rows (see compute_saturation_metrics_batch) are NaN throughout.
+    """
+    if n_resamples < 1:
+        raise ValueError(f"n_resamples must be positive, got {n_resamples}")
+    if not 0 < confidence < 1:
+        raise ValueError(f"Confidence must be in (0, 1), got {confidence}")
+
+    s1, s5, n = np.broadcast_arrays(
+        np.asarray(s1, dtype=np.float64),
+        np.asarray(s5, dtype=np.float64),
+        np.asarray(n, dtype=np.float64),
+    )
+    shape = s1.shape
+    s1, s5, n = s1.ravel(), s5.ravel(), n.ravel()
+
+    # Each chunk is summarized where it is drawn, so only per-row results
+    # travel back from workers and memory stays at one chunk of draws
+    starts = range(0, s1.shape[0], chunk_rows)
+    seeds = _chunk_seeds(seed, len(starts))
+    tasks = [
+        (s1[i : i + chunk_rows], s5[i : i + chunk_rows], n[i : i + chunk_rows],
+         n_resamples, alpha, z, confidence, chunk_seed)
+        for i, chunk_seed in zip(starts, seeds)
+    ]
+    parts = _map_chunks(_bootstrap_score_chunk, tasks, max_workers)
+    if not parts:
+        empty = np.empty((0, n_resamples))
+        parts = [_summarize_resamples(empty, empty, np.empty(0, dtype=np.int64), confidence)]
+    return {
+        name: np.concatenate([part[name] for part in parts]).reshape(
+            shape + parts[0][name].shape[1:]
+        )
+        for name in parts[0]
+    }
+
+
+def _bootstrap_item_chunk(
+    correct: np.ndarray,
+    top_n: int,
+    n_resamples: int,
+    alpha: float,
+    z: float,
+    seed: np.random.SeedSequence,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Resample items for a chunk of resamples; returns (s_index, r_norm)."""
+    rng = np.random.default_rng(seed)
+    n_items = correct.shape[1]
+    # Multinomial counts are a resample of the items with replacement;
+    # one matrix product then scores every model on every resample
+    counts = rng.multinomial(n_items, np.full(n_items, 1.0 / n_items), size=n_resamples)
+    scores = counts @ correct.T / n_items
+    # Models are re-ranked in every resample
+    ranked = -np.partition(-scores, top_n - 1, axis=1)
+    s1 = ranked[:, :top_n].max(axis=1)
+    s_n = ranked[:, top_n - 1]
+    batch = compute_saturation_metrics_batch(s1, s_n, n_items, alpha, z)
+    return batch["s_index"], batch["r_norm"]
+
+
+def bootstrap_saturation_from_items(
+    correct,
+    top_n: int = 5,
+    n_resamples: int = 2000,
+    alpha: float = 0.5,
+    z: float = 1.96,
+    confidence: float = 0.95,
+    seed: Optional[int] = None,
+    chunk_resamples: int = 250,
+    max_workers: Optional[int] = None,
+) -> Dict[str, float]:
+    """
+    Bootstrap S_index from per-item correctness of every model.
+
+    Items are resampled with replacement, shared across models. In each
+    resample the models are rescored and re-ranked, and S_index is computed
+    from the new top 1 and top N. Unlike the binomial approximation, this
+    keeps the correlation between models that get the same items right.
+
+    Args:
+        correct: (models x items) array of per-item scores in [0, 1]
+            (0/1 correctness or partial credit)
+        top_n: Rank compared with the top model (default 5)
+        n_resamples: Number of resamples
+        alpha: Exponent for effective sample size (default 0.5)
+        z: Standard normal quantile for confidence (default 1.96 for 95%)
+        confidence: Coverage of the reported intervals (default 0.95)
+        seed: Seed for the generator (None for fresh entropy)
+        chunk_resamples: Resamples drawn together; bounds memory at
+            chunk_resamples * items counts
+        max_workers: Process pool size for the chunks (None or 1 runs inline)
+
+    Returns:
+        Dictionary with the point estimate (s_index, r_norm, category) and
+        s_index_low/high, r_norm_low/high, category_stability and
+        category_share (dict of category -> share of resamples)
+    """
+    correct = np.asarray(correct, dtype=np.float64)
+    if correct.ndim != 2:
+        raise ValueError(f"Expected a (models x items) array, got shape {correct.shape}")
+    n_models, n_items = correct.shape
+    if n_models < top_n:
+        raise ValueError(f"Need at least {top_n} models, got {n_models}")
+    if n_items == 0:
+        raise ValueError("Need at least one item")
+    if n_resamples < 1:
+        raise ValueError(f"n_resamples must be positive, got {n_resamples}")
+    if not 0 < confidence < 1:
+        raise ValueError(f"Confidence must be in (0, 1), got {confidence}")
+
+    observed = np.sort(correct.mean(axis=1))[::-1]
+    point = compute_saturation_metrics_batch(observed[0], observed[top_n - 1], n_items, alpha, z)
+    point_code = int(point["category_code"])
+
+    sizes = [
+        min(chunk_resamples, n_resamples - start)
+        for start in range(0, n_resamples, chunk_resamples)
+    ]
+    seeds = _chunk_seeds(seed, len(sizes))
+    tasks = [
+        (correct, top_n, size, alpha, z, chunk_seed) for size, chunk_seed in zip(sizes, seeds)
+    ]
+    parts = _map_chunks(_bootstrap_item_chunk, tasks, max_workers)
+    s_index = np.concatenate([part[0] for part in parts])[None, :]
+    r_norm = np.concatenate([part[1] for part in parts])[None, :]
+    summary = _summarize_resamples(s_index, r_norm, np.array([point_code]), confidence)
+
+    return {
+        "s_index": float(point["s_index"]),
+        "r_norm": float(point["r_norm"]),
+        "category": SATURATION_CATEGORIES[point_code],
+        "s_index_low": float(summary["s_index_low"][0]),
+        "s_index_high": float(summary["s_index_high"][0]),
+        "r_norm_low": float(summary["r_norm_low"][0]),
+        "r_norm_high": float(summary["r_norm_high"][0]),
+        "category_stability": float(summary["category_stability"][0]),
+        "category_share": dict(zip(SATURATION_CATEGORIES, summary["category_share"][0].tolist())),
     }
+
+
+class RunningTopN:
+    """
+    Bounded min-heap holding the N highest scores seen so far.
+
+    Pushing a score costs O(log N), so walking n submissions in date order
+    and reading the top N after each one costs O(n log N) overall instead of
+    re-sorting every prefix.
+    """
+
+    def __init__(self, n: int, scores: Iterable[float] = ()):
+        if n <= 0:
+            raise ValueError(f"N must be positive, got {n}")
+        self.n = n
+        self._heap: List[float] = []
+        self.count = 0
+        for score in scores:
+            self.push(score)
+
+    def push(self, score: float) -> None:
+        """
+        Add a score, evicting the smallest kept score if the buffer is full.
+
+        Args:
+            score: Model score to add
+        """
+        self.count += 1
+        if len(self._heap) < self.n:
+            heapq.heappush(self._heap, score)
+        elif score > self._heap[0]:
+            heapq.heapreplace(self._heap, score)
+
+    def top(self) -> List[float]:
+        """
+        Get the kept scores, highest first.
+
+        Returns:
+            List[float]: Up to N scores sorted in descending order
+        """
+        return sorted(self._heap, reverse=True)
+
+    def __len__(self) -> int:
+        return len(self._heap)
@@ -3,17 +3,44 @@ Temporal saturation metric for tracking saturation evolution over time.
 
 This metric computes saturation indices using sliding windows of models
 ordered chronologically by submission date.
+
+Trajectories are stored as compressed Parquet with one row per window (see
+analyzer/src/processing/trajectory_store.py). When new submissions arrive
+after the stored ones, only their windows are computed and appended.
 """
 
 from analyzer.src.metrics.dynamic.base import UpdatableMetric
 from analyzer.src.metrics.base import Dataset
-from analyzer.src.metrics.dynamic.saturation_utils import compute_saturation_metrics
-from typing import Dict, List, Union, Optional
+from analyzer.src.metrics.dynamic.saturation_utils import (
+    SATURATION_CATEGORIES,
+    RunningTopN,
+    compute_saturation_metrics_batch,
+)
+from analyzer.src.processing.leaderboard_store import (
+    LeaderboardTable,
+    load_leaderboard_table,
+)
+from analyzer.src.processing.run_profile import profiled
+from analyzer.src.processing.trajectory_store import (
+    TrajectoryStore,
+    read_trajectory_metadata,
+    trajectory_path,
+)
+from typing import Any, Dict, List, Union, Optional
 from datetime import datetime
 from dateutil.relativedelta import relativedelta
 from pathlib import Path
+import hashlib
 import json
+import math
 import os
+import numpy as np
+
+
+TRAJECTORY_FORMATS = ("parquet", "json")
+
+# S_index at which a benchmark counts as saturated for time_to_saturation
+SATURATION_THRESHOLD = 0.7
 
 
 class TemporalSaturationMetric(UpdatableMetric):
@@ -25,9 +52,12 @@ class TemporalSaturationMetric(UpdatableMetric):
     2. Creates sliding windows of N consecutive models
     3. Computes saturation metrics for each window using top-N models until that time
     4. Tracks saturation evolution over time
-    5. Persists trajectory data to JSON files
+    5. Persists trajectory data to Parquet (or, with trajectory_format="json", JSON) files
     """
 
+    # Results depend only on the parameters, the dataset and the JSONL file
+    cacheable = True
+
     def __init__(
         self,
         name: str,
@@ -39,6 +69,7 @@ class TemporalSaturationMetric(UpdatableMetric):
         alpha: float = 0.5,
         z: float = 1.96,
         sampling_interval: int = 10,
+        trajectory_format: str = "parquet",
     ):
         """
         Initialize the temporal saturation metric.
@@ -48,12 +79,18 @@ class TemporalSaturationMetric(UpdatableMetric):
             description: Metric description
             jsonl_path: Path to leaderboard JSONL file
             dataset_to_eval_map: Mapping from dataset names to evaluation names
-            output_dir: Directory to save trajectory JSON files
+            output_dir: Directory to save trajectory files
             top_n: Number of top models to analyze (default 5)
             alpha: Exponent for effective sample size (default 0.5)
             z: Standard normal quantile for confidence (default 1.96 for 95%)
-            sampling_interval: Store every Nth window (default 10)
+            sampling_interval: Store every Nth window in JSON trajectories (default 10)
+            trajectory_format: "parquet" (every window, appendable; requires pyarrow)
+                or "json" (sampled windows, rewritten on every run)
         """
+        if trajectory_format not in TRAJECTORY_FORMATS:
+            raise ValueError(
+                f"Unknown trajectory_format {trajectory_format!r}, expected one of {TRAJECTORY_FORMATS}"
+            )
         super().__init__(name, description)
         self.jsonl_path = jsonl_path
         self.dataset_to_eval_map = dataset_to_eval_map or {}
@@ -62,18 +99,48 @@ class TemporalSaturationMetric(UpdatableMetric):
         self.alpha = alpha
         self.z = z
         self.sampling_interval = sampling_interval
-        self._model_data = None
+        self.trajectory_format = trajectory_format
         self._trajectory = []
 
-    def _load_model_data(self) -> List[dict]:
-        """Load JSONL file once and cache it."""
-        if self._model_data is None:
-            self._model_data = []
-            with open(self.jsonl_path, "r") as f:
-                for line in f:
-                    self._model_data.append(json.loads(line))
-        return self._model_data
+    def accepts_cached(self, result) -> bool:
+        """
+        Reuse a cached result only while its trajectory file still matches it.
 
+        Metrics with different parameters but the same output_dir write to the
+        same trajectory paths. The file's parameters and models hash must
+        match the result's, or another run has replaced it since.
+        """
+        path = result.get("trajectory_file_path") if isinstance(result, dict) else None
+        if path is None:
+            return True
+        expected = {
+            "top_n": self.top_n,
+            "alpha": self.alpha,
+            "z": self.z,
+            "test_set_size": result.get("test_set_size"),
+            "models_hash": result.get("models_hash"),
+        }
+        if os.path.isdir(path):
+            metadata = read_trajectory_metadata(path)
+        else:
+            # JSON trajectories also depend on which windows were sampled
+            expected["sampling_interval"] = self.sampling_interval
+            try:
+                with open(path, "r") as f:
+                    metadata = json.load(f).get("metadata")
+            except (OSError, ValueError):
+                metadata = None
+        if metadata is None:
+            return False
+        return all(metadata.get(key) == value for key, value in expected.items())
+
+    def _load_leaderboard(self) -> LeaderboardTable:
+        """Get the process-wide table for the leaderboard JSONL file."""
+        # Only the mapped evaluations are loaded
+        evaluations = set(self.dataset_to_eval_map.values()) or None
+        return load_leaderboard_table(self.jsonl_path, evaluations=evaluations)
+
+    @profiled("extract_models")
     def _extract_models_with_dates(
         self, eval_name: str
     ) -> tuple[List[dict], List[str]]:
@@ -88,23 +155,14 @@ class TemporalSaturationMetric(UpdatableMetric):
             - valid_models: List of dicts with {model_id, score, created_at, created_at_datetime}
             - skipped_model_ids: List of model IDs without created_at dates
         """
-        model_data = self._load_model_data()
+        table = self._load_leaderboard()
         valid_models = []
         skipped_model_ids = []
 
-        for model in model_data:
-            model_id = model.get("model_info", {}).get("id", "unknown")
-            submission_date = model.get("submission_date")
-
-            # Find the evaluation result
-            eval_result = None
-            for result in model.get("evaluation_results", []):
-                if result["evaluation_name"] == eval_name:
-                    eval_result = result
-                    break
-
-            if eval_result is None:
-                continue  # Model doesn't have this evaluation
+        for row in table.evaluation_rows(eval_name):
+            model = table.score_model[row]
+            model_id = table.model_id[model]
+            submission_date = table.submission_date[model]
 
             # Check if submission date is available
             if not submission_date:
@@ -114,7 +172,9 @@ class TemporalSaturationMetric(UpdatableMetric):
             try:
                 # Parse submission date
                 submission_datetime = datetime.strptime(submission_date, "%Y-%m-%d")
-                score = eval_result["score_details"]["score"]
+                score = float(table.score[row])
+                if math.isnan(score):
+                    raise ValueError(f"Missing score for {model_id}")
 
                 valid_models.append({
                     "model_id": model_id,
@@ -122,7 +182,7 @@ class TemporalSaturationMetric(UpdatableMetric):
                     "submission_date": submission_date,
                     "submission_datetime": submission_datetime,
                 })
-            except (ValueError, KeyError) as e:
+            except (ValueError, TypeError):
                 # Failed to parse date or extract score
                 skipped_model_ids.append(model_id)
 
@@ -131,6 +191,121 @@ class TemporalSaturationMetric(UpdatableMetric):
 
         return valid_models, skipped_model_ids
 
+    def _window_top_n_scores(
+        self,
+        valid_models: List[dict],
+        start: int = 0,
+        seed_scores: Optional[List[float]] = None,
+    ) -> np.ndarray:
+        """
+        Get the cumulative top-N scores at the end of every sliding window.
+        
+        The cumulative top-N is maintained incrementally with a bounded heap
+        while walking submissions in date order, so this costs O(n log N).
+        
+        Args:
+            valid_models: List of models sorted by submission date (earliest first)
+            start: First window to compute
+            seed_scores: Top-N scores at the end of window start - 1, if known;
+                otherwise they are rebuilt from the earlier models
+        
+        Returns:
+            Array of shape (num_windows - start, top_n); row i holds the top-N
+            scores, highest first, among models 0..start + i + top_n - 1
+        """
+        num_windows = len(valid_models) - self.top_n + 1
+        top_n_scores = np.empty((num_windows - start, self.top_n), dtype=np.float64)
+
+        # Seed the running top-N with everything before the first window end
+        if seed_scores is None:
+            seed_scores = (m["score"] for m in valid_models[: start + self.top_n - 1])
+        running_top_n = RunningTopN(self.top_n, seed_scores)
+        for window_idx in range(start, num_windows):
+            # Fold in the newest submission; the heap now covers the window end
+            running_top_n.push(valid_models[window_idx + self.top_n - 1]["score"])
+            top_n_scores[window_idx - start] = running_top_n.top()
+
+        return top_n_scores
+
+    @profiled("windows")
+    def _window_columns(
+        self,
+        valid_models: List[dict],
+        test_set_size: int,
+        start: int = 0,
+        seed_scores: Optional[List[float]] = None,
+    ) -> Dict[str, Any]:
+        """
+        Compute saturation metrics for sliding windows as columns.
+        
+        Saturation metrics for all windows are computed in one vectorized
+        kernel call.
+        
+        Args:
+            valid_models: List of models sorted by submission date (earliest first)
+            test_set_size: Size of the test set for this evaluation
+            start: First window to compute
+            seed_scores: Top-N scores at the end of window start - 1, if known
+        
+        Returns:
+            Dict mapping column names to one value per window from `start` on
+        
+        Raises:
+            ValueError: If a window's scores or the test set size are invalid
+        """
+        if self.top_n < 5:
+            raise ValueError(f"Need at least 5 scores, got {self.top_n}")
+
+        top_n_scores = self._window_top_n_scores(valid_models, start, seed_scores)
+        s1 = top_n_scores[:, 0]
+        s5 = top_n_scores[:, 4]
+        metrics = compute_saturation_metrics_batch(
+            s1, s5, test_set_size, alpha=self.alpha, z=self.z
+        )
+        if not metrics["valid"].all():
+            bad_window = int(np.flatnonzero(~metrics["valid"])[0])
+            raise ValueError(
+                f"Invalid inputs in window {start + bad_window}: test_set_size={test_set_size}, "
+                f"s1={s1[bad_window]}, s5={s5[bad_window]}"
+            )
+
+        window_index = np.arange(start, start + len(top_n_scores), dtype=np.int64)
+        window_end_index = window_index + self.top_n - 1
+        return {
+            "window_index": window_index,
+            "window_start_date": [valid_models[i]["submission_date"] for i in window_index],
+            "window_end_date": [valid_models[i]["submission_date"] for i in window_end_index],
+            "num_models_until_now": window_end_index + 1,
+            "top_n_scores": top_n_scores,
+            "mean_score": top_n_scores.mean(axis=1),
+            "s1": s1,
+            "s5": s5,
+            "score_range": s1 - s5,
+            "S_index": metrics["s_index"],
+            "R_norm": metrics["r_norm"],
+            "SE_delta": metrics["se_delta"],
+            "saturation_category": [SATURATION_CATEGORIES[code] for code in metrics["category_code"]],
+            "n_eff": metrics["n_eff"],
+            "is_statistically_similar": metrics["is_statistically_similar"],
+        }
+
+    @staticmethod
+    def _window_row(columns: Dict[str, Any], position: int) -> Dict[str, Any]:
+        """Get one window from _window_columns output as plain Python values."""
+        row = {}
+        for name, values in columns.items():
+            value = values[position]
+            row[name] = value.tolist() if hasattr(value, "tolist") else value
+        return row
+
+    @staticmethod
+    def _first_saturated_date(columns: Dict[str, Any]) -> Optional[str]:
+        """Get the end date of the first window with S_index >= 0.7, or None."""
+        saturated = np.flatnonzero(columns["S_index"] >= SATURATION_THRESHOLD)
+        if len(saturated):
+            return columns["window_end_date"][int(saturated[0])]
+        return None
+
     def _compute_sliding_windows(
         self,
         valid_models: List[dict],
@@ -152,67 +327,148 @@ class TemporalSaturationMetric(UpdatableMetric):
             - time_to_saturation: Date when S_index >= 0.7 first occurred, or None
         """
         trajectory = []
-        time_to_saturation = None
         num_models = len(valid_models)
 
         if num_models < self.top_n:
-            return trajectory, time_to_saturation
-
-        # Create sliding windows (overlapping groups of top_n)
-        for window_idx in range(num_models - self.top_n + 1):
-            # Window end is at position window_idx + top_n - 1
-            window_end_idx = window_idx + self.top_n - 1
-            
-            # Get the N consecutive submissions in this window
-            window_models = valid_models[window_idx : window_idx + self.top_n]
-            
-            # Get ALL models submitted until this time point (from 0 to window_end_idx)
-            models_until_now = valid_models[: window_end_idx + 1]
-            
-            # Extract scores and sort to get top-N performers
-            all_scores_until_now = [m["score"] for m in models_until_now]
-            all_scores_until_now.sort(reverse=True)
-            
-            # Take top-N scores
-            top_n_scores = all_scores_until_now[:self.top_n]
-
-            # Compute saturation metrics for these top-N models
-            metrics = compute_saturation_metrics(
-                scores=top_n_scores,
-                test_set_size=test_set_size,
-                alpha=self.alpha,
-                z=self.z,
-            )
-            
-            # Check for time-to-saturation (S_index >= 0.7 for the first time)
-            if time_to_saturation is None and metrics["s_index"] >= 0.7:
-                time_to_saturation = window_models[-1]["submission_date"]
-
-            # Store only every Nth window (for memory efficiency)
-            if window_idx % self.sampling_interval == 0 or window_idx == num_models - self.top_n:
-                window_result = {
-                    "window_index": window_idx,
-                    "window_start_date": window_models[0]["submission_date"],
-                    "window_end_date": window_models[-1]["submission_date"],
-                    "num_models_until_now": len(models_until_now),
-                    "top_n": self.top_n,
-                    "top_n_scores": top_n_scores,
-                    "mean_score": metrics["mean_score"],
-                    "s1": metrics["s1"],
-                    "s5": metrics["s5"],
-                    "score_range": metrics["score_range"],
-                    "S_index": metrics["s_index"],
-                    "R_norm": metrics["r_norm"],
-                    "SE_delta": metrics["se_delta"],
-                    "saturation_category": metrics["category"],
-                    "n_eff": metrics["n_eff"],
-                    "test_set_size": test_set_size,
-                    "is_statistically_similar": metrics["is_statistically_similar"],
-                }
-                trajectory.append(window_result)
+            return trajectory, None
+
+        columns = self._window_columns(valid_models, test_set_size)
+        time_to_saturation = self._first_saturated_date(columns)
+
+        # Store only every Nth window (for memory efficiency)
+        last_window_idx = num_models - self.top_n
+        sampled = list(range(0, last_window_idx + 1, self.sampling_interval))
+        if sampled[-1] != last_window_idx:
+            sampled.append(last_window_idx)
+
+        for window_idx in sampled:
+            row = self._window_row(columns, window_idx)
+            window_result = {
+                "window_index": row["window_index"],
+                "window_start_date": row["window_start_date"],
+                "window_end_date": row["window_end_date"],
+                "num_models_until_now": row["num_models_until_now"],
+                "top_n": self.top_n,
+                "top_n_scores": row["top_n_scores"],
+                "mean_score": row["mean_score"],
+                "s1": row["s1"],
+                "s5": row["s5"],
+                "score_range": row["score_range"],
+                "S_index": row["S_index"],
+                "R_norm": row["R_norm"],
+                "SE_delta": row["SE_delta"],
+                "saturation_category": row["saturation_category"],
+                "n_eff": row["n_eff"],
+                "test_set_size": test_set_size,
+                "is_statistically_similar": row["is_statistically_similar"],
+            }
+            trajectory.append(window_result)
 
         return trajectory, time_to_saturation
 
+    @staticmethod
+    def _hash_models(valid_models: List[dict], prefix_length: Optional[int] = None) -> tuple[Optional[str], str]:
+        """
+        Hash the ordered (model, date, score) sequence.
+
+        Args:
+            valid_models: List of models sorted by submission date (earliest first)
+            prefix_length: Also hash the first this many models, if given
+
+        Returns:
+            Tuple of (prefix_hash, models_hash); prefix_hash is None unless
+            prefix_length is between 1 and len(valid_models)
+        """
+        hasher = hashlib.blake2b(digest_size=16)
+        prefix_hash = None
+        for position, model in enumerate(valid_models, start=1):
+            hasher.update(f"{model['model_id']}\t{model['submission_date']}\t{model['score']!r}\n".encode("utf-8"))
+            if position == prefix_length:
+                prefix_hash = hasher.hexdigest()
+        return prefix_hash, hasher.hexdigest()
+
+    @staticmethod
+    def _relative_path(filepath: str) -> str:
+        """Convert to a path relative to the working directory, for portability."""
+        try:
+            return os.path.relpath(filepath, os.getcwd())
+        except (ValueError, TypeError):
+            # If relative path calculation fails, use the original path
+            return filepath
+
+    def _update_trajectory_store(
+        self,
+        eval_name: str,
+        valid_models: List[dict],
+        test_set_size: int,
+        skipped_model_ids: List[str],
+    ) -> tuple[Dict[str, Any], Optional[str], str, str]:
+        """
+        Bring an evaluation's Parquet trajectory up to date.
+        
+        The metadata keeps a hash of the ordered (model, date, score) sequence
+        the stored windows were computed from. If the current submissions
+        start with that same sequence and the parameters match, only the
+        windows ending at the new submissions are computed, resuming the
+        running top-N from the last stored window, and appended as one new
+        part. Otherwise the trajectory is rewritten.
+        
+        Args:
+            eval_name: Name of the evaluation
+            valid_models: List of models sorted by submission date (earliest first)
+            test_set_size: Size of the test set for this evaluation
+            skipped_model_ids: IDs of models without usable submission dates
+        
+        Returns:
+            Tuple of (latest_window, time_to_saturation, trajectory_path, models_hash)
+        """
+        store = TrajectoryStore(trajectory_path(self.output_dir, eval_name))
+        params = {"top_n": self.top_n, "alpha": self.alpha, "z": self.z, "test_set_size": test_set_size}
+        stored = store.read_metadata()
+        if stored is not None and any(stored.get(key) != value for key, value in params.items()):
+            stored = None
+        stored_models = stored["num_models"] if stored is not None else None
+
+        prefix_hash, models_hash = self._hash_models(valid_models, stored_models)
+
+        total_windows = len(valid_models) - self.top_n + 1
+        start, seed_scores, time_to_saturation, last_window = 0, None, None, None
+        append = stored is not None and prefix_hash == stored["models_hash"]
+        if append:
+            last_window = store.last_window(stored)
+            if last_window is None or stored["total_windows"] != last_window["window_index"] + 1:
+                append, last_window = False, None
+            else:
+                start = stored["total_windows"]
+                seed_scores = last_window["top_n_scores"]
+                time_to_saturation = stored["time_to_saturation"]
+
+        columns = None
+        if start < total_windows:
+            columns = self._window_columns(valid_models, test_set_size, start, seed_scores)
+            if time_to_saturation is None:
+                time_to_saturation = self._first_saturated_date(columns)
+            last_window = self._window_row(columns, total_windows - start - 1)
+
+        store.write(
+            columns,
+            {
+                "evaluation_name": eval_name,
+                "total_windows": total_windows,
+                "num_models": len(valid_models),
+                "models_hash": models_hash,
+                **params,
+                "num_skipped_models": len(skipped_model_ids),
+                "skipped_model_ids": skipped_model_ids,
+                "time_to_saturation": time_to_saturation,
+                "saturation_threshold": SATURATION_THRESHOLD,
+                "generated_at": datetime.now().isoformat(),
+            },
+            append=append,
+        )
+        return last_window, time_to_saturation, self._relative_path(store.directory), models_hash
+
+    @profiled("trajectory_write")
     def _persist_trajectory(
         self,
         eval_name: str,
@@ -221,6 +477,8 @@ class TemporalSaturationMetric(UpdatableMetric):
         num_skipped_models: int,
         skipped_model_ids: List[str],
         time_to_saturation: Optional[str],
+        test_set_size: int,
+        models_hash: str,
     ) -> str:
         """
         Save trajectory data to a JSON file.
@@ -232,6 +490,8 @@ class TemporalSaturationMetric(UpdatableMetric):
             num_skipped_models: Number of models without submission dates
             skipped_model_ids: IDs of skipped models
             time_to_saturation: Date when S_index >= 0.7 first occurred, or None
+            test_set_size: Size of the test set for this evaluation
+            models_hash: Hash of the models the trajectory was computed from
         
         Returns:
             Path to the saved JSON file
@@ -249,30 +509,24 @@ class TemporalSaturationMetric(UpdatableMetric):
                 "top_n": self.top_n,
                 "alpha": self.alpha,
                 "z": self.z,
+                "test_set_size": test_set_size,
+                "models_hash": models_hash,
                 "num_skipped_models": num_skipped_models,
                 "skipped_model_ids": skipped_model_ids,
                 "time_to_saturation": time_to_saturation,
-                "saturation_threshold": 0.7,
+                "saturation_threshold": SATURATION_THRESHOLD,
                 "generated_at": datetime.now().isoformat(),
             },
             "trajectory": trajectory,
         }
 
         # Save to file
-        filename = f"{eval_name.replace(' ', '_')}_saturation_trajectory.json"
-        filepath = os.path.join(self.output_dir, filename)
+        filepath = trajectory_path(self.output_dir, eval_name, ".json")
 
         with open(filepath, "w") as f:
             json.dump(output_data, f, indent=2)
 
-        # Convert to relative path for portability
-        try:
-            relative_path = os.path.relpath(filepath, os.getcwd())
-        except (ValueError, TypeError):
-            # If relative path calculation fails, use the original path
-            relative_path = filepath
-
-        return relative_path
+        return self._relative_path(filepath)
 
     def _compute(self, dataset: Dataset) -> Union[Dict, None]:
         """
@@ -285,8 +539,8 @@ class TemporalSaturationMetric(UpdatableMetric):
             Dict containing latest saturation metrics and metadata, or None if insufficient data
         """
         # Get test set size from dataset
-        data = dataset.data
-        if data is None:
+        metadata = dataset.metadata
+        if metadata is None:
             return {
                 "status": "error",
                 "message": "No data available",
@@ -294,7 +548,7 @@ class TemporalSaturationMetric(UpdatableMetric):
                 "saturation_category": None,
             }
 
-        test_set_size = int(data.iloc[0]["total_samples"])
+        test_set_size = int(metadata.total_samples)
 
         # Get evaluation name for JSONL lookup
         eval_name = self.dataset_to_eval_map.get(dataset.name)
@@ -320,25 +574,36 @@ class TemporalSaturationMetric(UpdatableMetric):
                 "saturation_category": None,
             }
 
-        # Compute sliding windows
-        trajectory, time_to_saturation = self._compute_sliding_windows(valid_models, test_set_size)
-
         # Calculate total windows
         total_windows = len(valid_models) - self.top_n + 1
 
-        # Persist trajectory to JSON
-        trajectory_file = self._persist_trajectory(
-            eval_name=eval_name,
-            trajectory=trajectory,
-            total_windows=total_windows,
-            num_skipped_models=len(skipped_model_ids),
-            skipped_model_ids=skipped_model_ids,
-            time_to_saturation=time_to_saturation,
-        )
+        if self.trajectory_format == "parquet":
+            # Compute the windows not stored yet and append them
+            latest_window, time_to_saturation, trajectory_file, models_hash = self._update_trajectory_store(
+                eval_name, valid_models, test_set_size, skipped_model_ids
+            )
+            num_stored_windows = total_windows
+        else:
+            # Compute sliding windows
+            trajectory, time_to_saturation = self._compute_sliding_windows(valid_models, test_set_size)
+
+            # Persist trajectory to JSON
+            _, models_hash = self._hash_models(valid_models)
+            trajectory_file = self._persist_trajectory(
+                eval_name=eval_name,
+                trajectory=trajectory,
+                total_windows=total_windows,
+                num_skipped_models=len(skipped_model_ids),
+                skipped_model_ids=skipped_model_ids,
+                time_to_saturation=time_to_saturation,
+                test_set_size=test_set_size,
+                models_hash=models_hash,
+            )
+            latest_window = trajectory[-1] if trajectory else None
+            num_stored_windows = len(trajectory)
 
         # Return summary metrics (latest window)
-        if trajectory:
-            latest_window = trajectory[-1]
+        if latest_window:
             return {
                 "status": "success",
                 "S_index": latest_window["S_index"],
@@ -350,7 +615,7 @@ class TemporalSaturationMetric(UpdatableMetric):
                 "s1": latest_window["s1"],
                 "s5": latest_window["s5"],
                 "num_windows_computed": total_windows,
-                "num_sampled_windows": len(trajectory),
+                "num_sampled_windows": num_stored_windows,
                 "num_skipped_models": len(skipped_model_ids),
                 "num_valid_models": len(valid_models),
                 "date_range_covered": f"{valid_models[0]['submission_date']} to {valid_models[-1]['submission_date']}",
@@ -359,6 +624,7 @@ class TemporalSaturationMetric(UpdatableMetric):
                 "test_set_size": test_set_size,
                 "n_eff": latest_window["n_eff"],
                 "trajectory_file_path": trajectory_file,
+                "models_hash": models_hash,
             }
         else:
             return {
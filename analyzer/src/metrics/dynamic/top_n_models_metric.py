@@ -1,7 +1,10 @@
 from analyzer.src.metrics.dynamic.base import UpdatableMetric
 from analyzer.src.metrics.base import Dataset, Leaderboard
+from analyzer.src.processing.leaderboard_store import (
+    LeaderboardTable,
+    load_leaderboard_table,
+)
 from typing import Dict, Union, List
-import json
 
 
 class TopNModelsMetric(UpdatableMetric):
@@ -9,6 +12,9 @@ class TopNModelsMetric(UpdatableMetric):
     Metric to find top N performing models for each dataset from evaluation results.
     """
 
+    # Results depend only on the parameters, the dataset and the JSONL file
+    cacheable = True
+
     def __init__(
         self,
         name: str,
@@ -20,19 +26,15 @@ class TopNModelsMetric(UpdatableMetric):
         super().__init__(name, description)
         self.top_n = top_n
         self.jsonl_path = jsonl_path
-        self._model_data = None
 
         # Map dataset names to evaluation names in JSONL
         self.dataset_to_eval_map = dataset_to_eval_map or {}
 
-    def _load_model_data(self):
-        """Load JSONL file once and cache it."""
-        if self._model_data is None:
-            self._model_data = []
-            with open(self.jsonl_path, "r") as f:
-                for line in f:
-                    self._model_data.append(json.loads(line))
-        return self._model_data
+    def _load_leaderboard(self) -> LeaderboardTable:
+        """Get the process-wide table for the leaderboard JSONL file."""
+        # Only the mapped evaluations are loaded
+        evaluations = set(self.dataset_to_eval_map.values()) or None
+        return load_leaderboard_table(self.jsonl_path, evaluations=evaluations)
 
     def _compute(self, dataset: Dataset) -> List[Dict[str, Union[str, float]]]:
         """
@@ -44,35 +46,27 @@ class TopNModelsMetric(UpdatableMetric):
         Returns:
             List of dicts containing model info and scores
         """
-        model_data = self._load_model_data()
         eval_name = self.dataset_to_eval_map.get(dataset.name)
 
         if not eval_name:
             return []
 
-        # Extract scores for this evaluation
-        model_scores = []
-        for model in model_data:
-            for eval_result in model.get("evaluation_results", []):
-                if eval_result["evaluation_name"] == eval_name:
-                    model_scores.append(
-                        {
-                            "model_name": model["model_info"]["name"],
-                            "developer": model["model_info"]["developer"],
-                            "score": eval_result["score_details"]["score"],
-                            "params_billions": model.get("additional_details", {}).get(
-                                "params_billions"
-                            ),
-                            "architecture": model.get("additional_details", {}).get(
-                                "architecture"
-                            ),
-                        }
-                    )
-                    break
-
-        # Sort by score (descending) and get top N
-        model_scores.sort(key=lambda x: x["score"], reverse=True)
-        return model_scores[: self.top_n]
+        table = self._load_leaderboard()
+        index = table.evaluation_index(eval_name)
+
+        # Scores are pre-sorted per evaluation, so top N is a slice
+        return [
+            {
+                "model_name": table.model_name[model],
+                "developer": table.developer[model],
+                "score": float(score),
+                "params_billions": table.params_billions[model],
+                "architecture": table.architecture[model],
+            }
+            for score, model in zip(
+                index.top_n(self.top_n), index.top_models(self.top_n)
+            )
+        ]
 
     def run_on_dataset(self, dataset: Dataset) -> List[Dict[str, Union[str, float]]]:
         """
@@ -1,9 +1,11 @@
-from analyzer.src.metrics.dynamic.base import UpdatableMetric
+from analyzer.src.metrics.dynamic.base import HubPopularityMetric, metadata_column
 from analyzer.src.metrics.base import Dataset, Leaderboard
-from typing import Union, Dict
+from typing import Union, Dict, Optional, Sequence
+from analyzer.src.processing.metric_history import HistoryBackend
+import numpy as np
 
 
-class TrendingScoreMetric(UpdatableMetric):
+class TrendingScoreMetric(HubPopularityMetric):
     """
     Tracks the trending score for a dataset over time.
     
@@ -12,10 +14,14 @@ class TrendingScoreMetric(UpdatableMetric):
     """
 
     def __init__(
-        self, name: str = "trending_score", description: str = "", update_frequency_days: int = 1
+        self,
+        name: str = "trending_score",
+        description: str = "",
+        update_frequency_days: int = 1,
+        history: Optional[HistoryBackend] = None,
     ):
         # Trending scores change more frequently, so default to daily updates
-        super().__init__(name, description, update_frequency_days)
+        super().__init__(name, description, update_frequency_days, history)
 
     def _compute_current(self, dataset: Dataset) -> float:
         """
@@ -27,14 +33,26 @@ class TrendingScoreMetric(UpdatableMetric):
         Returns:
             float: Current trending score
         """
-        data = dataset.data
-        if data is None or data.empty:
+        metadata = dataset.metadata
+        if metadata is None:
             return 0.0
         
         # Try to get trending_score from the dataset's metadata
-        trending_score = data.iloc[0].get("trending_score", 0)
+        trending_score = metadata.trending_score
         return float(trending_score) if trending_score else 0.0
 
+    def _compute_batch(self, datasets: Sequence[Dataset]) -> np.ndarray:
+        """
+        Get the current trending scores for many datasets.
+
+        Args:
+            datasets: The datasets to analyze
+
+        Returns:
+            np.ndarray: Current trending score of each dataset
+        """
+        return metadata_column(datasets, "trending_score")
+
     def run_on_dataset(self, dataset: Dataset) -> float:
         """
         Run the metric on a single dataset.
@@ -1,5 +1,6 @@
 from typing import Dict
 from analyzer.src.metrics.base import Metric, Leaderboard
+from analyzer.src.processing.result_cache import target_fingerprint
 from typing import Union
 
 
@@ -11,6 +12,8 @@ class StaticMetric(Metric):
     their values don't change over time.
     """
 
+    cacheable = True
+
     def __init__(self, name: str, description: str = ""):
         super().__init__(name, description)
         self._computed_values: Dict[str, float] = {}
@@ -49,7 +52,11 @@ class StaticMetric(Metric):
 
     def _get_leaderboard_id(self, leaderboard: Leaderboard) -> str:
         """
-        Get a unique identifier for the benchmark.
+        Get an identifier for the benchmark's content.
+
+        The id hashes the target's metadata rather than its object identity,
+        so a reused id() or a changed metadata record never returns a stale
+        value.
 
         Args:
             leaderboard: The leaderboard
@@ -58,4 +65,4 @@ class StaticMetric(Metric):
             str: Unique identifier
         """
         # Default implementation - subclasses can override
-        return f"{leaderboard.__class__.__name__}_{id(leaderboard)}"
+        return f"{leaderboard.__class__.__name__}_{target_fingerprint(leaderboard)}"
@@ -12,11 +12,11 @@ class EvaluationMetric(StaticMetric):
         super().__init__(name, description)
 
     def _compute(self, dataset: Dataset) -> Union[float, str]:
-        data = dataset.data
-        if data is None:
+        metadata = dataset.metadata
+        if metadata is None:
             return "No data available"
 
-        return data.iloc[0]["eval_metrics"]
+        return metadata.eval_metrics
 
     def run_on_dataset(self, dataset: Dataset) -> Union[float, str]:
         return self._compute(dataset)
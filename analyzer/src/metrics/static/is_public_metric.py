@@ -12,11 +12,11 @@ class IsPublicMetric(StaticMetric):
         super().__init__(name, description)
 
     def _compute(self, dataset: Dataset) -> Union[float, str]:
-        data = dataset.data
-        if data is None:
+        metadata = dataset.metadata
+        if metadata is None:
             return "No data available"
 
-        return bool(data.iloc[0]["is_public"])
+        return bool(metadata.is_public)
 
     def run_on_dataset(self, dataset: Dataset) -> Union[float, str]:
         return self._compute(dataset)
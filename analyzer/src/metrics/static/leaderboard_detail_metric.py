@@ -8,13 +8,11 @@ class LeaderboardDetailMetric(StaticMetric):
         super().__init__(name, description)
 
     def _compute(self, dataset: Dataset) -> Union[float, str]:
-        data = dataset.data
-        if data is None:
+        metadata = dataset.metadata
+        if metadata is None:
             return "No data available"
 
-        return data.iloc[0][
-            "leaderboard_detail"
-        ]  # Format will be leaderboard_name and link to leaderboard
+        return metadata.leaderboard_detail  # Format will be leaderboard_name and link to leaderboard
 
     def run_on_dataset(self, dataset: Dataset) -> Union[float, str]:
         return self._compute(dataset)
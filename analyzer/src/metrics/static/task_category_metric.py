@@ -8,11 +8,11 @@ class TaskCategoryMetric(StaticMetric):
         super().__init__(name, description)
 
     def _compute(self, dataset: Dataset) -> Union[float, str, list]:
-        data = dataset.data
-        if data is None:
+        metadata = dataset.metadata
+        if metadata is None:
             return "No data available"
 
-        task_cat = data.iloc[0]["task_categories"]
+        task_cat = metadata.task_categories
         # Handle list of categories
         if isinstance(task_cat, list):
             return task_cat
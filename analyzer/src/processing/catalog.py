@@ -0,0 +1,342 @@
+"""
+Shared, lazily loaded dataset metadata catalog.
+
+`data/all_datasets.json` maps Hugging Face `datasetId` to a metadata record
+and is read by every dataset adapter. Instead of `json.load`-ing the whole
+file once per adapter, this module indexes it once per process into a table
+of byte offsets, one per record, and decodes individual records on demand.
+JSON Lines catalogs (`parse_yaml_files_to_json.py --format jsonl`) are
+indexed line by line the same way.
+Only the records that are actually looked up are ever held in memory, and
+their heavy fields (the raw dataset card text) are dropped unless asked for.
+"""
+
+import json
+import os
+import re
+import threading
+from collections.abc import Mapping
+from typing import Any, Callable, Dict, Iterator, Optional, Tuple
+
+# Fields too large to keep around for every record that is looked up
+HEAVY_FIELDS = ("card",)
+
+_WHITESPACE = re.compile(r"[ \t\n\r]*")
+# Fast path for JSON Lines records, which the builder writes datasetId-first
+_JSONL_ID = re.compile(rb'^\{"datasetId":\s*("(?:[^"\\]|\\.)*")')
+_decoder = json.JSONDecoder()
+
+
+class DatasetCatalog(Mapping):
+    """
+    Read-only mapping of datasetId -> metadata record backed by a JSON file.
+
+    The file must hold a JSON object keyed by datasetId, optionally nested
+    under `root_key` (e.g. {"datasets": {...}} in helm_dataset_metadata.json),
+    or, for `.jsonl` files, one record per line keyed by its datasetId field.
+    As with json.load, the last record wins when a datasetId repeats.
+    Records are decoded from their byte range in the file on first access and
+    memoized without their heavy fields.
+    """
+
+    def __init__(self, path: str, root_key: Optional[str] = None):
+        """
+        Initialize the catalog. The file is not read until first access.
+
+        Args:
+            path: Path to the catalog JSON file
+            root_key: Top-level key the records are nested under, if any
+        """
+        self.path = path
+        self.root_key = root_key
+        self._mtime: Optional[int] = None
+        self._offsets: Dict[str, Tuple[int, int]] = {}
+        self._records: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.RLock()
+
+    def _ensure_index(self) -> None:
+        mtime = os.stat(self.path).st_mtime_ns
+        if self._mtime == mtime:
+            return
+        with self._lock:
+            if self._mtime == mtime:
+                return
+            self._offsets = self._build_index()
+            self._records = {}
+            self._mtime = mtime
+
+    def _build_index(self) -> Dict[str, Tuple[int, int]]:
+        if self.path.endswith(".jsonl"):
+            return self._build_jsonl_index()
+        with open(self.path, "r", encoding="utf-8") as f:
+            text = f.read()
+        ascii_only = text.isascii()
+
+        offsets: Dict[str, Tuple[int, int]] = {}
+        char_pos, byte_pos = 0, 0
+
+        def to_bytes(pos: int) -> int:
+            # Character -> byte offset, advancing monotonically through the text
+            nonlocal char_pos, byte_pos
+            if ascii_only:
+                return pos
+            byte_pos += len(text[char_pos:pos].encode("utf-8"))
+            char_pos = pos
+            return byte_pos
+
+        pos = _WHITESPACE.match(text, 0).end()
+        if self.root_key is not None:
+            pos = self._find_member(text, pos, self.root_key)
+        for key, start, end in _iter_members(text, pos):
+            offsets[key] = (to_bytes(start), to_bytes(end))
+        return offsets
+
+    def _build_jsonl_index(self) -> Dict[str, Tuple[int, int]]:
+        offsets: Dict[str, Tuple[int, int]] = {}
+        offset = 0
+        with open(self.path, "rb") as f:
+            for line in f:
+                start, offset = offset, offset + len(line)
+                if not line.strip():
+                    continue
+                match = _JSONL_ID.match(line)
+                if match is not None:
+                    key = json.loads(match.group(1))
+                else:
+                    key = json.loads(line)["datasetId"]
+                offsets[key] = (start, offset)
+        return offsets
+
+    def _find_member(self, text: str, pos: int, wanted: str) -> int:
+        for key, start, _ in _iter_members(text, pos, skip=wanted):
+            if key == wanted:
+                return start
+        raise KeyError(f"{self.path} has no top-level {wanted!r} object")
+
+    def _read_record(self, key: str) -> Dict[str, Any]:
+        start, end = self._offsets[key]
+        with open(self.path, "rb") as f:
+            f.seek(start)
+            return json.loads(f.read(end - start))
+
+    def get_record(self, key: str, include_heavy: bool = False) -> Dict[str, Any]:
+        """
+        Get one dataset's metadata record.
+
+        Args:
+            key: datasetId, e.g. "cais/mmlu"
+            include_heavy: Also return heavy fields such as the raw card text
+                (re-read from disk, never memoized)
+
+        Returns:
+            Dict[str, Any]: A copy of the record
+
+        Raises:
+            KeyError: If the datasetId is not in the catalog
+        """
+        self._ensure_index()
+        if include_heavy:
+            return self._read_record(key)
+        with self._lock:
+            record = self._records.get(key)
+            if record is None:
+                record = self._read_record(key)
+                if isinstance(record, dict):
+                    for field in HEAVY_FIELDS:
+                        record.pop(field, None)
+                self._records[key] = record
+        return dict(record) if isinstance(record, dict) else record
+
+    def iter_records(self, include_heavy: bool = False) -> Iterator[Tuple[str, Dict[str, Any]]]:
+        """
+        Stream every record in file order without memoizing it.
+
+        Memory stays bounded by one record at a time, so this is the way to
+        visit the whole catalog (lookups through get_record keep what they
+        decode).
+
+        Args:
+            include_heavy: Also return heavy fields such as the raw card text
+
+        Yields:
+            (datasetId, record) pairs
+        """
+        self._ensure_index()
+        spans = sorted(self._offsets.items(), key=lambda item: item[1][0])
+        with open(self.path, "rb") as f:
+            for key, (start, end) in spans:
+                f.seek(start)
+                record = json.loads(f.read(end - start))
+                if not include_heavy and isinstance(record, dict):
+                    for field in HEAVY_FIELDS:
+                        record.pop(field, None)
+                yield key, record
+
+    def __getitem__(self, key: str) -> Dict[str, Any]:
+        return self.get_record(key)
+
+    def __contains__(self, key: object) -> bool:
+        self._ensure_index()
+        return key in self._offsets
+
+    def __iter__(self) -> Iterator[str]:
+        self._ensure_index()
+        return iter(list(self._offsets))
+
+    def __len__(self) -> int:
+        self._ensure_index()
+        return len(self._offsets)
+
+    def __repr__(self) -> str:
+        return f"DatasetCatalog({self.path!r}, records={len(self)})"
+
+
+def _iter_members(text: str, pos: int, skip: Optional[str] = None):
+    """
+    Yield (key, value_start, value_end) for each member of the JSON object at `pos`.
+
+    Values are decoded only to find where they end. The member named `skip`
+    is yielded without decoding its value, so a caller can descend into it.
+    """
+    if text[pos] != "{":
+        raise ValueError(f"Expected a JSON object at character {pos}")
+    pos = _WHITESPACE.match(text, pos + 1).end()
+    if text[pos] == "}":
+        return
+    while True:
+        key, pos = _decoder.raw_decode(text, pos)
+        pos = _WHITESPACE.match(text, pos).end()
+        if text[pos] != ":":
+            raise ValueError(f"Expected ':' at character {pos}")
+        start = _WHITESPACE.match(text, pos + 1).end()
+        if key == skip:
+            yield key, start, None
+            return
+        _, end = _decoder.raw_decode(text, start)
+        yield key, start, end
+        pos = _WHITESPACE.match(text, end).end()
+        if text[pos] == "}":
+            return
+        if text[pos] != ",":
+            raise ValueError(f"Expected ',' or '}}' at character {pos}")
+        pos = _WHITESPACE.match(text, pos + 1).end()
+
+
+class OverlayCatalog(Mapping):
+    """
+    Catalog whose records are patched with fresher values kept elsewhere.
+
+    The base catalog file is never rewritten; `overlay(datasetId)` returns
+    the fields to replace (e.g. live Hub downloads and likes), or None.
+    """
+
+    def __init__(self, base: Mapping, overlay: Callable[[str], Optional[Dict[str, Any]]]):
+        """
+        Initialize the overlay.
+
+        Args:
+            base: Catalog to read records from
+            overlay: Returns the fields to patch into a datasetId's record
+        """
+        self.base = base
+        self.overlay = overlay
+
+    def get_record(self, key: str, include_heavy: bool = False) -> Dict[str, Any]:
+        """
+        Get one dataset's metadata record with the overlay applied.
+
+        Args:
+            key: datasetId, e.g. "cais/mmlu"
+            include_heavy: Also return heavy fields such as the raw card text
+
+        Returns:
+            Dict[str, Any]: A copy of the patched record
+
+        Raises:
+            KeyError: If the datasetId is not in the base catalog
+        """
+        record = self.base.get_record(key, include_heavy=include_heavy)
+        patch = self.overlay(key)
+        if patch and isinstance(record, dict):
+            record.update(patch)
+        return record
+
+    def iter_records(self, include_heavy: bool = False) -> Iterator[Tuple[str, Dict[str, Any]]]:
+        """
+        Stream every record with the overlay applied (see DatasetCatalog.iter_records).
+
+        Args:
+            include_heavy: Also return heavy fields such as the raw card text
+
+        Yields:
+            (datasetId, patched record) pairs
+        """
+        for key, record in self.base.iter_records(include_heavy=include_heavy):
+            patch = self.overlay(key)
+            if patch and isinstance(record, dict):
+                record.update(patch)
+            yield key, record
+
+    def __getitem__(self, key: str) -> Dict[str, Any]:
+        return self.get_record(key)
+
+    def __contains__(self, key: object) -> bool:
+        return key in self.base
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.base)
+
+    def __len__(self) -> int:
+        return len(self.base)
+
+    def __repr__(self) -> str:
+        return f"OverlayCatalog({self.base!r})"
+
+
+_catalogs: Dict[Tuple[str, Optional[str]], Mapping] = {}
+_registry_lock = threading.Lock()
+
+
+def load_catalog(path: str, root_key: Optional[str] = None) -> Mapping:
+    """
+    Get the shared catalog for a metadata JSON file.
+
+    One catalog is kept per (path, root_key) per process. It re-indexes
+    itself when the file's modification time changes. `.arrow` files written
+    by catalog_arrow.export_catalog_arrow are opened as an ArrowCatalog.
+
+    Args:
+        path: Path to the catalog JSON file
+        root_key: Top-level key the records are nested under, if any
+
+    Returns:
+        Mapping: The shared catalog (DatasetCatalog or ArrowCatalog)
+    """
+    key = (os.path.realpath(path), root_key)
+    with _registry_lock:
+        catalog = _catalogs.get(key)
+        if catalog is None:
+            if key[0].endswith(".arrow"):
+                from analyzer.src.processing.catalog_arrow import ArrowCatalog
+
+                catalog = ArrowCatalog(key[0])
+            else:
+                catalog = DatasetCatalog(key[0], root_key=root_key)
+            _catalogs[key] = catalog
+    return catalog
+
+
+def clear_catalog_cache(path: Optional[str] = None) -> None:
+    """
+    Drop shared catalogs so the next load re-indexes the file.
+
+    Args:
+        path: File to evict, or None to evict every catalog
+    """
+    with _registry_lock:
+        if path is None:
+            _catalogs.clear()
+        else:
+            real = os.path.realpath(path)
+            for key in [k for k in _catalogs if k[0] == real]:
+                del _catalogs[key]
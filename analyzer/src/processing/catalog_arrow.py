@@ -0,0 +1,304 @@
+"""
+Compact Arrow IPC export of the dataset metadata catalog.
+
+The JSON catalogs carry full dataset cards, but the adapters and static
+metrics only read a handful of small fields. This module exports a catalog
+into two Arrow IPC files sharing one row order, sorted by datasetId:
+
+- `<name>.arrow`: the id column, typed columns for common scalar fields,
+  and the rest of each light record as a compact JSON string
+- `<name>.heavy.arrow`: the heavy text fields (see HEAVY_FIELDS)
+
+Both files are memory-mapped when read, so opening the catalog costs
+almost nothing and a lookup is a binary search over the id column plus the
+decoding of a single row. pyarrow is only imported when these files are
+used.
+
+Usage:
+    python -m analyzer.src.processing.catalog_arrow data/all_datasets.json
+    python -m analyzer.src.processing.catalog_arrow data/helm_dataset_metadata.json --root-key datasets
+"""
+
+import argparse
+import bisect
+import json
+import os
+import threading
+from collections.abc import Mapping
+from typing import Any, Dict, Iterator, Optional, Tuple
+
+from analyzer.src.processing.catalog import HEAVY_FIELDS, DatasetCatalog
+
+ID_COLUMN = "datasetId"
+LIGHT_JSON_COLUMN = "light_json"
+BATCH_ROWS = 8192
+
+# Scalar fields stored as typed columns; values of any other type stay in light_json
+TYPED_COLUMNS = {
+    "createdAt": "string",
+    "last_modified": "string",
+    "downloads": "int64",
+    "likes": "int64",
+    "trending_score": "float64",
+}
+
+
+def _import_pyarrow():
+    try:
+        import pyarrow as pa
+        import pyarrow.ipc  # noqa: F401
+    except ImportError as e:
+        raise ImportError(
+            "Arrow catalogs need pyarrow; install it with `pip install pyarrow`"
+        ) from e
+    return pa
+
+
+def heavy_path_for(path: str) -> str:
+    """Path of the heavy-field file that accompanies an Arrow catalog."""
+    base, ext = os.path.splitext(path)
+    return f"{base}.heavy{ext}"
+
+
+def _fits(value: Any, arrow_type: str) -> bool:
+    if arrow_type == "string":
+        return isinstance(value, str)
+    if arrow_type == "int64":
+        return isinstance(value, int) and not isinstance(value, bool) and -(2**63) <= value < 2**63
+    return isinstance(value, float)
+
+
+def export_catalog_arrow(
+    catalog: Mapping,
+    output_path: str,
+    batch_rows: int = BATCH_ROWS,
+) -> int:
+    """
+    Write a catalog to `output_path` and its heavy fields alongside it.
+
+    Records are fetched one at a time in datasetId order, so only the ids
+    and one batch of rows are in memory at once.
+
+    Args:
+        catalog: Mapping of datasetId -> record (a DatasetCatalog reads
+            heavy fields from disk on demand)
+        output_path: Destination .arrow file
+        batch_rows: Rows per Arrow record batch
+
+    Returns:
+        int: Number of records written
+    """
+    pa = _import_pyarrow()
+
+    light_schema = pa.schema(
+        [(ID_COLUMN, pa.string())]
+        + [(name, getattr(pa, arrow_type)()) for name, arrow_type in TYPED_COLUMNS.items()]
+        + [(LIGHT_JSON_COLUMN, pa.string())]
+    )
+    heavy_schema = pa.schema(
+        [(ID_COLUMN, pa.string())] + [(name, pa.string()) for name in HEAVY_FIELDS]
+    )
+
+    def fetch(dataset_id: str) -> Dict[str, Any]:
+        if isinstance(catalog, DatasetCatalog):
+            return catalog.get_record(dataset_id, include_heavy=True)
+        return catalog[dataset_id]
+
+    ids = sorted(catalog)
+    heavy_path = heavy_path_for(output_path)
+    tmp_light, tmp_heavy = output_path + ".tmp", heavy_path + ".tmp"
+
+    with pa.OSFile(tmp_light, "wb") as light_sink, pa.OSFile(tmp_heavy, "wb") as heavy_sink:
+        with pa.ipc.new_file(light_sink, light_schema) as light_writer, pa.ipc.new_file(
+            heavy_sink, heavy_schema
+        ) as heavy_writer:
+            for batch_start in range(0, len(ids), batch_rows):
+                batch_ids = ids[batch_start : batch_start + batch_rows]
+                light = {name: [] for name in light_schema.names}
+                heavy = {name: [] for name in heavy_schema.names}
+
+                for dataset_id in batch_ids:
+                    record = dict(fetch(dataset_id))
+                    light[ID_COLUMN].append(dataset_id)
+                    heavy[ID_COLUMN].append(dataset_id)
+                    for name in HEAVY_FIELDS:
+                        value = record.pop(name, None)
+                        heavy[name].append(value if isinstance(value, str) else None)
+                        if value is not None and not isinstance(value, str):
+                            record[name] = value  # keep non-text values with the light fields
+                    for name, arrow_type in TYPED_COLUMNS.items():
+                        if name in record and _fits(record[name], arrow_type):
+                            light[name].append(record.pop(name))
+                        else:
+                            light[name].append(None)
+                    light[LIGHT_JSON_COLUMN].append(
+                        json.dumps(record, ensure_ascii=False, separators=(",", ":"))
+                    )
+
+                light_writer.write_batch(pa.record_batch(light, schema=light_schema))
+                heavy_writer.write_batch(pa.record_batch(heavy, schema=heavy_schema))
+
+    os.replace(tmp_heavy, heavy_path)
+    os.replace(tmp_light, output_path)
+    return len(ids)
+
+
+class _Column:
+    """Sequence view over an Arrow column so `bisect` can search it in place."""
+
+    def __init__(self, column):
+        self._column = column
+
+    def __len__(self) -> int:
+        return len(self._column)
+
+    def __getitem__(self, index: int):
+        return self._column[index].as_py()
+
+
+class ArrowCatalog(Mapping):
+    """
+    Read-only mapping of datasetId -> metadata record backed by Arrow IPC files.
+
+    Same interface as DatasetCatalog; `get_record(..., include_heavy=True)`
+    also reads the matching row of the heavy-field file.
+    """
+
+    def __init__(self, path: str):
+        """
+        Initialize the catalog. Files are memory-mapped on first access.
+
+        Args:
+            path: Path to the .arrow catalog written by export_catalog_arrow
+        """
+        self.path = path
+        self._mtime: Optional[int] = None
+        self._light = None
+        self._heavy = None
+        self._ids: Optional[_Column] = None
+        self._lock = threading.Lock()
+
+    def _ensure_open(self) -> None:
+        mtime = os.stat(self.path).st_mtime_ns
+        if self._mtime == mtime:
+            return
+        with self._lock:
+            if self._mtime == mtime:
+                return
+            self._light = self._map(self.path)
+            self._ids = _Column(self._light.column(ID_COLUMN))
+            self._heavy = None
+            self._mtime = mtime
+
+    @staticmethod
+    def _map(path: str):
+        pa = _import_pyarrow()
+        # read_all() over a memory map references the mapped buffers, no copy
+        return pa.ipc.open_file(pa.memory_map(path, "r")).read_all()
+
+    def _row(self, key: str) -> int:
+        self._ensure_open()
+        row = bisect.bisect_left(self._ids, key)
+        if row == len(self._ids) or self._ids[row] != key:
+            raise KeyError(key)
+        return row
+
+    def get_record(self, key: str, include_heavy: bool = False) -> Dict[str, Any]:
+        """
+        Get one dataset's metadata record.
+
+        Args:
+            key: datasetId, e.g. "cais/mmlu"
+            include_heavy: Also return heavy fields such as the raw card text
+
+        Returns:
+            Dict[str, Any]: The record, equal to the one in the source catalog
+
+        Raises:
+            KeyError: If the datasetId is not in the catalog
+        """
+        row = self._row(key)
+        light = self._light
+        record = json.loads(light.column(LIGHT_JSON_COLUMN)[row].as_py())
+        for name in TYPED_COLUMNS:
+            value = light.column(name)[row].as_py()
+            if value is not None:
+                record[name] = value
+        if include_heavy:
+            if self._heavy is None:
+                self._heavy = self._map(heavy_path_for(self.path))
+            for name in HEAVY_FIELDS:
+                value = self._heavy.column(name)[row].as_py()
+                if value is not None:
+                    record[name] = value
+        return record
+
+    def iter_records(self, include_heavy: bool = False) -> Iterator[Tuple[str, Dict[str, Any]]]:
+        """
+        Stream every record in datasetId order, one record batch at a time.
+
+        Args:
+            include_heavy: Also return heavy fields such as the raw card text
+
+        Yields:
+            (datasetId, record) pairs, equal to get_record's
+        """
+        self._ensure_open()
+        light = self._light
+        if include_heavy and self._heavy is None:
+            self._heavy = self._map(heavy_path_for(self.path))
+        offset = 0
+        for batch in light.to_batches():
+            columns = {name: batch.column(name).to_pylist() for name in batch.schema.names}
+            heavy = None
+            if include_heavy:
+                heavy_slice = self._heavy.slice(offset, batch.num_rows)
+                heavy = {name: heavy_slice.column(name).to_pylist() for name in HEAVY_FIELDS}
+            for row, key in enumerate(columns[ID_COLUMN]):
+                record = json.loads(columns[LIGHT_JSON_COLUMN][row])
+                for name in TYPED_COLUMNS:
+                    if columns[name][row] is not None:
+                        record[name] = columns[name][row]
+                if heavy is not None:
+                    for name in HEAVY_FIELDS:
+                        if heavy[name][row] is not None:
+                            record[name] = heavy[name][row]
+                yield key, record
+            offset += batch.num_rows
+
+    def __getitem__(self, key: str) -> Dict[str, Any]:
+        return self.get_record(key)
+
+    def __contains__(self, key: object) -> bool:
+        try:
+            self._row(key)
+        except KeyError:
+            return False
+        return True
+
+    def __iter__(self) -> Iterator[str]:
+        self._ensure_open()
+        return iter(self._light.column(ID_COLUMN).to_pylist())
+
+    def __len__(self) -> int:
+        self._ensure_open()
+        return len(self._ids)
+
+    def __repr__(self) -> str:
+        return f"ArrowCatalog({self.path!r})"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Export a metadata catalog to Arrow IPC")
+    parser.add_argument("catalog", help="Source catalog (.json or .jsonl)")
+    parser.add_argument("--output", default=None, help="Output .arrow path (default: next to the source)")
+    parser.add_argument("--root-key", default=None, help="Top-level key the records are nested under")
+    args = parser.parse_args()
+
+    output = args.output or os.path.splitext(args.catalog)[0] + ".arrow"
+    count = export_catalog_arrow(DatasetCatalog(args.catalog, root_key=args.root_key), output)
+    print(f"Exported {count} datasets to {output} (heavy fields in {heavy_path_for(output)})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,177 @@
+"""
+Small persistent key-value cache backed by a single JSON file.
+
+Entries carry the time they were stored so callers can apply a TTL, and
+writes go through a temporary file and an atomic rename so a crashed run
+never leaves a half-written cache behind.
+"""
+
+import json
+import os
+import tempfile
+import threading
+import time
+from typing import Any, Callable, Dict, Optional, Tuple
+
+
+class JsonDiskCache:
+    """
+    Persistent {key: JSON value} store with per-entry timestamps.
+
+    The file is read lazily on first access. Each write merges this
+    process's changes into the current file contents before replacing it,
+    so concurrent runs sharing a cache file don't drop each other's entries.
+    """
+
+    def __init__(self, path: str, ttl_seconds: Optional[float] = None):
+        """
+        Initialize the cache.
+
+        Args:
+            path: JSON file backing the cache (created on first write)
+            ttl_seconds: Default maximum entry age, or None for no expiry
+        """
+        self.path = str(path)
+        self.ttl_seconds = ttl_seconds
+        self._entries: Optional[Dict[str, Dict[str, Any]]] = None
+        self._dirty: Dict[str, Optional[Dict[str, Any]]] = {}
+        self._lock = threading.RLock()
+
+    def _read_file(self) -> Dict[str, Dict[str, Any]]:
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                entries = json.load(f)
+        except FileNotFoundError:
+            return {}
+        except (OSError, ValueError) as e:
+            print(f"Warning: Ignoring unreadable cache file {self.path}: {e}")
+            return {}
+        return entries if isinstance(entries, dict) else {}
+
+    def _load(self) -> Dict[str, Dict[str, Any]]:
+        if self._entries is None:
+            self._entries = self._read_file()
+        return self._entries
+
+    def get_entry(self, key: str) -> Optional[Tuple[Any, float]]:
+        """
+        Get a cached value together with the time it was stored.
+
+        Args:
+            key: Cache key
+
+        Returns:
+            Tuple of (value, stored_at epoch seconds), or None if absent
+        """
+        with self._lock:
+            entry = self._load().get(key)
+        if entry is None:
+            return None
+        return entry["value"], entry["stored_at"]
+
+    def get(
+        self,
+        key: str,
+        default: Any = None,
+        max_age: Optional[float] = None,
+        allow_stale: bool = False,
+    ) -> Any:
+        """
+        Get a cached value if it is fresh enough.
+
+        Args:
+            key: Cache key
+            default: Value returned on a miss
+            max_age: Maximum age in seconds (defaults to the cache TTL)
+            allow_stale: Return expired entries instead of treating them as misses
+
+        Returns:
+            The cached value, or `default`
+        """
+        entry = self.get_entry(key)
+        if entry is None:
+            return default
+        value, stored_at = entry
+        max_age = self.ttl_seconds if max_age is None else max_age
+        if not allow_stale and max_age is not None and time.time() - stored_at > max_age:
+            return default
+        return value
+
+    def set(self, key: str, value: Any, persist: bool = True) -> None:
+        """
+        Store a value.
+
+        Args:
+            key: Cache key
+            value: JSON-serializable value
+            persist: Write the file now (set False to batch several writes)
+        """
+        entry = {"value": value, "stored_at": time.time()}
+        with self._lock:
+            self._load()[key] = entry
+            self._dirty[key] = entry
+            if persist:
+                self.flush()
+
+    def invalidate(
+        self,
+        key: Optional[str] = None,
+        predicate: Optional[Callable[[str], bool]] = None,
+    ) -> int:
+        """
+        Remove entries from the cache.
+
+        Args:
+            key: Single key to remove
+            predicate: Remove every key for which this returns True.
+                With neither argument, the whole cache is cleared.
+
+        Returns:
+            int: Number of entries removed
+        """
+        with self._lock:
+            entries = self._load()
+            if key is not None:
+                doomed = [key] if key in entries else []
+            elif predicate is not None:
+                doomed = [k for k in entries if predicate(k)]
+            else:
+                doomed = list(entries)
+            for k in doomed:
+                del entries[k]
+                self._dirty[k] = None
+            self.flush()
+        return len(doomed)
+
+    def flush(self) -> None:
+        """Merge pending changes into the cache file and write it atomically."""
+        with self._lock:
+            if not self._dirty:
+                return
+            merged = self._read_file()
+            for key, entry in self._dirty.items():
+                if entry is None:
+                    merged.pop(key, None)
+                else:
+                    merged[key] = entry
+
+            directory = os.path.dirname(os.path.abspath(self.path))
+            os.makedirs(directory, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+            try:
+                with os.fdopen(fd, "w", encoding="utf-8") as f:
+                    json.dump(merged, f, sort_keys=True)
+                os.replace(tmp_path, self.path)
+            except BaseException:
+                os.unlink(tmp_path)
+                raise
+            self._entries = merged
+            self._dirty.clear()
+
+    def __contains__(self, key: str) -> bool:
+        with self._lock:
+            return key in self._load()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._load())
@@ -0,0 +1,314 @@
+"""
+Bulk refresh of live Hugging Face Hub metadata for tracked datasets.
+
+The catalog (`data/all_datasets.json`) freezes downloads, likes, trending
+score and last_modified at the time it was built. This module pulls the
+current values for many `hf_dataset_id`s concurrently over one pooled HTTP
+session. Requests are conditional (ETag / If-Modified-Since), so datasets
+that haven't changed cost a 304 and no body. Results land in a persistent
+overlay that `load_refreshed_catalog` patches into catalog records. When
+refreshing Dataset objects, the same pass updates their metadata and records
+the popularity metrics in the metric history.
+
+Environment variables:
+    HF_ENDPOINT: Hub root, e.g. a local mock Hub for tests
+        (default https://huggingface.co)
+    HF_TOKEN: Access token for gated or private datasets
+    ANALYZER_HUB_METADATA_PATH: Overlay file (default data/cache/hub_metadata.json)
+    ANALYZER_OFFLINE: When truthy, serve only from the overlay (no network)
+
+Usage:
+    python -m analyzer.src.processing.hub_metadata cais/mmlu google/boolq
+    python -m analyzer.src.processing.hub_metadata --from-catalog data/all_datasets.json
+"""
+
+import argparse
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Dict, Iterable, List, Optional
+from urllib.parse import quote
+
+from analyzer.src.processing.catalog import OverlayCatalog, load_catalog
+from analyzer.src.processing.disk_cache import JsonDiskCache
+from analyzer.src.processing.run_profile import profiled
+from analyzer.src.processing.split_sizes import is_offline
+
+if TYPE_CHECKING:
+    import requests
+
+PROJECT_ROOT = Path(__file__).resolve().parents[3]
+DEFAULT_OVERLAY_PATH = PROJECT_ROOT / "data" / "cache" / "hub_metadata.json"
+DEFAULT_ENDPOINT = "https://huggingface.co"
+
+# Hub API field -> catalog field
+HUB_FIELDS = {
+    "downloads": "downloads",
+    "likes": "likes",
+    "trendingScore": "trending_score",
+    "lastModified": "last_modified",
+}
+
+
+class HubMetadataRefresher:
+    """
+    Fetches live Hub metadata for datasets and keeps it in a persistent overlay.
+
+    Overlay entries hold the catalog fields plus the validators (ETag and
+    Last-Modified) of the response they came from. Failed fetches leave the
+    previous entry in place.
+    """
+
+    def __init__(
+        self,
+        endpoint: Optional[str] = None,
+        token: Optional[str] = None,
+        max_workers: int = 8,
+        timeout: float = 30.0,
+        max_retries: int = 3,
+        overlay_path: Optional[str] = None,
+    ):
+        """
+        Initialize the refresher.
+
+        Args:
+            endpoint: Hub root (defaults to HF_ENDPOINT or the public Hub)
+            token: Access token (defaults to HF_TOKEN)
+            max_workers: Concurrent requests, which is also the connection pool size
+            timeout: Per-request timeout in seconds
+            max_retries: Retries on 429/5xx and connection errors
+            overlay_path: Overlay file (defaults to ANALYZER_HUB_METADATA_PATH or data/cache/)
+        """
+        self.endpoint = (endpoint or os.getenv("HF_ENDPOINT") or DEFAULT_ENDPOINT).rstrip("/")
+        self.token = os.getenv("HF_TOKEN") if token is None else token
+        self.max_workers = max_workers
+        self.timeout = timeout
+        self.max_retries = max_retries
+        overlay_path = overlay_path or os.getenv("ANALYZER_HUB_METADATA_PATH") or str(DEFAULT_OVERLAY_PATH)
+        self.store = JsonDiskCache(overlay_path)
+        self._session: Optional["requests.Session"] = None
+        self._session_lock = threading.Lock()
+
+    @property
+    def session(self) -> "requests.Session":
+        """Pooled session shared by all worker threads."""
+        with self._session_lock:
+            if self._session is None:
+                # Imported here so adapters that never refresh don't load requests
+                import requests
+                from requests.adapters import HTTPAdapter
+                from urllib3.util.retry import Retry
+
+                retry = Retry(
+                    total=self.max_retries,
+                    backoff_factor=0.5,
+                    status_forcelist=(429, 500, 502, 503, 504),
+                    allowed_methods=("GET",),
+                )
+                adapter = HTTPAdapter(
+                    pool_connections=1, pool_maxsize=self.max_workers, max_retries=retry
+                )
+                session = requests.Session()
+                session.mount("http://", adapter)
+                session.mount("https://", adapter)
+                if self.token:
+                    session.headers["Authorization"] = f"Bearer {self.token}"
+                self._session = session
+        return self._session
+
+    def get(self, hf_dataset_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Get the last refreshed catalog fields for a dataset.
+
+        Args:
+            hf_dataset_id: Hugging Face dataset id, e.g. "cais/mmlu"
+
+        Returns:
+            Dict of catalog fields, or None if the dataset was never refreshed
+        """
+        entry = self.store.get(hf_dataset_id)
+        return dict(entry["fields"]) if entry else None
+
+    def _fetch(self, hf_dataset_id: str) -> Optional[Dict[str, Any]]:
+        previous = self.store.get(hf_dataset_id)
+        headers = {}
+        if previous:
+            if previous.get("etag"):
+                headers["If-None-Match"] = previous["etag"]
+            if previous.get("http_last_modified"):
+                headers["If-Modified-Since"] = previous["http_last_modified"]
+
+        response = self.session.get(
+            f"{self.endpoint}/api/datasets/{quote(hf_dataset_id, safe='/')}",
+            params=[("expand[]", field) for field in HUB_FIELDS],
+            headers=headers,
+            timeout=self.timeout,
+        )
+        if response.status_code == 304 and previous:
+            entry = previous
+        else:
+            response.raise_for_status()
+            info = response.json()
+            entry = {
+                "fields": {
+                    catalog_field: info[hub_field]
+                    for hub_field, catalog_field in HUB_FIELDS.items()
+                    if info.get(hub_field) is not None
+                },
+                "etag": response.headers.get("ETag"),
+                "http_last_modified": response.headers.get("Last-Modified"),
+            }
+        # Re-set even on 304 so the stored time records when values were confirmed
+        self.store.set(hf_dataset_id, entry, persist=False)
+        return dict(entry["fields"])
+
+    @profiled("hub_metadata")
+    def refresh(self, hf_dataset_ids: Iterable[str]) -> Dict[str, Optional[Dict[str, Any]]]:
+        """
+        Fetch current metadata for many datasets concurrently.
+
+        In offline mode nothing is fetched and the overlay is served as is.
+
+        Args:
+            hf_dataset_ids: Hugging Face dataset ids
+
+        Returns:
+            Dict mapping each id to its catalog fields; the previous values (or
+            None) for ids whose fetch failed
+        """
+        ids = list(dict.fromkeys(hf_dataset_ids))
+        if is_offline():
+            return {hf_dataset_id: self.get(hf_dataset_id) for hf_dataset_id in ids}
+        import requests
+
+        def fetch(hf_dataset_id: str) -> Optional[Dict[str, Any]]:
+            try:
+                return self._fetch(hf_dataset_id)
+            except (requests.RequestException, ValueError) as e:
+                print(f"Warning: Could not refresh Hub metadata for {hf_dataset_id}: {e}")
+                return self.get(hf_dataset_id)
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+            results = dict(zip(ids, pool.map(fetch, ids)))
+        self.store.flush()
+        return results
+
+    def close(self) -> None:
+        """Close the pooled session."""
+        with self._session_lock:
+            if self._session is not None:
+                self._session.close()
+                self._session = None
+
+
+_default_refresher: Optional[HubMetadataRefresher] = None
+_default_lock = threading.Lock()
+
+
+def get_default_refresher() -> HubMetadataRefresher:
+    """Get the process-wide refresher configured from the environment."""
+    global _default_refresher
+    with _default_lock:
+        if _default_refresher is None:
+            _default_refresher = HubMetadataRefresher()
+        return _default_refresher
+
+
+def load_refreshed_catalog(path: str, root_key: Optional[str] = None) -> OverlayCatalog:
+    """
+    Get the shared catalog for a metadata file, patched with refreshed Hub values.
+
+    Args:
+        path: Path to the catalog JSON file
+        root_key: Top-level key the records are nested under, if any
+
+    Returns:
+        OverlayCatalog: Catalog whose records carry the latest refreshed fields
+    """
+    return OverlayCatalog(load_catalog(path, root_key), get_default_refresher().get)
+
+
+def _default_metrics(history) -> List:
+    # Imported here because the metrics themselves depend on this package
+    from analyzer.src.metrics.dynamic.dataset_downloads_metric import DatasetDownloadsMetric
+    from analyzer.src.metrics.dynamic.dataset_freshness_metric import DatasetFreshnessMetric
+    from analyzer.src.metrics.dynamic.dataset_likes_metric import DatasetLikesMetric
+    from analyzer.src.metrics.dynamic.trending_score_metric import TrendingScoreMetric
+
+    return [
+        DatasetDownloadsMetric(history=history),
+        DatasetLikesMetric(history=history),
+        TrendingScoreMetric(history=history),
+        DatasetFreshnessMetric(history=history),
+    ]
+
+
+def refresh_datasets(
+    datasets: Iterable,
+    refresher: Optional[HubMetadataRefresher] = None,
+    metrics: Optional[List] = None,
+    history=None,
+) -> Dict[str, Optional[Dict[str, Any]]]:
+    """
+    Refresh Hub metadata for datasets and record it, in one pass.
+
+    Every distinct hf_dataset_id is fetched concurrently. Each dataset's
+    metadata record then gets the new values, and each popularity metric is
+    run once over all the refreshed datasets, so its values are appended to
+    the metric history in a single write.
+
+    Args:
+        datasets: Dataset objects with an hf_dataset_id
+        refresher: Refresher to use (defaults to the process-wide one)
+        metrics: UpdatableMetrics to record (defaults to downloads, likes,
+            trending score and freshness)
+        history: History backend for the default metrics (defaults to the
+            process-wide one)
+
+    Returns:
+        Dict mapping dataset name to the refreshed fields (None if unavailable)
+    """
+    datasets = [dataset for dataset in datasets if dataset.hf_dataset_id]
+    refresher = refresher or get_default_refresher()
+    fields_by_id = refresher.refresh(dataset.hf_dataset_id for dataset in datasets)
+    if metrics is None:
+        metrics = _default_metrics(history)
+
+    results = {}
+    refreshed = []
+    for dataset in datasets:
+        fields = fields_by_id.get(dataset.hf_dataset_id)
+        results[dataset.name] = fields
+        if not fields or dataset.metadata is None:
+            continue
+        dataset.metadata.update(**fields)
+        refreshed.append(dataset)
+    if refreshed:
+        for metric in metrics:
+            metric.run_batch(refreshed)
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Refresh live Hub metadata for datasets")
+    parser.add_argument("ids", nargs="*", help="Hugging Face dataset ids")
+    parser.add_argument("--from-catalog", help="Refresh every datasetId in this catalog file")
+    parser.add_argument("--workers", type=int, default=8, help="Concurrent requests")
+    args = parser.parse_args()
+
+    ids = list(args.ids)
+    if args.from_catalog:
+        ids.extend(load_catalog(args.from_catalog))
+    if not ids:
+        parser.error("give dataset ids or --from-catalog")
+
+    refresher = HubMetadataRefresher(max_workers=args.workers)
+    results = refresher.refresh(ids)
+    refresher.close()
+    for hf_dataset_id, fields in results.items():
+        print(f"{hf_dataset_id}\t{fields}")
+
+
+if __name__ == "__main__":
+    main()
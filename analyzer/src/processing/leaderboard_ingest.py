@@ -0,0 +1,698 @@
+"""
+Incremental ingestion of leaderboard JSONL dumps into an indexed score store.
+
+A daily leaderboard refresh usually adds a few dozen models to a dump of
+thousands. Re-parsing the whole snapshot every time makes that refresh cost
+O(history). This module instead keeps a persistent SQLite store of every
+model's scores. For each source file it also keeps a watermark: the latest
+submission_date ingested and a content hash for every model_id.
+
+Each ingest hashes the lines of the current snapshot and parses only the
+lines whose hash it hasn't seen. An unchanged model costs a hash and no JSON
+parsing. When the file has only grown since the last ingest, reading starts
+where that ingest stopped. Growth is verified, not assumed: the store keeps a
+hash of every byte the last ingest read, and the file's prefix must still
+match it. Any other change, including an in-place edit that keeps the file
+size, falls back to a full scan, which still parses only the changed lines.
+
+New and changed models are upserted. Models missing from a rewritten
+snapshot are removed. Only the evaluations the delta touched get their
+summaries refreshed: the top-N models and the latest temporal-saturation
+window. Both come from indexed queries whose cost doesn't grow with the
+history.
+
+An ingest therefore still reads and hashes the whole file, which is
+O(history) I/O: a resumed ingest hashes the old prefix in large chunks, and
+a full scan hashes every line. JSON parsing and store updates are O(delta).
+Hashing a dump takes about a third of the time orjson needs just to parse
+it.
+
+Environment variables:
+    LEADERBOARD_INGEST_PATH: SQLite store (default results/leaderboard_ingest.sqlite)
+
+Usage:
+    python -m analyzer.src.processing.leaderboard_ingest --leaderboard hf_openllm_v2
+    python -m analyzer.src.processing.leaderboard_ingest data/leaderboard_data/x.jsonl --evaluations BBH GPQA
+"""
+
+import argparse
+import hashlib
+import json
+import math
+import os
+import sqlite3
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, NamedTuple, Optional, Set, Tuple
+
+from analyzer.src.processing.leaderboard_jsonl import (
+    build_projection,
+    get_json_loads,
+    project,
+    select_evaluations,
+)
+from analyzer.src.processing.leaderboard_store import TABLE_FIELDS
+
+PROJECT_ROOT = Path(__file__).resolve().parents[3]
+DEFAULT_STORE_PATH = PROJECT_ROOT / "results" / "leaderboard_ingest.sqlite"
+# Read size when re-hashing the prefix of a grown file
+PREFIX_CHUNK_SIZE = 1 << 20
+
+
+class IngestReport(NamedTuple):
+    """
+    What one ingest changed in the store.
+
+    ``rewritten_evaluations`` are the touched evaluations whose earlier history
+    changed: they got a submission dated before the watermark, or lost or
+    changed a model. Trajectories over these need a full recompute. The other
+    touched evaluations only gained submissions at or after the watermark.
+    """
+
+    source: str
+    resumed_at: int
+    parsed: int
+    unchanged: int
+    added: int
+    changed: int
+    removed: int
+    watermark: Optional[str]
+    touched_evaluations: List[str]
+    rewritten_evaluations: List[str]
+    top_n_changed: List[str]
+
+
+def _content_hash(line: bytes) -> str:
+    return hashlib.blake2b(line, digest_size=16).hexdigest()
+
+
+def _prefix_hasher():
+    return hashlib.blake2b(digest_size=16)
+
+
+def _normalize_date(value: Any) -> Optional[str]:
+    # Same parsing as TemporalSaturationMetric, re-formatted so strings sort by date
+    try:
+        return datetime.strptime(value, "%Y-%m-%d").strftime("%Y-%m-%d")
+    except (ValueError, TypeError):
+        return None
+
+
+def _score_value(result: Dict[str, Any]) -> Optional[float]:
+    try:
+        value = float(result["score_details"]["score"])
+    except (KeyError, TypeError, ValueError):
+        return None
+    return None if math.isnan(value) else value
+
+
+class LeaderboardIngestor:
+    """
+    Applies a leaderboard dump to a persistent score store, one delta at a time.
+
+    The store is keyed by the dump's resolved path, so one SQLite file can
+    hold several leaderboards. A model_id that appears on several lines
+    keeps its last record. Models keep their first-seen position, which
+    breaks score and date ties in file order like LeaderboardTable does.
+    Changing the evaluation filter of a source re-ingests it from scratch.
+    """
+
+    _SCHEMA = """
+        CREATE TABLE IF NOT EXISTS sources (
+            source TEXT PRIMARY KEY,
+            evaluations TEXT,
+            watermark TEXT,
+            file_size INTEGER,
+            file_mtime INTEGER,
+            tail_offset INTEGER,
+            tail_hash TEXT,
+            next_row INTEGER NOT NULL DEFAULT 0,
+            prefix_hash TEXT
+        );
+        CREATE TABLE IF NOT EXISTS models (
+            source TEXT NOT NULL,
+            model_id TEXT NOT NULL,
+            row INTEGER NOT NULL,
+            content_hash TEXT NOT NULL,
+            model_name TEXT,
+            developer TEXT,
+            submission_date TEXT,
+            params_billions,
+            architecture TEXT,
+            PRIMARY KEY (source, model_id)
+        );
+        CREATE TABLE IF NOT EXISTS scores (
+            source TEXT NOT NULL,
+            evaluation TEXT NOT NULL,
+            model_id TEXT NOT NULL,
+            row INTEGER NOT NULL,
+            score REAL,
+            dated TEXT,
+            PRIMARY KEY (source, evaluation, model_id)
+        );
+        CREATE INDEX IF NOT EXISTS scores_by_model ON scores (source, model_id);
+        CREATE INDEX IF NOT EXISTS scores_by_score ON scores (source, evaluation, score DESC, row);
+        CREATE INDEX IF NOT EXISTS scores_by_date ON scores (source, evaluation, dated, row);
+        CREATE TABLE IF NOT EXISTS windows (
+            source TEXT NOT NULL,
+            evaluation TEXT NOT NULL,
+            num_valid INTEGER NOT NULL DEFAULT 0,
+            num_skipped INTEGER NOT NULL DEFAULT 0,
+            top_n_scores TEXT,
+            first_date TEXT,
+            window_start_date TEXT,
+            window_end_date TEXT,
+            PRIMARY KEY (source, evaluation)
+        );
+    """
+
+    def __init__(
+        self,
+        jsonl_path: str,
+        evaluations: Optional[Iterable[str]] = None,
+        store_path: Optional[str] = None,
+        top_n: int = 5,
+        backend: Optional[str] = None,
+    ):
+        """
+        Initialize the ingestor. The store is created on first use.
+
+        Args:
+            jsonl_path: Leaderboard JSONL dump
+            evaluations: Evaluation names to store (None for all)
+            store_path: SQLite file (defaults to LEADERBOARD_INGEST_PATH or results/)
+            top_n: Models per top-N set and per temporal window (default 5)
+            backend: JSON backend, see leaderboard_jsonl.get_json_loads
+        """
+        if top_n <= 0:
+            raise ValueError(f"top_n must be positive, got {top_n}")
+        self.source = os.path.realpath(jsonl_path)
+        self.evaluations = frozenset(evaluations) if evaluations is not None else None
+        if store_path is None:
+            store_path = os.environ.get("LEADERBOARD_INGEST_PATH", str(DEFAULT_STORE_PATH))
+        self.store_path = str(store_path)
+        self.top_n = top_n
+        self.backend = backend
+        self._conn: Optional[sqlite3.Connection] = None
+
+    def _connection(self) -> sqlite3.Connection:
+        if self._conn is None:
+            if self.store_path != ":memory:":
+                os.makedirs(os.path.dirname(os.path.abspath(self.store_path)), exist_ok=True)
+            connection = sqlite3.connect(self.store_path, timeout=30)
+            if self.store_path != ":memory:":
+                connection.execute("PRAGMA journal_mode=WAL")
+            connection.executescript(self._SCHEMA)
+            columns = {row[1] for row in connection.execute("PRAGMA table_info(sources)")}
+            if "prefix_hash" not in columns:
+                # Stores from before prefix verification; their sources get one full scan
+                connection.execute("ALTER TABLE sources ADD COLUMN prefix_hash TEXT")
+            self._conn = connection
+        return self._conn
+
+    def _filter_key(self) -> Optional[str]:
+        return json.dumps(sorted(self.evaluations)) if self.evaluations is not None else None
+
+    def _load_state(self, connection: sqlite3.Connection) -> Optional[Dict[str, Any]]:
+        cursor = connection.execute("SELECT * FROM sources WHERE source = ?", (self.source,))
+        row = cursor.fetchone()
+        if row is None:
+            return None
+        state = dict(zip((column[0] for column in cursor.description), row))
+        if state["evaluations"] != self._filter_key():
+            print(f"Warning: Evaluation filter changed for {self.source}; re-ingesting it")
+            for table in ("sources", "models", "scores", "windows"):
+                connection.execute(f"DELETE FROM {table} WHERE source = ?", (self.source,))
+            return None
+        return state
+
+    def _resume_offset(self, state: Optional[Dict[str, Any]], file_size: int) -> Tuple[int, Any]:
+        # Resume at the previous end of file only if the file grew, its previous
+        # last line still ends there, and the bytes before it hash as they did.
+        # Returns the offset and a hasher already fed with the bytes before it.
+        if (
+            not state
+            or state["tail_offset"] is None
+            or state["prefix_hash"] is None
+            or file_size <= state["file_size"]
+        ):
+            return 0, _prefix_hasher()
+        hasher = _prefix_hasher()
+        with open(self.source, "rb") as f:
+            f.seek(state["tail_offset"])
+            line = f.readline()
+            if (
+                not line.endswith(b"\n")
+                or state["tail_offset"] + len(line) != state["file_size"]
+                or _content_hash(line.strip()) != state["tail_hash"]
+            ):
+                return 0, _prefix_hasher()
+            # Hashing without parsing is cheap next to the JSON a full scan would load
+            f.seek(0)
+            remaining = state["file_size"]
+            while remaining:
+                chunk = f.read(min(PREFIX_CHUNK_SIZE, remaining))
+                if not chunk:
+                    return 0, _prefix_hasher()
+                hasher.update(chunk)
+                remaining -= len(chunk)
+        if hasher.hexdigest() != state["prefix_hash"]:
+            return 0, _prefix_hasher()
+        return state["file_size"], hasher
+
+    def _scan(
+        self, start: int, known: Dict[str, str], hasher: Any
+    ) -> Tuple[Dict[str, Optional[Tuple[str, Dict[str, Any]]]], int, Optional[Tuple[int, str]], int]:
+        # model_id -> (hash, record) to apply, or None to keep the stored record
+        latest: Dict[str, Optional[Tuple[str, Dict[str, Any]]]] = {}
+        unchanged = 0
+        tail = None
+        loads = get_json_loads(self.backend)
+        projection = build_projection(TABLE_FIELDS)
+        with open(self.source, "rb") as f:
+            f.seek(start)
+            offset = start
+            for line in f:
+                hasher.update(line)
+                line_start, offset = offset, offset + len(line)
+                content = line.strip()
+                if not content:
+                    continue
+                digest = _content_hash(content)
+                tail = (line_start, digest) if line.endswith(b"\n") else None
+                model_id = known.get(digest)
+                if model_id is not None:
+                    latest[model_id] = None
+                    unchanged += 1
+                    continue
+                record = loads(content)
+                model_id = (record.get("model_info") or {}).get("id", "unknown")
+                # Keep only what the store needs until the delta is applied
+                record["evaluation_results"] = select_evaluations(record, self.evaluations)
+                latest[model_id] = (digest, project(record, projection))
+        return latest, unchanged, tail, offset
+
+    def _drop_model(
+        self, connection: sqlite3.Connection, model_id: str, counts: Dict[Tuple[str, bool], int]
+    ) -> Set[str]:
+        rows = connection.execute(
+            "SELECT evaluation, score, dated FROM scores WHERE source = ? AND model_id = ?",
+            (self.source, model_id),
+        ).fetchall()
+        for evaluation, score, dated in rows:
+            key = (evaluation, score is not None and dated is not None)
+            counts[key] = counts.get(key, 0) - 1
+        connection.execute(
+            "DELETE FROM scores WHERE source = ? AND model_id = ?", (self.source, model_id)
+        )
+        return {evaluation for evaluation, _, _ in rows}
+
+    def _model_rows(
+        self, model_id: str, row: int, digest: str, record: Dict[str, Any]
+    ) -> Tuple[tuple, List[tuple]]:
+        # One models row and one scores row per kept evaluation result
+        model_info = record.get("model_info") or {}
+        additional_details = record.get("additional_details") or {}
+        submission_date = record.get("submission_date")
+        model_row = (
+            self.source,
+            model_id,
+            row,
+            digest,
+            model_info.get("name"),
+            model_info.get("developer"),
+            submission_date,
+            additional_details.get("params_billions"),
+            additional_details.get("architecture"),
+        )
+        dated = _normalize_date(submission_date)
+        score_rows = [
+            (self.source, result["evaluation_name"], model_id, row, _score_value(result), dated)
+            for result in record.get("evaluation_results", [])
+        ]
+        return model_row, score_rows
+
+    def _apply_counts(
+        self, connection: sqlite3.Connection, counts: Dict[Tuple[str, bool], int]
+    ) -> None:
+        connection.executemany(
+            "INSERT OR IGNORE INTO windows (source, evaluation) VALUES (?, ?)",
+            {(self.source, evaluation) for evaluation, _ in counts},
+        )
+        for valid in (True, False):
+            column = "num_valid" if valid else "num_skipped"
+            connection.executemany(
+                f"UPDATE windows SET {column} = {column} + ? WHERE source = ? AND evaluation = ?",
+                [
+                    (step, self.source, evaluation)
+                    for (evaluation, is_valid), step in counts.items()
+                    if is_valid == valid and step
+                ],
+            )
+
+    def _top_models(self, connection: sqlite3.Connection, evaluation: str, n: int) -> List[tuple]:
+        return connection.execute(
+            "SELECT s.model_id, s.score, m.model_name, m.developer, m.params_billions, m.architecture "
+            "FROM scores s JOIN models m ON m.source = s.source AND m.model_id = s.model_id "
+            "WHERE s.source = ? AND s.evaluation = ? AND s.score IS NOT NULL "
+            "ORDER BY s.score DESC, s.row LIMIT ?",
+            (self.source, evaluation, n),
+        ).fetchall()
+
+    def _refresh_window(self, connection: sqlite3.Connection, evaluation: str) -> None:
+        params = (self.source, evaluation)
+        dated = "source = ? AND evaluation = ? AND dated IS NOT NULL AND score IS NOT NULL"
+        # The latest window's cumulative top-N is the top-N over every dated submission
+        top_scores = [
+            score
+            for (score,) in connection.execute(
+                f"SELECT score FROM scores WHERE {dated} ORDER BY score DESC, row LIMIT ?",
+                (*params, self.top_n),
+            )
+        ]
+        latest_dates = [
+            date
+            for (date,) in connection.execute(
+                f"SELECT dated FROM scores WHERE {dated} ORDER BY dated DESC, row DESC LIMIT ?",
+                (*params, self.top_n),
+            )
+        ]
+        first = connection.execute(
+            f"SELECT dated FROM scores WHERE {dated} ORDER BY dated, row LIMIT 1", params
+        ).fetchone()
+        connection.execute(
+            "UPDATE windows SET top_n_scores = ?, first_date = ?, window_start_date = ?, "
+            "window_end_date = ? WHERE source = ? AND evaluation = ?",
+            (
+                json.dumps(top_scores),
+                first[0] if first else None,
+                latest_dates[-1] if latest_dates else None,
+                latest_dates[0] if latest_dates else None,
+                *params,
+            ),
+        )
+
+    def ingest(self) -> IngestReport:
+        """
+        Apply the current dump to the store.
+
+        Returns:
+            IngestReport: Counts of what changed and which evaluations it touched
+        """
+        connection = self._connection()
+        stat = os.stat(self.source)
+        with connection:
+            state = self._load_state(connection)
+            if state and (state["file_size"], state["file_mtime"]) == (stat.st_size, stat.st_mtime_ns):
+                return IngestReport(
+                    self.source, stat.st_size, 0, 0, 0, 0, 0, state["watermark"], [], [], []
+                )
+
+            start, hasher = self._resume_offset(state, stat.st_size)
+            if start:
+                # Appended lines only need a lookup for models they replace
+                known = {}
+                stored_ids: Set[str] = set()
+            else:
+                known = dict(
+                    connection.execute(
+                        "SELECT content_hash, model_id FROM models WHERE source = ?", (self.source,)
+                    )
+                )
+                stored_ids = set(known.values())
+            latest, unchanged, tail, end = self._scan(start, known, hasher)
+
+            watermark = state["watermark"] if state else None
+            next_row = state["next_row"] if state else 0
+            previous_top = {}
+            touched: Set[str] = set()
+            rewritten: Set[str] = set()
+            added = changed = 0
+            new_watermark = watermark
+            counts: Dict[Tuple[str, bool], int] = {}
+            model_rows, score_rows = [], []
+
+            def remember_top(evaluations: Iterable[str]) -> None:
+                for evaluation in evaluations:
+                    if evaluation not in previous_top:
+                        previous_top[evaluation] = self._top_models(connection, evaluation, self.top_n)
+
+            updates = [(model_id, entry) for model_id, entry in latest.items() if entry is not None]
+            for model_id, (digest, record) in updates:
+                existing = connection.execute(
+                    "SELECT row FROM models WHERE source = ? AND model_id = ?",
+                    (self.source, model_id),
+                ).fetchone()
+                if existing is not None:
+                    old_evaluations = {
+                        evaluation
+                        for (evaluation,) in connection.execute(
+                            "SELECT evaluation FROM scores WHERE source = ? AND model_id = ?",
+                            (self.source, model_id),
+                        )
+                    }
+                    remember_top(old_evaluations)
+                    self._drop_model(connection, model_id, counts)
+                    touched |= old_evaluations
+                    rewritten |= old_evaluations
+                    row = existing[0]
+                    changed += 1
+                else:
+                    row = next_row
+                    next_row += 1
+                    added += 1
+                model_row, rows = self._model_rows(model_id, row, digest, record)
+                model_rows.append(model_row)
+                score_rows.extend(rows)
+                for _, evaluation, _, _, score, dated in rows:
+                    remember_top([evaluation])
+                    touched.add(evaluation)
+                    key = (evaluation, score is not None and dated is not None)
+                    counts[key] = counts.get(key, 0) + 1
+                    if existing is not None:
+                        # A changed model keeps its place in the history
+                        rewritten.add(evaluation)
+                    if score is not None and dated is not None:
+                        if watermark is not None and dated < watermark:
+                            rewritten.add(evaluation)
+                        if new_watermark is None or dated > new_watermark:
+                            new_watermark = dated
+
+            removed_ids = stored_ids - latest.keys()
+            for model_id in removed_ids:
+                evaluations = {
+                    evaluation
+                    for (evaluation,) in connection.execute(
+                        "SELECT evaluation FROM scores WHERE source = ? AND model_id = ?",
+                        (self.source, model_id),
+                    )
+                }
+                remember_top(evaluations)
+                self._drop_model(connection, model_id, counts)
+                connection.execute(
+                    "DELETE FROM models WHERE source = ? AND model_id = ?", (self.source, model_id)
+                )
+                touched |= evaluations
+                rewritten |= evaluations
+
+            connection.executemany(
+                "INSERT OR REPLACE INTO models VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)", model_rows
+            )
+            connection.executemany("INSERT INTO scores VALUES (?, ?, ?, ?, ?, ?)", score_rows)
+            self._apply_counts(connection, counts)
+
+            top_n_changed = []
+            for evaluation in sorted(touched):
+                self._refresh_window(connection, evaluation)
+                if self._top_models(connection, evaluation, self.top_n) != previous_top.get(evaluation):
+                    top_n_changed.append(evaluation)
+
+            # The size and prefix hash cover exactly the bytes read, even if the
+            # dump grew while it was being scanned
+            connection.execute(
+                "INSERT OR REPLACE INTO sources (source, evaluations, watermark, file_size, "
+                "file_mtime, tail_offset, tail_hash, next_row, prefix_hash) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    self.source,
+                    self._filter_key(),
+                    new_watermark,
+                    end,
+                    stat.st_mtime_ns,
+                    tail[0] if tail else (state["tail_offset"] if start else None),
+                    tail[1] if tail else (state["tail_hash"] if start else None),
+                    next_row,
+                    hasher.hexdigest(),
+                ),
+            )
+
+        return IngestReport(
+            source=self.source,
+            resumed_at=start,
+            parsed=len(updates),
+            unchanged=unchanged,
+            added=added,
+            changed=changed,
+            removed=len(removed_ids),
+            watermark=new_watermark,
+            touched_evaluations=sorted(touched),
+            rewritten_evaluations=sorted(rewritten),
+            top_n_changed=top_n_changed,
+        )
+
+    def top_n_models(self, eval_name: str, n: Optional[int] = None) -> List[Dict[str, Any]]:
+        """
+        Get the best-scoring models on an evaluation, as TopNModelsMetric reports them.
+
+        Args:
+            eval_name: Evaluation name as it appears in the dump
+            n: Number of models (defaults to the ingestor's top_n)
+
+        Returns:
+            List of dicts with model_name, developer, score, params_billions
+            and architecture, best first
+        """
+        rows = self._top_models(self._connection(), eval_name, n or self.top_n)
+        return [
+            {
+                "model_name": model_name,
+                "developer": developer,
+                "score": score,
+                "params_billions": params_billions,
+                "architecture": architecture,
+            }
+            for _, score, model_name, developer, params_billions, architecture in rows
+        ]
+
+    def latest_window(self, eval_name: str, test_set_size: Optional[int] = None) -> Dict[str, Any]:
+        """
+        Get the latest temporal-saturation window for an evaluation.
+
+        The fields match TemporalSaturationMetric's summary of its last window.
+        Saturation metrics are included only when a test set size is given.
+
+        Args:
+            eval_name: Evaluation name as it appears in the dump
+            test_set_size: Size of the evaluation's test set
+
+        Returns:
+            Dict with the window's scores and dates, or an insufficient_data status
+        """
+        row = self._connection().execute(
+            "SELECT num_valid, num_skipped, top_n_scores, first_date, window_start_date, "
+            "window_end_date FROM windows WHERE source = ? AND evaluation = ?",
+            (self.source, eval_name),
+        ).fetchone()
+        num_valid, num_skipped, top_n_scores, first_date, start_date, end_date = row or (
+            0, 0, None, None, None, None,
+        )
+        if num_valid < self.top_n:
+            return {
+                "status": "insufficient_data",
+                "message": f"Need at least {self.top_n} models with submission dates, found {num_valid}",
+                "num_valid_models": num_valid,
+                "num_skipped_models": num_skipped,
+                "S_index": None,
+                "saturation_category": None,
+            }
+
+        scores = json.loads(top_n_scores)
+        window = {
+            "status": "success",
+            "top_n_scores": scores,
+            "mean_score": sum(scores) / len(scores),
+            "s1": scores[0],
+            "s5": scores[min(4, len(scores) - 1)],
+            "score_range": scores[0] - scores[min(4, len(scores) - 1)],
+            "num_windows_computed": num_valid - self.top_n + 1,
+            "num_valid_models": num_valid,
+            "num_skipped_models": num_skipped,
+            "date_range_covered": f"{first_date} to {end_date}",
+            "window_start_date": start_date,
+            "latest_submission_date": end_date,
+        }
+        if test_set_size is not None:
+            # Imported here because the metrics themselves depend on this package
+            from analyzer.src.metrics.dynamic.saturation_utils import (
+                SATURATION_CATEGORIES,
+                compute_saturation_metrics_batch,
+            )
+
+            metrics = compute_saturation_metrics_batch(
+                [window["s1"]], [window["s5"]], test_set_size
+            )
+            code = int(metrics["category_code"][0])
+            window.update(
+                {
+                    "S_index": float(metrics["s_index"][0]),
+                    "saturation_category": SATURATION_CATEGORIES[code] if code >= 0 else None,
+                    "R_norm": float(metrics["r_norm"][0]),
+                    "SE_delta": float(metrics["se_delta"][0]),
+                    "n_eff": float(metrics["n_eff"][0]),
+                    "test_set_size": test_set_size,
+                }
+            )
+        return window
+
+    def close(self) -> None:
+        """Close the store connection."""
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+
+def _leaderboard_source(leaderboard_id: str) -> Tuple[str, List[str]]:
+    # Imported here so plain file ingests don't load the registry
+    from analyzer.src.automation.registry import load_config
+
+    config = load_config(leaderboard_id)
+    jsonl_path = config["leaderboard"].get("jsonl_path")
+    if not jsonl_path:
+        raise ValueError(f"Leaderboard {leaderboard_id!r} has no jsonl_path")
+    evaluations = [spec["eval_name"] for spec in config["datasets"] if spec.get("eval_name")]
+    return str(PROJECT_ROOT / jsonl_path), evaluations
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Ingest new and changed leaderboard submissions")
+    parser.add_argument("jsonl_path", nargs="?", help="Leaderboard JSONL dump")
+    parser.add_argument("--leaderboard", help="Registered leaderboard id (sets the dump and evaluations)")
+    parser.add_argument("--evaluations", nargs="+", help="Evaluation names to store (default: all)")
+    parser.add_argument("--store", help="SQLite store (default LEADERBOARD_INGEST_PATH)")
+    parser.add_argument("--top-n", type=int, default=5, help="Models per top-N set and window")
+    args = parser.parse_args()
+
+    jsonl_path, evaluations = args.jsonl_path, args.evaluations
+    if args.leaderboard:
+        jsonl_path, configured = _leaderboard_source(args.leaderboard)
+        evaluations = evaluations or configured
+    if not jsonl_path:
+        parser.error("give a JSONL path or --leaderboard")
+
+    ingestor = LeaderboardIngestor(
+        jsonl_path, evaluations=evaluations, store_path=args.store, top_n=args.top_n
+    )
+    report = ingestor.ingest()
+    print(
+        f"{report.source}: {report.added} added, {report.changed} changed, "
+        f"{report.removed} removed, {report.unchanged} unchanged "
+        f"(parsed {report.parsed}, resumed at byte {report.resumed_at}), "
+        f"watermark {report.watermark}"
+    )
+    for evaluation in report.touched_evaluations:
+        window = ingestor.latest_window(evaluation)
+        flags = []
+        if evaluation in report.top_n_changed:
+            flags.append("top-N changed")
+        if evaluation in report.rewritten_evaluations:
+            flags.append("history rewritten")
+        print(
+            f"  {evaluation}: {window['num_valid_models']} dated models, "
+            f"latest window ends {window.get('latest_submission_date')}"
+            + (f" [{', '.join(flags)}]" if flags else "")
+        )
+    ingestor.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,182 @@
+"""
+Streaming reader for leaderboard JSONL dumps.
+
+Each line of a dump is one model with its `model_info`, `additional_details`
+and every `evaluation_results` entry. Most consumers need a handful of those
+fields for a few evaluations. This reader goes through the file line by line
+and yields each record cut down to a field projection and an evaluation-name
+filter. Lines that mention none of the wanted evaluations are skipped
+before they are parsed, and nothing outside the projection outlives its
+line.
+
+Parsing uses orjson when it is installed, which is several times faster than
+the standard library on these dumps.
+
+Environment variables:
+    ANALYZER_JSON_BACKEND: "auto" (default: orjson if available), "orjson" or "json"
+"""
+
+import json
+import os
+from typing import AbstractSet, Any, Callable, Dict, Iterable, Iterator, List, Optional
+
+JSON_BACKENDS = ("auto", "orjson", "json")
+
+# Projection tree: field name -> subtree, or None to keep the whole value
+Projection = Dict[str, Optional["Projection"]]
+
+
+def get_json_loads(backend: Optional[str] = None) -> Callable[[bytes], Any]:
+    """
+    Pick the JSON parser for leaderboard lines.
+
+    Args:
+        backend: "auto", "orjson" or "json" (defaults to ANALYZER_JSON_BACKEND or "auto")
+
+    Returns:
+        Callable taking one line as bytes and returning the parsed value
+
+    Raises:
+        ImportError: If "orjson" is asked for but not installed
+    """
+    backend = (backend or os.environ.get("ANALYZER_JSON_BACKEND", "auto")).lower()
+    if backend not in JSON_BACKENDS:
+        raise ValueError(f"Unknown JSON backend {backend!r}, expected one of {JSON_BACKENDS}")
+    if backend != "json":
+        try:
+            # Imported here so the standard-library path never needs it
+            import orjson
+
+            return orjson.loads
+        except ImportError:
+            if backend == "orjson":
+                raise ImportError(
+                    "The orjson JSON backend needs orjson; install it with `pip install orjson`"
+                )
+    return json.loads
+
+
+def build_projection(fields: Iterable[str]) -> Projection:
+    """
+    Turn dotted field paths into a projection tree.
+
+    Paths through a list apply to each of its items, so
+    "evaluation_results.score_details.score" keeps only the score of every
+    evaluation result.
+
+    Args:
+        fields: Dotted paths, e.g. ("model_info.id", "submission_date")
+
+    Returns:
+        Projection: Nested dict of the fields to keep
+    """
+    tree: Projection = {}
+    for path in fields:
+        node = tree
+        parts = path.split(".")
+        for part in parts[:-1]:
+            child = node.setdefault(part, {})
+            if child is None:
+                break  # a parent path already keeps the whole value
+            node = child
+        else:
+            node[parts[-1]] = None
+    return tree
+
+
+def project(value: Any, projection: Optional[Projection]) -> Any:
+    """
+    Keep only the projected fields of a parsed value.
+
+    Args:
+        value: Parsed JSON value
+        projection: Tree from build_projection (None keeps everything)
+
+    Returns:
+        Any: The cut-down value (missing fields are left out)
+    """
+    if projection is None:
+        return value
+    if isinstance(value, list):
+        return [project(item, projection) for item in value]
+    if not isinstance(value, dict):
+        return value
+    return {
+        name: project(value[name], subtree)
+        for name, subtree in projection.items()
+        if name in value
+    }
+
+
+def _name_markers(evaluations: Iterable[str]) -> tuple:
+    # An evaluation name can only match if its JSON string appears in the line,
+    # either escaped (json.dumps default) or as raw UTF-8
+    markers = set()
+    for name in evaluations:
+        markers.add(json.dumps(name).encode("utf-8"))
+        markers.add(json.dumps(name, ensure_ascii=False).encode("utf-8"))
+    return tuple(markers)
+
+
+def select_evaluations(
+    record: Dict[str, Any], wanted: Optional[AbstractSet[str]] = None
+) -> List[Dict[str, Any]]:
+    """
+    Get a record's results for the wanted evaluations.
+
+    Args:
+        record: Parsed leaderboard record
+        wanted: Evaluation names to keep (None keeps every evaluation)
+
+    Returns:
+        List of results, the first one per evaluation name, in record order
+    """
+    kept, seen = [], set()
+    for result in record.get("evaluation_results") or []:
+        name = result.get("evaluation_name")
+        if name is not None and (wanted is None or name in wanted) and name not in seen:
+            seen.add(name)
+            kept.append(result)
+    return kept
+
+
+def iter_leaderboard_records(
+    jsonl_path: str,
+    fields: Optional[Iterable[str]] = None,
+    evaluations: Optional[Iterable[str]] = None,
+    backend: Optional[str] = None,
+) -> Iterator[Dict[str, Any]]:
+    """
+    Stream the records of a leaderboard JSONL dump.
+
+    With `evaluations`, each record's evaluation_results are filtered to those
+    names (first result per name, as the metrics match them) and records left
+    without any are not yielded.
+
+    Args:
+        jsonl_path: Path to the leaderboard JSONL file
+        fields: Dotted field paths to keep (None keeps every field)
+        evaluations: Evaluation names to keep (None keeps every evaluation)
+        backend: JSON backend, see get_json_loads
+
+    Yields:
+        Dict[str, Any]: One projected record per kept line, in file order
+    """
+    loads = get_json_loads(backend)
+    projection = build_projection(fields) if fields is not None else None
+    wanted = set(evaluations) if evaluations is not None else None
+    markers = _name_markers(wanted) if wanted is not None else ()
+
+    with open(jsonl_path, "rb") as f:
+        for line in f:
+            if not line.strip():
+                continue
+            if wanted is not None and not any(marker in line for marker in markers):
+                continue
+            record = loads(line)
+            if wanted is not None:
+                kept = select_evaluations(record, wanted)
+                if not kept:
+                    continue
+                record["evaluation_results"] = kept
+            yield project(record, projection)
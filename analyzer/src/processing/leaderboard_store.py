@@ -0,0 +1,405 @@
+"""
+Process-wide store for leaderboard JSONL dumps.
+
+Leaderboard-backed metrics (top-N, saturation, temporal saturation) all read
+the same JSONL snapshot. This module parses each file once into a columnar
+table and shares that table across every metric instance in the process,
+keyed by the file's resolved path and modification time.
+
+Files are streamed through analyzer.src.processing.leaderboard_jsonl with only
+the fields the table uses. A table can be limited to the evaluations a run
+needs, so its size follows the selected evaluations rather than the dump.
+"""
+
+import os
+import threading
+from typing import AbstractSet, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from analyzer.src.processing.leaderboard_jsonl import iter_leaderboard_records
+from analyzer.src.processing.run_profile import profiled
+
+# Record fields LeaderboardTable.from_records reads
+TABLE_FIELDS = (
+    "model_info.id",
+    "model_info.name",
+    "model_info.developer",
+    "submission_date",
+    "additional_details.params_billions",
+    "additional_details.architecture",
+    "evaluation_results.evaluation_name",
+    "evaluation_results.score_details.score",
+)
+
+
+class EvaluationIndex:
+    """
+    Scores for one evaluation, pre-sorted best first.
+
+    ``scores`` holds every usable score for the evaluation in descending
+    order (ties keep file order) and ``models`` holds the matching row
+    indices into the table's model columns. Top-N, percentile and rank
+    queries are slices or binary searches over these arrays.
+    """
+
+    def __init__(self, evaluation_name: str, scores: np.ndarray, models: np.ndarray):
+        self.evaluation_name = evaluation_name
+        self.scores = scores
+        self.models = models
+        self._negated = -scores  # ascending, for searchsorted
+
+    def top_n(self, n: int) -> np.ndarray:
+        """
+        Get the N highest scores.
+
+        Args:
+            n: Number of scores to return
+
+        Returns:
+            np.ndarray: Up to N scores, highest first
+        """
+        return self.scores[:n]
+
+    def top_models(self, n: int) -> np.ndarray:
+        """
+        Get the model rows behind the N highest scores.
+
+        Args:
+            n: Number of models to return
+
+        Returns:
+            np.ndarray: Up to N model row indices, best first
+        """
+        return self.models[:n]
+
+    def percentile(self, q: float) -> Optional[float]:
+        """
+        Get the score at percentile q, interpolating linearly like numpy.
+
+        Args:
+            q: Percentile in [0, 100]
+
+        Returns:
+            float: The score at that percentile, or None if there are no scores
+        """
+        if not 0 <= q <= 100:
+            raise ValueError(f"Percentile must be in [0, 100], got {q}")
+        count = len(self.scores)
+        if count == 0:
+            return None
+        # Position in ascending order, mapped onto the descending array
+        position = (q / 100.0) * (count - 1)
+        lower = int(np.floor(position))
+        upper = min(lower + 1, count - 1)
+        low_value = self.scores[count - 1 - lower]
+        high_value = self.scores[count - 1 - upper]
+        return float(low_value + (high_value - low_value) * (position - lower))
+
+    def rank(self, score: float) -> int:
+        """
+        Get the 1-based rank a score would take on this evaluation.
+
+        Args:
+            score: Score to rank
+
+        Returns:
+            int: One plus the number of strictly higher scores
+        """
+        return int(np.searchsorted(self._negated, -score, side="left")) + 1
+
+    def __len__(self) -> int:
+        return len(self.scores)
+
+    def __repr__(self) -> str:
+        return f"EvaluationIndex({self.evaluation_name!r}, scores={len(self.scores)})"
+
+
+class LeaderboardTable:
+    """
+    Columnar view of a leaderboard JSONL dump.
+
+    The table has two levels:
+
+    - Model columns, one entry per JSONL record: ``model_id``, ``model_name``,
+      ``developer``, ``submission_date``, ``params_billions``, ``architecture``.
+    - Score columns, one entry per (model, evaluation) pair:
+      ``score_model`` (row index into the model columns), ``score_eval``
+      (code into ``evaluation_names``) and ``score``.
+
+    Only the first result per evaluation name is kept for each model, which
+    matches how the metrics have always matched ``evaluation_results``.
+
+    ``selected_evaluations`` is the evaluation filter the table was built
+    with (None when it holds every evaluation in the file).
+    """
+
+    def __init__(
+        self,
+        model_id: np.ndarray,
+        model_name: np.ndarray,
+        developer: np.ndarray,
+        submission_date: np.ndarray,
+        params_billions: np.ndarray,
+        architecture: np.ndarray,
+        evaluation_names: List[str],
+        score_model: np.ndarray,
+        score_eval: np.ndarray,
+        score: np.ndarray,
+        source_path: Optional[str] = None,
+        selected_evaluations: Optional[AbstractSet[str]] = None,
+    ):
+        self.model_id = model_id
+        self.model_name = model_name
+        self.developer = developer
+        self.submission_date = submission_date
+        self.params_billions = params_billions
+        self.architecture = architecture
+        self.evaluation_names = evaluation_names
+        self.score_model = score_model
+        self.score_eval = score_eval
+        self.score = score
+        self.source_path = source_path
+        self.selected_evaluations = (
+            frozenset(selected_evaluations) if selected_evaluations is not None else None
+        )
+        self._eval_codes = {name: code for code, name in enumerate(evaluation_names)}
+        self._score_index: Optional[Dict[str, EvaluationIndex]] = None
+        self._index_lock = threading.Lock()
+
+    @classmethod
+    def from_records(cls, records, source_path: Optional[str] = None) -> "LeaderboardTable":
+        """
+        Build a table from an iterable of parsed leaderboard records.
+
+        Args:
+            records: Iterable of dicts in the leaderboard JSONL schema
+            source_path: Optional path the records were read from
+
+        Returns:
+            LeaderboardTable: The columnar table
+        """
+        model_id, model_name, developer = [], [], []
+        submission_date, params_billions, architecture = [], [], []
+        eval_codes: Dict[str, int] = {}
+        score_model, score_eval, score = [], [], []
+
+        for row, record in enumerate(records):
+            model_info = record.get("model_info", {})
+            additional_details = record.get("additional_details") or {}
+            model_id.append(model_info.get("id", "unknown"))
+            model_name.append(model_info.get("name"))
+            developer.append(model_info.get("developer"))
+            submission_date.append(record.get("submission_date"))
+            params_billions.append(additional_details.get("params_billions"))
+            architecture.append(additional_details.get("architecture"))
+
+            seen = set()
+            for eval_result in record.get("evaluation_results", []):
+                eval_name = eval_result.get("evaluation_name")
+                if eval_name is None or eval_name in seen:
+                    continue
+                seen.add(eval_name)
+                try:
+                    value = float(eval_result["score_details"]["score"])
+                except (KeyError, TypeError, ValueError):
+                    value = np.nan
+                score_model.append(row)
+                score_eval.append(eval_codes.setdefault(eval_name, len(eval_codes)))
+                score.append(value)
+
+        return cls(
+            model_id=np.array(model_id, dtype=object),
+            model_name=np.array(model_name, dtype=object),
+            developer=np.array(developer, dtype=object),
+            submission_date=np.array(submission_date, dtype=object),
+            params_billions=np.array(params_billions, dtype=object),
+            architecture=np.array(architecture, dtype=object),
+            evaluation_names=list(eval_codes),
+            score_model=np.array(score_model, dtype=np.int64),
+            score_eval=np.array(score_eval, dtype=np.int32),
+            score=np.array(score, dtype=np.float64),
+            source_path=source_path,
+        )
+
+    @classmethod
+    @profiled("parse_jsonl")
+    def from_jsonl(
+        cls,
+        jsonl_path: str,
+        evaluations: Optional[Iterable[str]] = None,
+        backend: Optional[str] = None,
+    ) -> "LeaderboardTable":
+        """
+        Parse a leaderboard JSONL file into a table.
+
+        Args:
+            jsonl_path: Path to the leaderboard JSONL file
+            evaluations: Evaluation names to keep (None for all). Models
+                without any of them are left out of the table.
+            backend: JSON backend, see leaderboard_jsonl.get_json_loads
+
+        Returns:
+            LeaderboardTable: The columnar table
+        """
+        selected = frozenset(evaluations) if evaluations is not None else None
+        records = iter_leaderboard_records(
+            jsonl_path, fields=TABLE_FIELDS, evaluations=selected, backend=backend
+        )
+        table = cls.from_records(records, source_path=jsonl_path)
+        table.selected_evaluations = selected
+        return table
+
+    def covers(self, evaluations: Optional[Iterable[str]]) -> bool:
+        """
+        Whether the table holds every model's scores for the given evaluations.
+
+        Args:
+            evaluations: Evaluation names (None for all)
+
+        Returns:
+            bool: True if queries for these evaluations can use this table
+        """
+        if self.selected_evaluations is None:
+            return True
+        return evaluations is not None and self.selected_evaluations.issuperset(evaluations)
+
+    @property
+    def num_models(self) -> int:
+        """Number of model records in the table."""
+        return len(self.model_id)
+
+    def evaluation_rows(self, eval_name: str) -> np.ndarray:
+        """
+        Get the score-row positions for one evaluation, in file order.
+
+        Args:
+            eval_name: Evaluation name as it appears in the JSONL file
+
+        Returns:
+            np.ndarray: Integer positions into the score columns
+        """
+        code = self._eval_codes.get(eval_name)
+        if code is None:
+            return np.empty(0, dtype=np.int64)
+        return np.flatnonzero(self.score_eval == code)
+
+    def score_index(self) -> Dict[str, EvaluationIndex]:
+        """
+        Get the per-evaluation score index, building it on first use.
+
+        All evaluations are indexed with a single sort over the score
+        columns, so the whole index costs O(R log R) once per table.
+
+        Returns:
+            Dict[str, EvaluationIndex]: Index keyed by evaluation name
+        """
+        if self._score_index is None:
+            with self._index_lock:
+                if self._score_index is None:
+                    self._score_index = self._build_score_index()
+        return self._score_index
+
+    def evaluation_index(self, eval_name: str) -> EvaluationIndex:
+        """
+        Get the sorted scores for one evaluation.
+
+        Args:
+            eval_name: Evaluation name as it appears in the JSONL file
+
+        Returns:
+            EvaluationIndex: The evaluation's index (empty if unknown)
+        """
+        index = self.score_index().get(eval_name)
+        if index is None:
+            return EvaluationIndex(
+                eval_name, np.empty(0, dtype=np.float64), np.empty(0, dtype=np.int64)
+            )
+        return index
+
+    def _build_score_index(self) -> Dict[str, EvaluationIndex]:
+        usable = np.flatnonzero(~np.isnan(self.score))
+        # lexsort is stable: group by evaluation, then best score first,
+        # with tied scores kept in file order
+        order = usable[np.lexsort((-self.score[usable], self.score_eval[usable]))]
+        sorted_evals = self.score_eval[order]
+        sorted_scores = self.score[order]
+        sorted_models = self.score_model[order]
+
+        codes = np.arange(len(self.evaluation_names))
+        starts = np.searchsorted(sorted_evals, codes, side="left")
+        ends = np.searchsorted(sorted_evals, codes, side="right")
+
+        return {
+            name: EvaluationIndex(
+                name, sorted_scores[start:end], sorted_models[start:end]
+            )
+            for name, start, end in zip(self.evaluation_names, starts, ends)
+        }
+
+    def __len__(self) -> int:
+        return len(self.score)
+
+    def __repr__(self) -> str:
+        return (
+            f"LeaderboardTable(models={self.num_models}, scores={len(self.score)}, "
+            f"evaluations={len(self.evaluation_names)})"
+        )
+
+
+_tables: Dict[str, Tuple[int, List[LeaderboardTable]]] = {}
+_path_locks: Dict[str, threading.Lock] = {}
+_registry_lock = threading.Lock()
+
+
+def load_leaderboard_table(
+    jsonl_path: str, evaluations: Optional[Iterable[str]] = None
+) -> LeaderboardTable:
+    """
+    Get the shared table for a leaderboard JSONL file.
+
+    The file is parsed at most once per (path, mtime, evaluation filter) per
+    process, and a table that already covers the requested evaluations
+    (including a full one) is reused. Concurrent callers asking for the
+    same file wait for a single parse.
+
+    Args:
+        jsonl_path: Path to the leaderboard JSONL file
+        evaluations: Evaluation names the caller will query (None for all)
+
+    Returns:
+        LeaderboardTable: The shared columnar table
+    """
+    path = os.path.realpath(jsonl_path)
+    if evaluations is not None:
+        evaluations = frozenset(evaluations)
+    with _registry_lock:
+        lock = _path_locks.setdefault(path, threading.Lock())
+
+    with lock:
+        mtime = os.stat(path).st_mtime_ns
+        cached_mtime, tables = _tables.get(path, (None, []))
+        if cached_mtime != mtime:
+            tables = []
+        for table in tables:
+            if table.covers(evaluations):
+                return table
+        table = LeaderboardTable.from_jsonl(path, evaluations=evaluations)
+        if evaluations is None:
+            tables = []  # the full table covers every narrower one
+        _tables[path] = (mtime, tables + [table])
+        return table
+
+
+def clear_leaderboard_cache(jsonl_path: Optional[str] = None) -> None:
+    """
+    Drop cached tables so the next load re-parses the file.
+
+    Args:
+        jsonl_path: File to evict, or None to evict every cached table
+    """
+    with _registry_lock:
+        if jsonl_path is None:
+            _tables.clear()
+        else:
+            _tables.pop(os.path.realpath(jsonl_path), None)
@@ -0,0 +1,279 @@
+"""
+Content-addressed cache of metric results on disk.
+
+A metric's result on a dataset is determined by the metric's class and
+parameters, the dataset's metadata record, and the leaderboard files the
+metric reads. The cache key is a hash of exactly those inputs, so results
+are shared across Metric and Dataset objects and across processes. Changing
+one metric's parameter misses only for that metric, and a refreshed
+metadata record or a new leaderboard dump misses on its own.
+
+Entries are JSON files under a sharded directory. A hit refreshes the
+entry's modification time, and writes evict the least recently used
+entries once the directory grows past its size limit.
+
+Environment variables:
+    METRIC_CACHE: "disk" (default) or "off"
+    METRIC_CACHE_PATH: Cache directory (default results/metric_cache/)
+    METRIC_CACHE_MAX_MB: Size limit in megabytes (default 256)
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+import threading
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Tuple, Union
+
+if TYPE_CHECKING:
+    from analyzer.src.metrics.base import Dataset, Leaderboard, Metric
+
+PROJECT_ROOT = Path(__file__).resolve().parents[3]
+DEFAULT_CACHE_PATH = PROJECT_ROOT / "results" / "metric_cache"
+DEFAULT_MAX_MB = 256
+
+# Bump when the key layout or the stored format changes
+CACHE_VERSION = 1
+
+def _json_default(value: Any) -> Any:
+    # numpy scalars and arrays, plus anything else metrics may return
+    if hasattr(value, "tolist"):
+        return value.tolist()
+    return str(value)
+
+
+def _digest(value: Any) -> str:
+    encoded = json.dumps(value, sort_keys=True, default=_json_default)
+    return hashlib.sha256(encoded.encode("utf-8")).hexdigest()
+
+
+def file_fingerprint(path: str) -> Optional[List[Any]]:
+    """
+    Identify a file's contents by its resolved path, size and modification time.
+
+    Args:
+        path: File path
+
+    Returns:
+        [path, size, mtime_ns], or None if the file doesn't exist
+    """
+    resolved = os.path.realpath(path)
+    try:
+        stat = os.stat(resolved)
+    except OSError:
+        return None
+    return [resolved, stat.st_size, stat.st_mtime_ns]
+
+
+def target_fingerprint(target: Union["Dataset", "Leaderboard"]) -> str:
+    """
+    Hash what a metric can read from a dataset or leaderboard.
+
+    A dataset is identified by its class, name and metadata record. A
+    leaderboard is identified by its class, name and the fingerprints of
+    its datasets.
+
+    Args:
+        target: Dataset or leaderboard
+
+    Returns:
+        str: Hex digest
+    """
+    datasets = getattr(target, "datasets", None)
+    if isinstance(datasets, dict):
+        content = sorted(target_fingerprint(dataset) for dataset in datasets.values())
+    else:
+        metadata = getattr(target, "metadata", None)
+        content = [
+            getattr(target, "hf_dataset_id", None),
+            metadata.to_dict() if metadata is not None else None,
+        ]
+    return _digest([target.__class__.__name__, target.name, content])
+
+
+def result_key(metric: "Metric", target: Union["Dataset", "Leaderboard"]) -> str:
+    """
+    Build the cache key for one metric on one dataset or leaderboard.
+
+    Args:
+        metric: The metric
+        target: Dataset or leaderboard it runs on
+
+    Returns:
+        str: Hex digest of the metric class, parameters, target and input files
+    """
+    cls = metric.__class__
+    return _digest(
+        {
+            "version": CACHE_VERSION,
+            "metric": f"{cls.__module__}.{cls.__qualname__}",
+            "params": metric.cache_params(),
+            "files": [file_fingerprint(path) for path in metric.cache_files()],
+            "target": target_fingerprint(target),
+        }
+    )
+
+
+class ResultCache:
+    """
+    Directory of {key: JSON value} entries with a least-recently-used size limit.
+
+    Each entry is one file, written through a temporary file and an atomic
+    rename. Several processes can share a directory, but only this process's
+    view of the directory size is used for eviction.
+    """
+
+    def __init__(self, directory: Optional[str] = None, max_bytes: Optional[int] = None):
+        """
+        Initialize the cache. The directory is created on first write.
+
+        Args:
+            directory: Cache directory (defaults to METRIC_CACHE_PATH or results/)
+            max_bytes: Size limit (defaults to METRIC_CACHE_MAX_MB, or 256 MB)
+        """
+        if directory is None:
+            directory = os.environ.get("METRIC_CACHE_PATH", str(DEFAULT_CACHE_PATH))
+        if max_bytes is None:
+            max_bytes = int(float(os.environ.get("METRIC_CACHE_MAX_MB", DEFAULT_MAX_MB)) * 1024 * 1024)
+        self.directory = str(directory)
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._sizes: Optional[Dict[str, int]] = None
+        self._lock = threading.Lock()
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, key[:2], f"{key}.json")
+
+    def _load_sizes(self) -> Dict[str, int]:
+        if self._sizes is None:
+            sizes = {}
+            if os.path.isdir(self.directory):
+                for shard in os.scandir(self.directory):
+                    if shard.is_dir():
+                        for entry in os.scandir(shard.path):
+                            if entry.name.endswith(".json"):
+                                sizes[entry.path] = entry.stat().st_size
+            self._sizes = sizes
+        return self._sizes
+
+    def get(self, key: str, default: Any = None) -> Any:
+        """
+        Get a cached value and mark it as recently used.
+
+        Args:
+            key: Cache key
+            default: Value returned on a miss
+
+        Returns:
+            The cached value, or `default`
+        """
+        path = self._path(key)
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                value = json.load(f)["value"]
+            os.utime(path)
+        except FileNotFoundError:
+            self.misses += 1
+            return default
+        except (OSError, ValueError, KeyError) as e:
+            print(f"Warning: Ignoring unreadable cache entry {path}: {e}")
+            self.misses += 1
+            return default
+        self.hits += 1
+        return value
+
+    def set(self, key: str, value: Any) -> bool:
+        """
+        Store a value, evicting least recently used entries if over the limit.
+
+        Values that wouldn't read back equal from JSON (tuples, non-string
+        keys, NaN, arbitrary objects) are not stored.
+
+        Args:
+            key: Cache key
+            value: Value to store
+
+        Returns:
+            bool: Whether the value was stored
+        """
+        path = self._path(key)
+        encoded = json.dumps({"value": value}, default=_json_default)
+        try:
+            if json.loads(encoded)["value"] != value:
+                return False
+        except ValueError:  # ambiguous comparison, e.g. an array
+            return False
+        directory = os.path.dirname(path)
+        os.makedirs(directory, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                f.write(encoded)
+            os.replace(tmp_path, path)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+        with self._lock:
+            sizes = self._load_sizes()
+            sizes[path] = len(encoded.encode("utf-8"))
+            if sum(sizes.values()) > self.max_bytes:
+                self._evict(sizes)
+        return True
+
+    def _evict(self, sizes: Dict[str, int]) -> None:
+        # Oldest modification time first; hits refresh it, so this is LRU
+        by_age: List[Tuple[float, str]] = []
+        for path in sizes:
+            try:
+                by_age.append((os.stat(path).st_mtime, path))
+            except FileNotFoundError:
+                pass
+        by_age.sort()
+        total = sum(sizes.values())
+        for _, path in by_age:
+            if total <= self.max_bytes:
+                break
+            try:
+                os.unlink(path)
+            except FileNotFoundError:
+                pass
+            total -= sizes.pop(path)
+
+    def clear(self) -> None:
+        """Remove every entry."""
+        with self._lock:
+            for path in list(self._load_sizes()):
+                try:
+                    os.unlink(path)
+                except FileNotFoundError:
+                    pass
+            self._sizes = {}
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._load_sizes())
+
+
+_default_cache: Optional[ResultCache] = None
+_default_lock = threading.Lock()
+
+
+def get_default_cache() -> Optional[ResultCache]:
+    """
+    Get the process-wide result cache configured from the environment.
+
+    Returns:
+        ResultCache, or None when METRIC_CACHE is "off"
+    """
+    global _default_cache
+    mode = os.environ.get("METRIC_CACHE", "disk").lower()
+    if mode == "off":
+        return None
+    if mode != "disk":
+        raise ValueError(f"Unknown METRIC_CACHE {mode!r}, expected 'disk' or 'off'")
+    with _default_lock:
+        if _default_cache is None:
+            _default_cache = ResultCache()
+        return _default_cache
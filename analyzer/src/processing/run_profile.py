@@ -0,0 +1,380 @@
+"""
+Per-stage timing and memory profile of a run.
+
+Code marks its expensive stages with `stage()` (or the `profiled()`
+decorator). While a profiler is active, each stage records its wall time,
+CPU time, call count and the process's peak RSS. Stats are aggregated by
+(stage, metric, dataset). With no active profiler, a stage costs one
+context-variable lookup.
+
+    from analyzer.src.processing.run_profile import profile_run, stage
+
+    with profile_run("results/run_profile.json", trace_path="results/run_trace.json"):
+        with stage("parse_jsonl"):
+            ...
+
+Stages nest. A stage that doesn't name a metric or dataset inherits them
+from the enclosing stage, so a JSONL parse triggered by a metric is charged
+to that metric. A parent's time includes its children's. CPU time is the
+running thread's, so stages on worker threads don't count each other's work.
+Peak RSS is process-wide: `peak_rss_mb` is the high-water mark when the
+stage ended, and `rss_growth_mb` is how much the stage raised it.
+
+Stages run in pool workers record into a profiler of their own, which the
+runner merges into the run's profile (see analyzer.src.automation.runner).
+
+The profile is written as JSON, one entry per (stage, metric, dataset),
+sorted by wall time. The optional trace holds one event per call in Chrome
+trace format; open it in chrome://tracing or https://ui.perfetto.dev.
+
+Environment variables:
+    ANALYZER_PROFILE: Write a run profile here (registry runs)
+    ANALYZER_TRACE: Write a Chrome trace here (registry runs)
+"""
+
+import functools
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager, nullcontext
+from contextvars import ContextVar
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+try:
+    import resource
+except ImportError:  # not available on Windows
+    resource = None
+
+# Calls kept for the trace; the aggregated stats cover every call regardless
+MAX_TRACE_EVENTS = 200_000
+
+StageKey = Tuple[str, Optional[str], Optional[str]]
+
+_active: ContextVar[Optional["RunProfiler"]] = ContextVar("analyzer_run_profiler", default=None)
+# (metric, dataset) of the enclosing stage, inherited by nested stages
+_scope: ContextVar[Tuple[Optional[str], Optional[str]]] = ContextVar(
+    "analyzer_run_profile_scope", default=(None, None)
+)
+_NO_STAGE = nullcontext()
+
+
+def _max_rss_kb() -> int:
+    if resource is None:
+        return 0
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+
+class RunProfiler:
+    """
+    Collects stage stats and trace events for one run. Thread-safe.
+    """
+
+    def __init__(self, max_events: int = MAX_TRACE_EVENTS):
+        """
+        Initialize an empty profile.
+
+        Args:
+            max_events: Calls kept for the Chrome trace
+        """
+        self.max_events = max_events
+        self.started_at = datetime.now(timezone.utc).isoformat(timespec="seconds")
+        self.origin_ns = time.perf_counter_ns()
+        # key -> [calls, wall_seconds, cpu_seconds, peak_rss_kb, rss_growth_kb]
+        self.stats: Dict[StageKey, List[float]] = {}
+        # (stage, metric, dataset, start_ns, duration_ns, cpu_seconds, pid, tid)
+        self.events: List[Tuple[Any, ...]] = []
+        self.dropped_events = 0
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def stage(self, name: str, metric: Optional[str] = None, dataset: Optional[str] = None) -> Iterator[None]:
+        """
+        Time a stage.
+
+        Args:
+            name: Stage name, e.g. "parse_jsonl"
+            metric: Metric name (default: the enclosing stage's)
+            dataset: Dataset name (default: the enclosing stage's)
+        """
+        parent_metric, parent_dataset = _scope.get()
+        metric = metric if metric is not None else parent_metric
+        dataset = dataset if dataset is not None else parent_dataset
+        token = _scope.set((metric, dataset))
+        rss_start = _max_rss_kb()
+        cpu_start = time.thread_time()
+        start_ns = time.perf_counter_ns()
+        try:
+            yield
+        finally:
+            duration_ns = time.perf_counter_ns() - start_ns
+            cpu = time.thread_time() - cpu_start
+            rss_end = _max_rss_kb()
+            _scope.reset(token)
+            self.record(name, metric, dataset, start_ns, duration_ns, cpu, rss_end, rss_end - rss_start)
+
+    def record(
+        self,
+        name: str,
+        metric: Optional[str],
+        dataset: Optional[str],
+        start_ns: int,
+        duration_ns: int,
+        cpu_seconds: float,
+        peak_rss_kb: int,
+        rss_growth_kb: int,
+    ) -> None:
+        """
+        Add one call of a stage.
+
+        Args:
+            name: Stage name
+            metric: Metric name or None
+            dataset: Dataset name or None
+            start_ns: time.perf_counter_ns() at the start
+            duration_ns: Wall time in nanoseconds
+            cpu_seconds: CPU time of the running thread
+            peak_rss_kb: Process peak RSS when the stage ended
+            rss_growth_kb: How much the stage raised the peak RSS
+        """
+        key = (name, metric, dataset)
+        with self._lock:
+            entry = self.stats.get(key)
+            if entry is None:
+                entry = self.stats[key] = [0, 0.0, 0.0, 0, 0]
+            entry[0] += 1
+            entry[1] += duration_ns / 1e9
+            entry[2] += cpu_seconds
+            entry[3] = max(entry[3], peak_rss_kb)
+            entry[4] += rss_growth_kb
+            if len(self.events) < self.max_events:
+                self.events.append(
+                    (name, metric, dataset, start_ns, duration_ns, cpu_seconds, os.getpid(), threading.get_ident())
+                )
+            else:
+                self.dropped_events += 1
+
+    def activate(self):
+        """
+        Make this the active profiler within a `with` block.
+
+        Returns:
+            Context manager
+        """
+        return _activated(self)
+
+    def snapshot(self) -> Dict[str, Any]:
+        """
+        Get the collected stats and events in a picklable form, for merge().
+
+        Returns:
+            Dict with "stats", "events" and "dropped_events"
+        """
+        with self._lock:
+            return {
+                "stats": {key: list(entry) for key, entry in self.stats.items()},
+                "events": list(self.events),
+                "dropped_events": self.dropped_events,
+            }
+
+    def merge(self, snapshot: Dict[str, Any]) -> None:
+        """
+        Add another profiler's snapshot, e.g. from a pool worker.
+
+        Args:
+            snapshot: Result of RunProfiler.snapshot()
+        """
+        with self._lock:
+            for key, (calls, wall, cpu, peak, growth) in snapshot["stats"].items():
+                entry = self.stats.get(key)
+                if entry is None:
+                    entry = self.stats[key] = [0, 0.0, 0.0, 0, 0]
+                entry[0] += calls
+                entry[1] += wall
+                entry[2] += cpu
+                entry[3] = max(entry[3], peak)
+                entry[4] += growth
+            room = max(self.max_events - len(self.events), 0)
+            self.events.extend(snapshot["events"][:room])
+            self.dropped_events += snapshot["dropped_events"] + max(len(snapshot["events"]) - room, 0)
+
+    def summary(self) -> List[Dict[str, Any]]:
+        """
+        Get the per-(stage, metric, dataset) stats, slowest first.
+
+        Returns:
+            List of dicts with stage, metric, dataset, calls, wall_seconds,
+            cpu_seconds, peak_rss_mb and rss_growth_mb
+        """
+        with self._lock:
+            items = list(self.stats.items())
+        rows = [
+            {
+                "stage": name,
+                "metric": metric,
+                "dataset": dataset,
+                "calls": calls,
+                "wall_seconds": round(wall, 6),
+                "cpu_seconds": round(cpu, 6),
+                "peak_rss_mb": round(peak / 1024, 1),
+                "rss_growth_mb": round(growth / 1024, 1),
+            }
+            for (name, metric, dataset), (calls, wall, cpu, peak, growth) in items
+        ]
+        rows.sort(key=lambda row: row["wall_seconds"], reverse=True)
+        return rows
+
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Build the run profile.
+
+        Returns:
+            Dict with run-level fields and the per-stage summary
+        """
+        return {
+            "started_at": self.started_at,
+            "wall_seconds": round((time.perf_counter_ns() - self.origin_ns) / 1e9, 6),
+            "peak_rss_mb": round(_max_rss_kb() / 1024, 1),
+            "pid": os.getpid(),
+            "stages": self.summary(),
+        }
+
+    def write_json(self, path: str) -> None:
+        """
+        Write the run profile as JSON.
+
+        Args:
+            path: Output file
+        """
+        _write_json(path, self.to_dict())
+
+    def write_chrome_trace(self, path: str) -> None:
+        """
+        Write one complete ("X") event per recorded call in Chrome trace format.
+
+        Args:
+            path: Output file
+        """
+        with self._lock:
+            events = list(self.events)
+            dropped = self.dropped_events
+        trace_events = [
+            {
+                "name": name if metric is None else f"{name} {metric}",
+                "cat": name,
+                "ph": "X",
+                "ts": (start_ns - self.origin_ns) / 1000,
+                "dur": duration_ns / 1000,
+                "pid": pid,
+                "tid": tid,
+                "args": {"metric": metric, "dataset": dataset, "cpu_seconds": round(cpu, 6)},
+            }
+            for name, metric, dataset, start_ns, duration_ns, cpu, pid, tid in events
+        ]
+        _write_json(path, {"traceEvents": trace_events, "otherData": {"dropped_events": dropped}})
+
+
+@contextmanager
+def _activated(profiler: RunProfiler) -> Iterator[RunProfiler]:
+    token = _active.set(profiler)
+    try:
+        yield profiler
+    finally:
+        _active.reset(token)
+
+
+def _write_json(path: str, value: Any) -> None:
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    with open(path + ".tmp", "w", encoding="utf-8") as f:
+        json.dump(value, f, indent=2)
+    os.replace(path + ".tmp", path)
+
+
+def get_profiler() -> Optional[RunProfiler]:
+    """
+    Get the active profiler.
+
+    Returns:
+        RunProfiler, or None when profiling is off
+    """
+    return _active.get()
+
+
+def stage(name: str, metric: Optional[str] = None, dataset: Optional[str] = None):
+    """
+    Time a stage on the active profiler; does nothing when profiling is off.
+
+    Args:
+        name: Stage name
+        metric: Metric name (default: the enclosing stage's)
+        dataset: Dataset name (default: the enclosing stage's)
+
+    Returns:
+        Context manager
+    """
+    profiler = _active.get()
+    if profiler is None:
+        return _NO_STAGE
+    return profiler.stage(name, metric, dataset)
+
+
+def profiled(name: str) -> Callable[[Callable], Callable]:
+    """
+    Decorator that runs a function as a stage.
+
+    Args:
+        name: Stage name
+
+    Returns:
+        Decorator
+    """
+
+    def decorator(func: Callable) -> Callable:
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            profiler = _active.get()
+            if profiler is None:
+                return func(*args, **kwargs)
+            with profiler.stage(name):
+                return func(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
+
+
+@contextmanager
+def profile_run(
+    json_path: Optional[str] = None, trace_path: Optional[str] = None
+) -> Iterator[RunProfiler]:
+    """
+    Profile everything in a `with` block and write the results at the end.
+
+    Nested inside another active profile, the block records into that one
+    and writes nothing itself.
+
+    Args:
+        json_path: Write the run profile here (None to skip)
+        trace_path: Write a Chrome trace here (None to skip)
+
+    Yields:
+        RunProfiler
+    """
+    outer = _active.get()
+    if outer is not None:
+        yield outer
+        return
+    profiler = RunProfiler()
+    with profiler.activate():
+        try:
+            yield profiler
+        finally:
+            if json_path:
+                profiler.write_json(json_path)
+                print(f"✓ Run profile written to {json_path}")
+            if trace_path:
+                profiler.write_chrome_trace(trace_path)
+                print(f"✓ Chrome trace written to {trace_path}")
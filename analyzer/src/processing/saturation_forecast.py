@@ -0,0 +1,570 @@
+"""
+Forecast when benchmarks will cross S_index thresholds.
+
+The temporal saturation metric reports time_to_saturation only once it has
+happened. This stage reads the stored trajectories (see trajectory_store.py),
+fits a growth curve to each evaluation's cumulative s1 and s5 series, and
+projects the date at which S_index will cross each threshold, with a
+prediction interval.
+
+Two growth curves with a ceiling c are fitted:
+
+- logistic: s(t) = c / (1 + exp(-(b0 + b1 t)))
+- exponential approach to the ceiling: s(t) = c - exp(b0 + b1 t)
+
+For a fixed c both are linear in t after a transform (log(s / (c - s)) and
+log(c - s)), so (b0, b1) has a closed-form weighted least-squares solution.
+The ceiling is profiled over a grid between the best observed score and 1,
+keeping the c with the smallest squared error on the original scale. With
+model="best", the curve with the smaller error is kept per series. Every
+series of every evaluation is fitted at once as NumPy array operations, in
+chunks of rows. SciPy is not needed.
+
+Projected s1 and s5 curves never fall below the scores already reached,
+and s5 never exceeds s1. S_index follows from them on a time grid up to
+the horizon. Prediction intervals come from redrawing the fit: a ceiling
+by its profile weight over the grid, then (b0, b1) from their
+least-squares covariance at that ceiling. They are percentiles of the
+drawn crossing dates. Draws are seeded per chunk, so results are
+reproducible for a given seed and chunk size.
+
+The intervals cover the uncertainty of the fit, widened for the
+autocorrelation of the step-shaped residuals. On simulated leaderboards the
+point forecasts were unbiased, but the intervals covered the realized date
+less often than their nominal level, so read them as a lower bound on the
+uncertainty.
+
+By default every registered leaderboard's output_dir is read.
+
+Usage:
+    python -m analyzer.src.processing.saturation_forecast
+    python -m analyzer.src.processing.saturation_forecast --thresholds 0.5 0.7 --horizon-days 1095
+    python -m analyzer.src.processing.saturation_forecast --output-dir results/saturation_trajectories \\
+        --output-dir other_results/saturation_trajectories
+"""
+
+import argparse
+import json
+import os
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Sequence
+
+import numpy as np
+
+from analyzer.src.metrics.dynamic.saturation_utils import compute_r_norm_batch
+from analyzer.src.processing.trajectory_store import METADATA_FILE, TrajectoryStore
+
+PROJECT_ROOT = Path(__file__).resolve().parents[3]
+DEFAULT_OUTPUT_PATH = PROJECT_ROOT / "results" / "saturation_forecast.csv"
+
+GROWTH_MODELS = ("logistic", "exponential")
+MODEL_CHOICES = GROWTH_MODELS + ("best",)
+DEFAULT_THRESHOLDS = (0.3, 0.7, 0.9)
+
+# Ceilings tried per series, spread between the best observed score and 1
+CEILING_GRID = 16
+_CEILING_MARGIN = 1e-3
+# Scores are clipped away from 0 so the logistic transform stays finite
+_MIN_SCORE = 1e-6
+# Distinct dates needed for a fit with a residual variance
+MIN_POINTS = 3
+# Cap on the residual autocorrelation used to widen intervals
+_MAX_AUTOCORRELATION = 0.99
+
+_TRAJECTORY_SUFFIX = "_saturation_trajectory"
+
+
+def _transform(model: str, y: np.ndarray, c: np.ndarray) -> np.ndarray:
+    if model == "logistic":
+        return np.log(y / (c - y))
+    return np.log(c - y)
+
+
+def _curve(model: str, c: np.ndarray, intercept: np.ndarray, slope: np.ndarray, t: np.ndarray) -> np.ndarray:
+    u = intercept + slope * t
+    if model == "logistic":
+        return c / (1 + np.exp(-u))
+    return c - np.exp(u)
+
+
+def _fit_model(model: str, t: np.ndarray, y: np.ndarray, w: np.ndarray) -> Dict[str, np.ndarray]:
+    """Fit one growth curve to (rows x points) series at every ceiling of the grid."""
+    y_max = np.max(np.where(w > 0, y, -np.inf), axis=1)
+    cap = np.maximum(1.0, y_max) + _CEILING_MARGIN
+    fractions = np.linspace(0, 1, CEILING_GRID + 1)[1:]
+    ceilings = y_max[:, None] + (cap - y_max)[:, None] * fractions  # (rows, grid)
+
+    with np.errstate(invalid="ignore", divide="ignore", over="ignore"):
+        u = _transform(model, y[:, None, :], ceilings[:, :, None])  # (rows, grid, points)
+        u = np.where(w[:, None, :] > 0, u, 0.0)
+        sw = w.sum(axis=1)[:, None]
+        st = (w * t).sum(axis=1)[:, None]
+        stt = (w * t * t).sum(axis=1)[:, None]
+        su = (w[:, None, :] * u).sum(axis=2)
+        stu = (w[:, None, :] * t[:, None, :] * u).sum(axis=2)
+        den = sw * stt - st**2
+        slope = (sw * stu - st * su) / den
+        intercept = (su - slope * st) / sw
+
+        fitted = _curve(model, ceilings[:, :, None], intercept[:, :, None], slope[:, :, None], t[:, None, :])
+        sse = (w[:, None, :] * (y[:, None, :] - fitted) ** 2).sum(axis=2)
+        sse = np.where(np.isfinite(sse), sse, np.inf)
+
+        # Covariance of (b0, b1) at every ceiling, from the transformed residuals.
+        # Cumulative top scores move in steps, so residuals are strongly
+        # autocorrelated; the variance is inflated by (1 + rho) / (1 - rho)
+        # for their lag-1 autocorrelation rho
+        residual = w[:, None, :] * (u - (intercept[:, :, None] + slope[:, :, None] * t[:, None, :]))
+        squares = (residual**2).sum(axis=2)
+        rho = np.clip((residual[:, :, 1:] * residual[:, :, :-1]).sum(axis=2) / squares, 0, _MAX_AUTOCORRELATION)
+        inflation = (1 + rho) / (1 - rho)
+        sigma2 = squares / (sw - 2) * inflation
+        scale = sigma2 / den
+        cov = np.empty(ceilings.shape + (2, 2))
+        cov[..., 0, 0] = scale * stt
+        cov[..., 0, 1] = cov[..., 1, 0] = -scale * st
+        cov[..., 1, 1] = scale * sw
+
+        # Profile weights of the ceilings: exp(-(SSE - min SSE) / (2 sigma^2)),
+        # with sigma^2 from the best fit's 3 parameters, inflated as above
+        best = np.argmin(sse, axis=1)
+        best_sse = sse.min(axis=1, keepdims=True)
+        best_inflation = np.take_along_axis(inflation, best[:, None], axis=1)
+        noise = np.maximum(best_sse / np.maximum(sw - 3, 1) * best_inflation, 1e-300)
+        weights = np.exp(-(sse - best_sse) / (2 * noise))
+        weights = np.where(np.isfinite(cov).all(axis=(2, 3)), weights, 0.0)
+        weights /= weights.sum(axis=1, keepdims=True)
+
+    valid = (
+        (sw[:, 0] >= MIN_POINTS) & (den[:, 0] > 0)
+        & np.isfinite(sse[np.arange(len(best)), best])
+        & np.isfinite(weights).all(axis=1)
+    )
+    return {
+        "best": best,
+        "ceilings": ceilings,
+        "intercepts": intercept,
+        "slopes": slope,
+        "covs": cov,
+        "ceiling_weights": weights,
+        "sse": sse[np.arange(len(best)), best],
+        "valid": valid,
+    }
+
+
+def fit_growth_curves(
+    t,
+    y,
+    mask,
+    model: str = "best",
+) -> Dict[str, np.ndarray]:
+    """
+    Fit a growth curve with a ceiling to many score series at once.
+
+    Args:
+        t: (rows x points) times, e.g. days since the first submission
+        y: (rows x points) scores in [0, 1]
+        mask: (rows x points) booleans, False for padding
+        model: "logistic", "exponential" or "best" (smaller error per row)
+
+    Returns:
+        Dictionary of per-row arrays:
+            - model_code: Index into GROWTH_MODELS
+            - ceiling, intercept, slope: Best-fitting c, b0 and b1
+            - sse: Squared error of that fit on the score scale
+            - valid: Whether the row had at least MIN_POINTS distinct
+              times and a finite fit
+        and of (rows x CEILING_GRID) arrays for drawing forecasts:
+            - ceilings, intercepts, slopes: Fit at every ceiling of the grid
+            - covs: Covariance of (b0, b1) at every ceiling (extra 2 x 2 axes)
+            - ceiling_weights: Profile weight of every ceiling, summing to 1
+    """
+    if model not in MODEL_CHOICES:
+        raise ValueError(f"Unknown growth model {model!r}, expected one of {MODEL_CHOICES}")
+    t = np.asarray(t, dtype=np.float64)
+    w = np.asarray(mask, dtype=np.float64)
+    y = np.clip(np.asarray(y, dtype=np.float64), _MIN_SCORE, None)
+    # Padding must stay finite through the transforms; its weight is 0
+    y = np.where(w > 0, y, np.max(np.where(w > 0, y, 0), axis=1, keepdims=True) / 2 + _MIN_SCORE)
+
+    models = GROWTH_MODELS if model == "best" else (model,)
+    fits = [_fit_model(name, t, y, w) for name in models]
+    errors = np.stack([np.where(fit["valid"], fit["sse"], np.inf) for fit in fits])
+    choice = np.argmin(errors, axis=0)
+    result = {
+        name: np.choose(choice.reshape((-1,) + (1,) * (fits[0][name].ndim - 1)), [fit[name] for fit in fits])
+        for name in fits[0]
+    }
+    rows = np.arange(len(choice))
+    best = result.pop("best")
+    result["model_code"] = np.array([GROWTH_MODELS.index(models[i]) for i in choice], dtype=np.int8)
+    result["ceiling"] = result["ceilings"][rows, best]
+    result["intercept"] = result["intercepts"][rows, best]
+    result["slope"] = result["slopes"][rows, best]
+    return result
+
+
+def _project(fit: Dict[str, np.ndarray], ceiling: np.ndarray, intercept: np.ndarray, slope: np.ndarray, t: np.ndarray) -> np.ndarray:
+    # ceiling/intercept/slope are (rows x draws); t is (rows x steps)
+    projected = np.empty(intercept.shape + t.shape[1:])
+    with np.errstate(over="ignore", invalid="ignore"):
+        for code, model in enumerate(GROWTH_MODELS):
+            rows = fit["model_code"] == code
+            if rows.any():
+                projected[rows] = _curve(
+                    model,
+                    ceiling[rows][:, :, None],
+                    intercept[rows][:, :, None],
+                    slope[rows][:, :, None],
+                    t[rows][:, None, :],
+                )
+    return projected
+
+
+def _draw_parameters(fit: Dict[str, np.ndarray], draws: int, rng: np.random.Generator):
+    """Best fit first, then draws of (c, b0, b1), each (rows x 1 + draws)."""
+    rows = np.arange(len(fit["ceiling"]))[:, None]
+    # Ceiling by its profile weight, then (b0, b1) from N(beta, cov) at that
+    # ceiling via a 2x2 Cholesky factor
+    cdf = np.cumsum(fit["ceiling_weights"], axis=1)
+    grid = (rng.random((len(rows), draws))[:, :, None] > cdf[:, None, :]).sum(axis=2)
+    grid = np.minimum(grid, cdf.shape[1] - 1)
+    cov = fit["covs"][rows, grid]
+    l11 = np.sqrt(np.maximum(cov[..., 0, 0], 0))
+    l21 = np.divide(cov[..., 1, 0], l11, out=np.zeros_like(l11), where=l11 > 0)
+    l22 = np.sqrt(np.maximum(cov[..., 1, 1] - l21**2, 0))
+    eps = rng.standard_normal((len(rows), draws, 2))
+    intercept = fit["intercepts"][rows, grid] + l11 * eps[..., 0]
+    slope = fit["slopes"][rows, grid] + l21 * eps[..., 0] + l22 * eps[..., 1]
+    return (
+        np.concatenate([fit["ceiling"][:, None], fit["ceilings"][rows, grid]], axis=1),
+        np.concatenate([fit["intercept"][:, None], intercept], axis=1),
+        np.concatenate([fit["slope"][:, None], slope], axis=1),
+    )
+
+
+def forecast_crossing_days(
+    fit_s1: Dict[str, np.ndarray],
+    fit_s5: Dict[str, np.ndarray],
+    t_last,
+    s1_last,
+    s5_last,
+    n,
+    thresholds: Sequence[float] = DEFAULT_THRESHOLDS,
+    horizon_days: int = 730,
+    step_days: int = 7,
+    alpha: float = 0.5,
+    draws: int = 100,
+    confidence: float = 0.9,
+    rng: Optional[np.random.Generator] = None,
+) -> Dict[str, np.ndarray]:
+    """
+    Project S_index forward from fitted s1 and s5 curves and find threshold crossings.
+
+    Args:
+        fit_s1: fit_growth_curves result for the s1 series
+        fit_s5: fit_growth_curves result for the s5 series (same rows)
+        t_last: Time of the last observation per row
+        s1_last: Last observed s1 per row
+        s5_last: Last observed s5 per row
+        n: Test set size per row
+        thresholds: S_index thresholds in (0, 1]
+        horizon_days: How far past the last observation to look
+        step_days: Spacing of the projection grid
+        alpha: Exponent for effective sample size
+        draws: Parameter draws for the prediction interval (0 for none)
+        confidence: Coverage of the prediction interval
+        rng: Generator for the draws
+
+    Returns:
+        Dictionary of (rows x thresholds) arrays, in days after t_last
+        (inf when there is no crossing within the horizon):
+            - days: Crossing of the best-fitting curves
+            - days_low, days_high: Prediction interval (NaN without draws)
+            - probability: Share of draws crossing within the horizon
+    """
+    if not 0 < confidence < 1:
+        raise ValueError(f"Confidence must be in (0, 1), got {confidence}")
+    if any(not 0 < threshold <= 1 for threshold in thresholds):
+        raise ValueError(f"Thresholds must be in (0, 1], got {list(thresholds)}")
+    rng = rng if rng is not None else np.random.default_rng()
+    steps = np.arange(step_days, horizon_days + 1, step_days, dtype=np.float64)
+    t = np.asarray(t_last, dtype=np.float64)[:, None] + steps
+    s1_last = np.asarray(s1_last, dtype=np.float64)[:, None, None]
+    s5_last = np.asarray(s5_last, dtype=np.float64)[:, None, None]
+
+    # Cumulative top scores never go down, and the 5th never passes the top
+    # (fmax also replaces overflowed NaN projections with the last score)
+    s1 = _project(fit_s1, *_draw_parameters(fit_s1, draws, rng), t)
+    s1 = np.clip(np.fmax(s1, s1_last), 0, 1)
+    s5 = _project(fit_s5, *_draw_parameters(fit_s5, draws, rng), t)
+    s5 = np.minimum(np.clip(np.fmax(s5, s5_last), 0, 1), s1)
+    # S_index >= threshold exactly when r_norm^2 <= -ln(threshold)
+    r_norm = compute_r_norm_batch(s1, s5, np.asarray(n, dtype=np.float64)[:, None, None], alpha=alpha)
+    r_squared = r_norm**2
+
+    tail = (1 - confidence) / 2
+    shape = (r_norm.shape[0], len(thresholds))
+    result = {name: np.full(shape, np.nan) for name in ("days", "days_low", "days_high", "probability")}
+    for k, threshold in enumerate(thresholds):
+        hit = r_squared <= -np.log(threshold)
+        crossed = hit.any(axis=2)
+        days = np.where(crossed, steps[hit.argmax(axis=2)], np.inf)
+        result["days"][:, k] = days[:, 0]
+        if draws:
+            ordered = np.sort(days[:, 1:], axis=1)
+            result["days_low"][:, k] = ordered[:, int(np.floor(tail * (draws - 1)))]
+            result["days_high"][:, k] = ordered[:, int(np.ceil((1 - tail) * (draws - 1)))]
+            result["probability"][:, k] = crossed[:, 1:].mean(axis=1)
+    valid = fit_s1["valid"] & fit_s5["valid"]
+    for values in result.values():
+        values[~valid] = np.nan
+    return result
+
+
+def discover_trajectories(output_dirs: Iterable[str]) -> List[str]:
+    """
+    Find stored trajectories.
+
+    Args:
+        output_dirs: Directories the temporal saturation metric writes to
+
+    Returns:
+        Parquet trajectory directories, plus JSON trajectory files for
+        evaluations without a Parquet one, sorted by path
+    """
+    found = []
+    for output_dir in output_dirs:
+        if not os.path.isdir(output_dir):
+            print(f"Warning: Trajectory directory {output_dir} not found")
+            continue
+        names = set(os.listdir(output_dir))
+        for name in sorted(names):
+            path = os.path.join(output_dir, name)
+            if name.endswith(_TRAJECTORY_SUFFIX) and os.path.exists(os.path.join(path, METADATA_FILE)):
+                found.append(path)
+            elif name.endswith(_TRAJECTORY_SUFFIX + ".json") and name[: -len(".json")] not in names:
+                found.append(path)
+    return found
+
+
+def load_trajectory_series(path: str) -> Dict[str, Any]:
+    """
+    Load the columns a forecast needs from a stored trajectory.
+
+    Args:
+        path: Parquet trajectory directory or JSON trajectory file
+
+    Returns:
+        Dict with the evaluation name, parameters, and arrays of
+        window_end_date, s1, s5 and S_index in window order
+    """
+    columns = ["window_end_date", "s1", "s5", "S_index"]
+    if os.path.isdir(path):
+        store = TrajectoryStore(path)
+        metadata = store.read_metadata()
+        if metadata is None:
+            raise FileNotFoundError(f"No trajectory in {path}")
+        table = store.read(columns, metadata=metadata)
+        values = {name: table.column(name).to_numpy(zero_copy_only=False) for name in columns}
+        test_set_size = metadata["test_set_size"]
+    else:
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        metadata, windows = data["metadata"], data["trajectory"]
+        values = {name: np.array([window[name] for window in windows]) for name in columns}
+        test_set_size = windows[0]["test_set_size"] if windows else None
+    return {
+        "path": path,
+        "evaluation_name": metadata["evaluation_name"],
+        "test_set_size": test_set_size,
+        "alpha": metadata["alpha"],
+        **values,
+    }
+
+
+def _daily_points(series: Dict[str, Any]):
+    # The last window of each date carries that day's cumulative top scores
+    dates = series["window_end_date"].astype("datetime64[D]")
+    last = np.r_[np.flatnonzero(dates[1:] != dates[:-1]), len(dates) - 1]
+    days = (dates[last] - dates[0]).astype(np.float64)
+    return dates[0], days, series["s1"][last], series["s5"][last]
+
+
+def _pad(rows: List[np.ndarray]) -> np.ndarray:
+    padded = np.zeros((len(rows), max(len(row) for row in rows)))
+    for i, row in enumerate(rows):
+        padded[i, : len(row)] = row
+    return padded
+
+
+def _to_date(start: np.datetime64, days: float) -> Optional[str]:
+    if not np.isfinite(days):
+        return None
+    return str(start + np.timedelta64(int(days), "D"))
+
+
+def forecast_saturation(
+    output_dirs: Optional[Iterable[str]] = None,
+    thresholds: Sequence[float] = DEFAULT_THRESHOLDS,
+    horizon_days: int = 730,
+    step_days: int = 7,
+    model: str = "best",
+    draws: int = 100,
+    confidence: float = 0.9,
+    seed: Optional[int] = 0,
+    chunk_rows: int = 64,
+) -> List[Dict[str, Any]]:
+    """
+    Forecast threshold crossings for every stored trajectory.
+
+    Args:
+        output_dirs: Trajectory directories (defaults to every registered
+            leaderboard's output_dir)
+        thresholds: S_index thresholds
+        horizon_days: How far past each evaluation's last submission to look
+        step_days: Resolution of the projected dates
+        model: "logistic", "exponential" or "best"
+        draws: Parameter draws per evaluation for the prediction interval
+        confidence: Coverage of the prediction interval
+        seed: Seed for the draws (None for fresh entropy)
+        chunk_rows: Evaluations processed together
+
+    Returns:
+        One row per (evaluation, threshold). status is "crossed" (observed,
+        crossing_date is the first window at or above the threshold),
+        "forecast" (projected within the horizon), "beyond_horizon" or
+        "insufficient_data".
+    """
+    if output_dirs is None:
+        # Imported here so explicit directories don't need the registry
+        from analyzer.src.automation.registry import list_output_dirs
+
+        output_dirs = list_output_dirs()
+
+    series = []
+    for path in discover_trajectories(output_dirs):
+        try:
+            loaded = load_trajectory_series(path)
+        except (OSError, ValueError, KeyError) as e:
+            print(f"Warning: Skipping unreadable trajectory {path}: {e}")
+            continue
+        if len(loaded["window_end_date"]):
+            series.append(loaded)
+
+    rows: List[Dict[str, Any]] = []
+    # Similar lengths share a chunk to keep padding small; alpha is a scalar
+    # in the kernel, so chunks never mix alphas
+    series.sort(key=lambda s: (s["alpha"], len(s["window_end_date"])))
+    chunks: List[List[Dict[str, Any]]] = []
+    for item in series:
+        if chunks and len(chunks[-1]) < chunk_rows and chunks[-1][0]["alpha"] == item["alpha"]:
+            chunks[-1].append(item)
+        else:
+            chunks.append([item])
+    seeds = np.random.SeedSequence(seed).spawn(len(chunks))
+
+    for chunk, chunk_seed in zip(chunks, seeds):
+        points = [_daily_points(item) for item in chunk]
+        lengths = np.array([len(days) for _, days, _, _ in points])
+        mask = np.arange(lengths.max())[None, :] < lengths[:, None]
+        t = _pad([days for _, days, _, _ in points])
+        fit_s1 = fit_growth_curves(t, _pad([s1 for _, _, s1, _ in points]), mask, model)
+        fit_s5 = fit_growth_curves(t, _pad([s5 for _, _, _, s5 in points]), mask, model)
+        t_last = np.array([days[-1] for _, days, _, _ in points])
+        forecast = forecast_crossing_days(
+            fit_s1,
+            fit_s5,
+            t_last,
+            [s1[-1] for _, _, s1, _ in points],
+            [s5[-1] for _, _, _, s5 in points],
+            [item["test_set_size"] for item in chunk],
+            thresholds=thresholds,
+            horizon_days=horizon_days,
+            step_days=step_days,
+            alpha=chunk[0]["alpha"],
+            draws=draws,
+            confidence=confidence,
+            rng=np.random.default_rng(chunk_seed),
+        )
+
+        for i, item in enumerate(chunk):
+            start = points[i][0]
+            last_date = str(item["window_end_date"][-1])
+            running_max = np.maximum.accumulate(item["S_index"])
+            fitted = bool(fit_s1["valid"][i] and fit_s5["valid"][i])
+            for k, threshold in enumerate(thresholds):
+                row = {
+                    "evaluation_name": item["evaluation_name"],
+                    "trajectory_path": item["path"],
+                    "threshold": threshold,
+                    "latest_date": last_date,
+                    "latest_S_index": float(item["S_index"][-1]),
+                    "model_s1": GROWTH_MODELS[fit_s1["model_code"][i]] if fitted else None,
+                    "model_s5": GROWTH_MODELS[fit_s5["model_code"][i]] if fitted else None,
+                    "ceiling_s1": float(fit_s1["ceiling"][i]) if fitted else None,
+                    "ceiling_s5": float(fit_s5["ceiling"][i]) if fitted else None,
+                    "crossing_date": None,
+                    "crossing_date_low": None,
+                    "crossing_date_high": None,
+                    "crossing_probability": None,
+                }
+                observed = int(np.searchsorted(running_max, threshold, side="left"))
+                if observed < len(running_max):
+                    row["status"] = "crossed"
+                    row["crossing_date"] = str(item["window_end_date"][observed])
+                    row["crossing_probability"] = 1.0
+                elif not fitted:
+                    row["status"] = "insufficient_data"
+                else:
+                    offset = t_last[i]
+                    days = forecast["days"][i, k]
+                    row["status"] = "forecast" if np.isfinite(days) else "beyond_horizon"
+                    row["crossing_date"] = _to_date(start, offset + days)
+                    row["crossing_date_low"] = _to_date(start, offset + forecast["days_low"][i, k])
+                    row["crossing_date_high"] = _to_date(start, offset + forecast["days_high"][i, k])
+                    probability = forecast["probability"][i, k]
+                    row["crossing_probability"] = float(probability) if np.isfinite(probability) else None
+                rows.append(row)
+    return rows
+
+
+def main():
+    """CLI entry point."""
+    parser = argparse.ArgumentParser(description="Forecast S_index threshold crossings from stored trajectories")
+    parser.add_argument(
+        "--output-dir",
+        action="append",
+        help="Trajectory directory; repeat for several (default: every registered leaderboard's output_dir)",
+    )
+    parser.add_argument("--thresholds", type=float, nargs="+", default=list(DEFAULT_THRESHOLDS), help="S_index thresholds")
+    parser.add_argument("--horizon-days", type=int, default=730, help="Days past the last submission to project")
+    parser.add_argument("--step-days", type=int, default=7, help="Resolution of projected dates in days")
+    parser.add_argument("--model", choices=MODEL_CHOICES, default="best", help="Growth curve")
+    parser.add_argument("--draws", type=int, default=100, help="Parameter draws for prediction intervals")
+    parser.add_argument("--confidence", type=float, default=0.9, help="Prediction interval coverage")
+    parser.add_argument("--seed", type=int, default=0, help="Seed for the draws")
+    parser.add_argument("--output", default=str(DEFAULT_OUTPUT_PATH), help="Output CSV path")
+    args = parser.parse_args()
+
+    rows = forecast_saturation(
+        output_dirs=args.output_dir,
+        thresholds=args.thresholds,
+        horizon_days=args.horizon_days,
+        step_days=args.step_days,
+        model=args.model,
+        draws=args.draws,
+        confidence=args.confidence,
+        seed=args.seed,
+    )
+    # Imported here so library callers don't pay for pandas
+    import pandas as pd
+
+    os.makedirs(os.path.dirname(args.output) or ".", exist_ok=True)
+    pd.DataFrame(rows).to_csv(args.output, index=False)
+    evaluations = len({row["trajectory_path"] for row in rows})
+    print(f"✓ Forecast {evaluations} evaluations to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,493 @@
+"""
+Async Semantic Scholar client for bulk paper lookups.
+
+Papers are fetched through the batch endpoint (`POST /paper/batch`, up to
+500 ids per request) over one pooled aiohttp session. Requests go through a
+token bucket sized for the API-key tier and are retried with exponential
+backoff on 429 and 5xx responses. Responses are kept in a persistent TTL
+cache, so re-running over the same papers makes no requests.
+
+The annotation sheet names benchmarks by paper title rather than id.
+Titles are resolved once through the title-match endpoint and the ids are
+kept in the cache, so later refreshes of the sheet's citation counts are a
+single batch request.
+
+Environment variables:
+    SEMANTIC_SCHOLAR_API_KEY: API key (raises the rate limit)
+    SEMANTIC_SCHOLAR_BASE_URL: API root, e.g. a local stub server for tests
+    SEMANTIC_SCHOLAR_RPS: Requests per second, overriding the tier default
+    SEMANTIC_SCHOLAR_CACHE_PATH: Response cache file
+        (default data/cache/semantic_scholar.json)
+
+Usage:
+    python -m analyzer.src.processing.semantic_scholar <paper id or URL> ...
+    python -m analyzer.src.processing.semantic_scholar --annotations data/manual_annotation_data.csv \
+        --output results/annotation_citations.csv
+"""
+
+import argparse
+import asyncio
+import csv
+import os
+import random
+import threading
+import time
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional, Sequence, TypeVar
+from urllib.parse import urlparse
+
+from analyzer.src.processing.disk_cache import JsonDiskCache
+
+DEFAULT_BASE_URL = "https://api.semanticscholar.org/graph/v1"
+DEFAULT_CACHE_PATH = Path(__file__).resolve().parents[3] / "data" / "cache" / "semantic_scholar.json"
+DEFAULT_TTL_DAYS = 7.0
+
+# Requests per second by tier: the shared unauthenticated pool is heavily
+# throttled, introductory API keys get 1 request per second
+TIER_REQUESTS_PER_SECOND = {"unauthenticated": 0.3, "api_key": 1.0}
+
+BATCH_SIZE = 500
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+ANNOTATION_NAME_COLUMN = "Name"
+ANNOTATION_CITATION_COLUMN = "Paper Citations"
+
+T = TypeVar("T")
+
+
+def extract_paper_id(paper_url: str) -> Optional[str]:
+    """
+    Extract the paper ID from a Semantic Scholar URL.
+
+    Args:
+        paper_url: URL of the form https://www.semanticscholar.org/paper/{title}/{paperId}
+
+    Returns:
+        The paper ID, or None if the URL doesn't have that shape
+    """
+    path = urlparse(paper_url).path
+    parts = path.split("/")
+    if len(parts) >= 3 and parts[1] == "paper":
+        return parts[-1]
+    return None
+
+
+class TokenBucket:
+    """
+    Asyncio token bucket: `rate` tokens per second, bursting up to `capacity`.
+    """
+
+    def __init__(self, rate: float, capacity: float = 1.0):
+        if rate <= 0:
+            raise ValueError(f"Rate must be positive, got {rate}")
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = capacity
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self) -> None:
+        """Wait until a token is available and take it."""
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                await asyncio.sleep((1 - self._tokens) / self.rate)
+
+
+class SemanticScholarError(RuntimeError):
+    """Raised when a request still fails after all retries."""
+
+
+class SemanticScholarClient:
+    """
+    Pooled, rate-limited, cached client for the Semantic Scholar Graph API.
+
+    Use as an async context manager:
+
+        async with SemanticScholarClient() as client:
+            counts = await client.citation_counts(paper_ids)
+    """
+
+    def __init__(
+        self,
+        api_key: Optional[str] = None,
+        base_url: Optional[str] = None,
+        requests_per_second: Optional[float] = None,
+        max_retries: int = 5,
+        backoff_seconds: float = 1.0,
+        max_connections: int = 4,
+        cache_path: Optional[str] = None,
+        cache_ttl_days: float = DEFAULT_TTL_DAYS,
+        use_cache: bool = True,
+    ):
+        """
+        Initialize the client.
+
+        Args:
+            api_key: API key (defaults to SEMANTIC_SCHOLAR_API_KEY)
+            base_url: API root (defaults to SEMANTIC_SCHOLAR_BASE_URL or the public API)
+            requests_per_second: Rate limit (defaults to SEMANTIC_SCHOLAR_RPS or the tier default)
+            max_retries: Retries per request on 429/5xx and connection errors
+            backoff_seconds: Initial backoff, doubled on each retry
+            max_connections: Size of the connection pool
+            cache_path: Response cache file (defaults to SEMANTIC_SCHOLAR_CACHE_PATH or data/cache/)
+            cache_ttl_days: How long cached responses stay fresh
+            use_cache: Set False to always hit the API
+        """
+        self.api_key = os.getenv("SEMANTIC_SCHOLAR_API_KEY") if api_key is None else api_key
+        self.base_url = (base_url or os.getenv("SEMANTIC_SCHOLAR_BASE_URL") or DEFAULT_BASE_URL).rstrip("/")
+        if requests_per_second is None:
+            env_rate = os.getenv("SEMANTIC_SCHOLAR_RPS")
+            if env_rate:
+                requests_per_second = float(env_rate)
+            else:
+                tier = "api_key" if self.api_key else "unauthenticated"
+                requests_per_second = TIER_REQUESTS_PER_SECOND[tier]
+        self.requests_per_second = requests_per_second
+        self.max_retries = max_retries
+        self.backoff_seconds = backoff_seconds
+        self.max_connections = max_connections
+
+        self._cache: Optional[JsonDiskCache] = None
+        if use_cache:
+            cache_path = cache_path or os.getenv("SEMANTIC_SCHOLAR_CACHE_PATH") or str(DEFAULT_CACHE_PATH)
+            self._cache = JsonDiskCache(cache_path, ttl_seconds=cache_ttl_days * 86400)
+        self._session = None
+        self._bucket: Optional[TokenBucket] = None
+
+    async def __aenter__(self) -> "SemanticScholarClient":
+        # Imported here so code that never talks to the API doesn't need aiohttp
+        import aiohttp
+
+        headers = {"x-api-key": self.api_key} if self.api_key else {}
+        self._session = aiohttp.ClientSession(
+            headers=headers,
+            connector=aiohttp.TCPConnector(limit=self.max_connections),
+            timeout=aiohttp.ClientTimeout(total=60),
+        )
+        self._bucket = TokenBucket(self.requests_per_second)
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self._session.close()
+        self._session = None
+        if self._cache is not None:
+            self._cache.flush()
+
+    async def _request(self, method: str, path: str, **kwargs) -> Any:
+        import aiohttp
+
+        url = f"{self.base_url}{path}"
+        for attempt in range(self.max_retries + 1):
+            await self._bucket.acquire()
+            retry_after = None
+            try:
+                async with self._session.request(method, url, **kwargs) as response:
+                    if response.status not in RETRY_STATUSES:
+                        response.raise_for_status()
+                        return await response.json()
+                    error = f"HTTP {response.status}"
+                    retry_after = response.headers.get("Retry-After")
+            except aiohttp.ClientResponseError:
+                raise
+            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                error = repr(e)
+
+            if attempt == self.max_retries:
+                raise SemanticScholarError(f"{method} {url} failed after {attempt + 1} attempts: {error}")
+            try:
+                delay = float(retry_after)
+            except (TypeError, ValueError):
+                delay = self.backoff_seconds * 2**attempt * (1 + random.random() / 2)
+            await asyncio.sleep(delay)
+
+    async def _fetch_batch(self, paper_ids: List[str], fields: str) -> Dict[str, Optional[dict]]:
+        papers = await self._request(
+            "POST", "/paper/batch", params={"fields": fields}, json={"ids": paper_ids}
+        )
+        # The batch endpoint answers in request order, with null for unknown ids
+        results = dict(zip(paper_ids, papers))
+        if self._cache is not None:
+            for paper_id, paper in results.items():
+                self._cache.set(f"{fields}|{paper_id}", {"paper": paper}, persist=False)
+        return results
+
+    async def get_papers(
+        self, paper_ids: Iterable[str], fields: Sequence[str] = ("citationCount",)
+    ) -> Dict[str, Optional[dict]]:
+        """
+        Fetch paper records, batching everything that isn't cached.
+
+        Args:
+            paper_ids: Semantic Scholar paper IDs (or any ID form the API accepts)
+            fields: Paper fields to request
+
+        Returns:
+            Dict mapping each ID to its paper record, or None if the API doesn't know it
+        """
+        fields_param = ",".join(fields)
+        results: Dict[str, Optional[dict]] = {}
+        missing = []
+        for paper_id in dict.fromkeys(paper_ids):
+            cached = self._cache.get(f"{fields_param}|{paper_id}") if self._cache is not None else None
+            if cached is not None:
+                results[paper_id] = cached["paper"]
+            else:
+                missing.append(paper_id)
+
+        batches = [missing[i : i + BATCH_SIZE] for i in range(0, len(missing), BATCH_SIZE)]
+        for batch_results in await asyncio.gather(
+            *(self._fetch_batch(batch, fields_param) for batch in batches)
+        ):
+            results.update(batch_results)
+        if self._cache is not None:
+            self._cache.flush()
+        return results
+
+    async def citation_counts(self, paper_ids: Iterable[str]) -> Dict[str, Optional[int]]:
+        """
+        Fetch citation counts for many papers.
+
+        Args:
+            paper_ids: Semantic Scholar paper IDs
+
+        Returns:
+            Dict mapping each ID to its citation count (None if unknown)
+        """
+        papers = await self.get_papers(paper_ids, fields=("citationCount",))
+        return {
+            paper_id: (paper.get("citationCount", 0) if paper is not None else None)
+            for paper_id, paper in papers.items()
+        }
+
+    async def _match_title(self, title: str) -> Optional[str]:
+        import aiohttp
+
+        try:
+            response = await self._request(
+                "GET", "/paper/search/match", params={"query": title, "fields": "title"}
+            )
+        except aiohttp.ClientResponseError as e:
+            if e.status == 404:  # no paper matches the title
+                return None
+            raise
+        matches = response.get("data") or []
+        return matches[0].get("paperId") if matches else None
+
+    async def match_titles(self, titles: Iterable[str]) -> Dict[str, Optional[str]]:
+        """
+        Resolve paper titles to paper IDs.
+
+        A title's ID doesn't change, so resolved titles are served from the
+        cache however old the entry is. Unresolved titles are retried.
+
+        Args:
+            titles: Paper titles
+
+        Returns:
+            Dict mapping each title to its best-matching paper ID, or None
+        """
+        results: Dict[str, Optional[str]] = {}
+        missing = []
+        for title in dict.fromkeys(titles):
+            cached = self._cache.get(f"match|{title}", allow_stale=True) if self._cache is not None else None
+            if cached is not None:
+                results[title] = cached
+            else:
+                missing.append(title)
+
+        for title, paper_id in zip(missing, await asyncio.gather(*(self._match_title(t) for t in missing))):
+            results[title] = paper_id
+            if paper_id is not None and self._cache is not None:
+                self._cache.set(f"match|{title}", paper_id, persist=False)
+        if self._cache is not None:
+            self._cache.flush()
+        return results
+
+
+def _run_sync(make_coroutine: Callable[[], Awaitable[T]]) -> T:
+    # asyncio.run can't be called from a thread with a running loop (e.g. a
+    # notebook), so the coroutine then gets a loop on a thread of its own
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return asyncio.run(make_coroutine())
+
+    outcome: Dict[str, Any] = {}
+
+    def run():
+        try:
+            outcome["value"] = asyncio.run(make_coroutine())
+        except BaseException as e:
+            outcome["error"] = e
+
+    thread = threading.Thread(target=run)
+    thread.start()
+    thread.join()
+    if "error" in outcome:
+        raise outcome["error"]
+    return outcome["value"]
+
+
+async def citation_counts_async(paper_ids: Iterable[str], **client_kwargs) -> Dict[str, Optional[int]]:
+    """
+    Fetch citation counts with a client of its own; for use inside a running loop.
+
+    Args:
+        paper_ids: Semantic Scholar paper IDs
+        **client_kwargs: Passed to SemanticScholarClient
+
+    Returns:
+        Dict mapping each ID to its citation count (None if unknown)
+    """
+    async with SemanticScholarClient(**client_kwargs) as client:
+        return await client.citation_counts(paper_ids)
+
+
+def fetch_citation_counts(paper_ids: Iterable[str], **client_kwargs) -> Dict[str, Optional[int]]:
+    """
+    Synchronous wrapper around citation_counts_async.
+
+    Works with or without an event loop running in the calling thread.
+
+    Args:
+        paper_ids: Semantic Scholar paper IDs
+        **client_kwargs: Passed to SemanticScholarClient
+
+    Returns:
+        Dict mapping each ID to its citation count (None if unknown)
+    """
+    paper_ids = list(paper_ids)
+    return _run_sync(lambda: citation_counts_async(paper_ids, **client_kwargs))
+
+
+async def annotation_citation_counts_async(
+    rows: Sequence[Dict[str, str]],
+    name_column: str = ANNOTATION_NAME_COLUMN,
+    paper_column: Optional[str] = None,
+    **client_kwargs,
+) -> List[Optional[int]]:
+    """
+    Fetch citation counts for annotation sheet rows.
+
+    Rows are identified by a paper ID or URL in `paper_column` when given
+    and filled in, and by the title in `name_column` otherwise.
+
+    Args:
+        rows: Sheet rows as dicts
+        name_column: Column holding the paper title
+        paper_column: Column holding paper IDs or semanticscholar.org URLs
+        **client_kwargs: Passed to SemanticScholarClient
+
+    Returns:
+        One citation count per row (None where the paper wasn't found)
+    """
+    explicit_ids: List[Optional[str]] = []
+    for row in rows:
+        value = (row.get(paper_column) or "").strip() if paper_column else ""
+        explicit_ids.append((extract_paper_id(value) or value) if value else None)
+
+    async with SemanticScholarClient(**client_kwargs) as client:
+        titles = [
+            row.get(name_column, "").strip()
+            for row, paper_id in zip(rows, explicit_ids)
+            if paper_id is None and row.get(name_column, "").strip()
+        ]
+        matched = await client.match_titles(titles)
+        paper_ids = [
+            paper_id if paper_id is not None else matched.get(row.get(name_column, "").strip())
+            for row, paper_id in zip(rows, explicit_ids)
+        ]
+        counts = await client.citation_counts(pid for pid in paper_ids if pid)
+    return [counts.get(paper_id) if paper_id else None for paper_id in paper_ids]
+
+
+def refresh_annotation_citations(
+    csv_path: str,
+    output_path: str,
+    name_column: str = ANNOTATION_NAME_COLUMN,
+    citation_column: str = ANNOTATION_CITATION_COLUMN,
+    paper_column: Optional[str] = None,
+    **client_kwargs,
+) -> Dict[str, int]:
+    """
+    Write a copy of the annotation sheet with current citation counts.
+
+    Rows whose paper can't be found keep their previous count.
+
+    Args:
+        csv_path: Annotation sheet, e.g. data/manual_annotation_data.csv
+        output_path: CSV to write
+        name_column: Column holding the paper title
+        citation_column: Column to update
+        paper_column: Optional column of paper IDs or URLs, preferred over titles
+        **client_kwargs: Passed to SemanticScholarClient
+
+    Returns:
+        Dict with the number of rows "updated" and "not_found"
+    """
+    with open(csv_path, "r", encoding="utf-8", newline="") as f:
+        reader = csv.DictReader(f)
+        fieldnames = list(reader.fieldnames or [])
+        rows = list(reader)
+    if citation_column not in fieldnames:
+        fieldnames.append(citation_column)
+
+    counts = _run_sync(
+        lambda: annotation_citation_counts_async(
+            rows, name_column=name_column, paper_column=paper_column, **client_kwargs
+        )
+    )
+    report = {"updated": 0, "not_found": 0}
+    for row, count in zip(rows, counts):
+        if count is None:
+            print(f"Warning: No Semantic Scholar paper found for {row.get(name_column)!r}")
+            report["not_found"] += 1
+        else:
+            row[citation_column] = count
+            report["updated"] += 1
+
+    directory = os.path.dirname(output_path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    with open(output_path, "w", encoding="utf-8", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=fieldnames)
+        writer.writeheader()
+        writer.writerows(rows)
+    return report
+
+
+def main():
+    """CLI entry point."""
+    parser = argparse.ArgumentParser(description="Fetch citation counts from Semantic Scholar")
+    parser.add_argument("papers", nargs="*", help="Paper IDs or semanticscholar.org paper URLs")
+    parser.add_argument("--annotations", help="Annotation sheet CSV whose citation counts to refresh")
+    parser.add_argument("--output", help="Where to write the refreshed sheet (with --annotations)")
+    parser.add_argument("--paper-column", help="Sheet column of paper IDs or URLs (default: match titles)")
+    args = parser.parse_args()
+
+    if args.annotations:
+        if not args.output:
+            parser.error("--annotations needs --output")
+        report = refresh_annotation_citations(args.annotations, args.output, paper_column=args.paper_column)
+        print(
+            f"✓ Updated {report['updated']} rows ({report['not_found']} not found), "
+            f"written to {args.output}"
+        )
+        return
+    if not args.papers:
+        parser.error("give paper IDs or URLs, or --annotations")
+
+    paper_ids = {paper: extract_paper_id(paper) or paper for paper in args.papers}
+    counts = fetch_citation_counts(paper_ids.values())
+    for paper, paper_id in paper_ids.items():
+        print(f"{counts.get(paper_id)}\t{paper}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,247 @@
+"""
+Cached Hugging Face split-size lookups.
+
+Dataset adapters only need the number of examples per split, but asking the
+Hub for it (`datasets.get_dataset_config_info`) costs a network round trip
+per (dataset, config). Lookups are cached on disk keyed by
+(hf_dataset_id, config, revision) so repeated runs skip the Hub entirely.
+
+Environment variables:
+    ANALYZER_SPLIT_CACHE_PATH: Cache file (default data/cache/hf_split_sizes.json)
+    ANALYZER_SPLIT_CACHE_TTL_DAYS: Entry lifetime in days (default 30)
+    ANALYZER_OFFLINE: When truthy, serve only from the cache (no network).
+        HF_DATASETS_OFFLINE / HF_HUB_OFFLINE are honored the same way.
+
+Usage:
+    python -m analyzer.src.processing.split_sizes --invalidate cais/mmlu
+"""
+
+import argparse
+import os
+import threading
+from pathlib import Path
+from typing import Dict, Iterable, Optional
+
+from analyzer.src.processing.disk_cache import JsonDiskCache
+
+PROJECT_ROOT = Path(__file__).resolve().parents[3]
+DEFAULT_CACHE_PATH = PROJECT_ROOT / "data" / "cache" / "hf_split_sizes.json"
+DEFAULT_TTL_DAYS = 30.0
+
+OFFLINE_ENV_VARS = ("ANALYZER_OFFLINE", "HF_DATASETS_OFFLINE", "HF_HUB_OFFLINE")
+
+# Split preference when a dataset has more than one split
+EVAL_SPLIT_PRIORITY = ("test", "validation", "valid")
+
+
+class SplitSizeCacheMiss(LookupError):
+    """Raised in offline mode when a lookup is not in the cache."""
+
+
+def is_offline() -> bool:
+    """Whether offline mode is enabled through the environment."""
+    return any(
+        os.environ.get(var, "").strip().lower() in ("1", "true", "yes", "on")
+        for var in OFFLINE_ENV_VARS
+    )
+
+
+def _cache_key(hf_dataset_id: str, config_name: Optional[str], revision: Optional[str]) -> str:
+    return f"{hf_dataset_id}|{config_name or ''}|{revision or ''}"
+
+
+def _fetch_split_sizes(
+    hf_dataset_id: str, config_name: Optional[str], revision: Optional[str]
+) -> Dict[str, int]:
+    # Imported here so cached and offline runs never pay for `datasets`
+    from datasets import get_dataset_config_info
+
+    dataset_info = get_dataset_config_info(
+        hf_dataset_id, config_name=config_name, revision=revision
+    )
+    return {
+        split_name: split.num_examples
+        for split_name, split in dataset_info.splits.items()
+    }
+
+
+class SplitSizeCache:
+    """
+    Persistent cache of {split_name: num_examples} per dataset config.
+
+    Failed lookups are never cached, so a transient Hub error is retried on
+    the next run. In offline mode expired entries are still served, since
+    a stale size beats no size when the network is unavailable.
+    """
+
+    def __init__(
+        self,
+        path: Optional[str] = None,
+        ttl_days: Optional[float] = None,
+        offline: Optional[bool] = None,
+    ):
+        """
+        Initialize the cache.
+
+        Args:
+            path: Cache file (defaults to ANALYZER_SPLIT_CACHE_PATH or data/cache/)
+            ttl_days: Entry lifetime in days (defaults to ANALYZER_SPLIT_CACHE_TTL_DAYS or 30)
+            offline: Serve only from the cache (defaults to the environment)
+        """
+        if path is None:
+            path = os.environ.get("ANALYZER_SPLIT_CACHE_PATH", str(DEFAULT_CACHE_PATH))
+        if ttl_days is None:
+            ttl_days = float(os.environ.get("ANALYZER_SPLIT_CACHE_TTL_DAYS", DEFAULT_TTL_DAYS))
+        self.offline = offline
+        self._cache = JsonDiskCache(path, ttl_seconds=ttl_days * 86400)
+
+    @property
+    def path(self) -> str:
+        return self._cache.path
+
+    def _is_offline(self) -> bool:
+        return is_offline() if self.offline is None else self.offline
+
+    def get_split_sizes(
+        self,
+        hf_dataset_id: str,
+        config_name: Optional[str] = None,
+        revision: Optional[str] = None,
+    ) -> Dict[str, int]:
+        """
+        Get the number of examples in each split of a dataset config.
+
+        Args:
+            hf_dataset_id: Hugging Face dataset ID
+            config_name: Dataset config (None for the default config)
+            revision: Dataset revision (None for the default branch)
+
+        Returns:
+            Dict[str, int]: Examples per split name
+
+        Raises:
+            SplitSizeCacheMiss: In offline mode, if the lookup is not cached
+        """
+        key = _cache_key(hf_dataset_id, config_name, revision)
+        offline = self._is_offline()
+        sizes = self._cache.get(key, allow_stale=offline)
+        if sizes is not None:
+            return sizes
+        if offline:
+            raise SplitSizeCacheMiss(
+                f"No cached split sizes for {hf_dataset_id} (config={config_name}, "
+                f"revision={revision}) and offline mode is enabled"
+            )
+
+        sizes = _fetch_split_sizes(hf_dataset_id, config_name, revision)
+        self._cache.set(key, sizes)
+        return sizes
+
+    def invalidate(
+        self,
+        hf_dataset_id: Optional[str] = None,
+        config_name: Optional[str] = None,
+        revision: Optional[str] = None,
+    ) -> int:
+        """
+        Drop cached lookups.
+
+        Args:
+            hf_dataset_id: Dataset to drop (None clears the whole cache)
+            config_name: Only drop this config of the dataset
+            revision: Only drop this revision of the dataset
+
+        Returns:
+            int: Number of entries removed
+        """
+        if hf_dataset_id is None:
+            return self._cache.invalidate()
+
+        def matches(key: str) -> bool:
+            dataset_id, config, rev = key.rsplit("|", 2)
+            return (
+                dataset_id == hf_dataset_id
+                and (config_name is None or config == config_name)
+                and (revision is None or rev == revision)
+            )
+
+        return self._cache.invalidate(predicate=matches)
+
+
+_default_cache: Optional[SplitSizeCache] = None
+_default_lock = threading.Lock()
+
+
+def get_default_cache() -> SplitSizeCache:
+    """Get the process-wide split-size cache configured from the environment."""
+    global _default_cache
+    with _default_lock:
+        if _default_cache is None:
+            _default_cache = SplitSizeCache()
+        return _default_cache
+
+
+def get_split_sizes(
+    hf_dataset_id: str,
+    config_name: Optional[str] = None,
+    revision: Optional[str] = None,
+) -> Dict[str, int]:
+    """
+    Get examples per split through the process-wide cache.
+
+    Args:
+        hf_dataset_id: Hugging Face dataset ID
+        config_name: Dataset config (None for the default config)
+        revision: Dataset revision (None for the default branch)
+
+    Returns:
+        Dict[str, int]: Examples per split name
+    """
+    return get_default_cache().get_split_sizes(hf_dataset_id, config_name, revision)
+
+
+def eval_split_size(split_sizes: Dict[str, int], fallback_splits: Iterable[str] = ()) -> int:
+    """
+    Pick the evaluation split size the adapters report as total_samples.
+
+    A dataset with a single split uses it regardless of name. Otherwise the
+    first of test > validation > valid (then any `fallback_splits`) is used,
+    and train-only datasets count as 0.
+
+    Args:
+        split_sizes: Examples per split name
+        fallback_splits: Extra split names to try after the standard ones
+
+    Returns:
+        int: Number of examples in the chosen split
+    """
+    if len(split_sizes) == 1:
+        return next(iter(split_sizes.values()))
+    for split_name in (*EVAL_SPLIT_PRIORITY, *fallback_splits):
+        if split_name in split_sizes:
+            return split_sizes[split_name]
+    return 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Manage the Hugging Face split-size cache")
+    parser.add_argument(
+        "--invalidate",
+        nargs="?",
+        const="",
+        metavar="HF_DATASET_ID",
+        help="Drop cached entries for a dataset (or everything if no ID is given)",
+    )
+    parser.add_argument("--config", default=None, help="Only invalidate this config")
+    args = parser.parse_args()
+
+    cache = get_default_cache()
+    if args.invalidate is not None:
+        removed = cache.invalidate(args.invalidate or None, config_name=args.config)
+        print(f"Removed {removed} cached entries from {cache.path}")
+    else:
+        print(f"{cache.path}: {len(cache._cache)} cached entries")
+
+
+if __name__ == "__main__":
+    main()
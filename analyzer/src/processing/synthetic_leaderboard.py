@@ -0,0 +1,266 @@
+"""
+Seeded synthetic leaderboard dumps for benchmarking at scale.
+
+The real leaderboard files are tracked with Git LFS, and even they stop at a
+few thousand models. This module writes JSONL in the same schema the
+leaderboard adapters and metrics read:
+
+    {"model_info": {"name", "id", "developer", "inference_platform"},
+     "evaluation_results": [{"evaluation_name", "metric_config",
+                             "score_details": {"score"}}, ...],
+     "submission_date": "YYYY-MM-DD",
+     "additional_details": {"params_billions", "architecture", "precision"}}
+
+Scores follow a simple growth model, so the saturation metrics have
+something to find. Each model gets a latent ability that rises with its
+submission date. Each evaluation gets a difficulty, a chance-level floor
+and a ceiling. A score is the evaluation's range scaled by a logistic of
+ability minus difficulty, plus noise. Not every model reports every
+evaluation, a small share of records has no submission date, and records
+are written in random date order, like the real dumps.
+
+The same seed always gives the same file. Records are drawn and written in
+batches, so 10^7 records take no more memory than 10^5.
+
+Usage:
+    python -m analyzer.src.processing.synthetic_leaderboard --records 100000 --output /tmp/lb.jsonl
+    python -m analyzer.src.processing.synthetic_leaderboard --records 1000000 --leaderboard helm --output /tmp/helm.jsonl
+"""
+
+import argparse
+import json
+from datetime import date, timedelta
+from typing import Dict, Iterator, List, Optional, Sequence
+
+import numpy as np
+
+DEFAULT_EVALUATIONS = ("BBH", "GPQA", "MMLU-PRO", "MUSR", "IFEval", "MATH Level 5")
+DEFAULT_START_DATE = "2023-01-01"
+DEFAULT_END_DATE = "2025-06-30"
+BATCH_SIZE = 65536
+
+ARCHITECTURES = (
+    "LlamaForCausalLM",
+    "Qwen2ForCausalLM",
+    "MistralForCausalLM",
+    "Gemma2ForCausalLM",
+    "Phi3ForCausalLM",
+    "MixtralForCausalLM",
+)
+PRECISIONS = ("bfloat16", "float16", "float32")
+PARAM_SIZES = (0.5, 1.5, 3, 7, 8, 13, 14, 32, 70, 72)
+NUM_DEVELOPERS = 500
+
+
+def leaderboard_evaluations(leaderboard_id: str) -> List[str]:
+    """
+    Get the evaluation names a registered leaderboard reads.
+
+    Args:
+        leaderboard_id: Leaderboard id, e.g. "hf_openllm_v2"
+
+    Returns:
+        List[str]: The `eval_name` of each configured dataset
+    """
+    # Imported here so generating with explicit names doesn't load the registry
+    from analyzer.src.automation.registry import load_config
+
+    config = load_config(leaderboard_id)
+    return [spec["eval_name"] for spec in config["datasets"] if spec.get("eval_name")]
+
+
+class SyntheticLeaderboard:
+    """
+    Generator of synthetic leaderboard records.
+
+    Evaluation parameters are drawn from the seed once, in the constructor;
+    records are drawn batch by batch from the same stream afterwards.
+    """
+
+    def __init__(
+        self,
+        evaluations: Sequence[str] = DEFAULT_EVALUATIONS,
+        seed: int = 0,
+        start_date: str = DEFAULT_START_DATE,
+        end_date: str = DEFAULT_END_DATE,
+        coverage: float = 0.85,
+        missing_date_rate: float = 0.01,
+        noise: float = 0.03,
+    ):
+        """
+        Initialize the generator.
+
+        Args:
+            evaluations: Evaluation names to emit
+            seed: Random seed
+            start_date: Earliest submission date (ISO)
+            end_date: Latest submission date (ISO)
+            coverage: Probability that a model reports a given evaluation
+            missing_date_rate: Share of records without a submission_date
+            noise: Standard deviation of the per-score noise (score units)
+        """
+        if not evaluations:
+            raise ValueError("Need at least one evaluation name")
+        if not 0.0 < coverage <= 1.0:
+            raise ValueError(f"coverage must be in (0, 1], got {coverage}")
+        self.evaluations = list(evaluations)
+        self.seed = seed
+        self.start = date.fromisoformat(start_date)
+        self.num_days = (date.fromisoformat(end_date) - self.start).days + 1
+        if self.num_days < 1:
+            raise ValueError(f"end_date {end_date} is before start_date {start_date}")
+        self.coverage = coverage
+        self.missing_date_rate = missing_date_rate
+        self.noise = noise
+
+        self._rng = np.random.default_rng(seed)
+        count = len(self.evaluations)
+        self.difficulty = self._rng.uniform(-1.0, 1.5, count)
+        self.floor = self._rng.uniform(0.0, 0.25, count)
+        self.ceiling = self._rng.uniform(0.85, 0.98, count)
+
+        self._dates = [(self.start + timedelta(days=day)).isoformat() for day in range(self.num_days)]
+        # Everything about an evaluation entry but its score, encoded once
+        self._eval_prefixes = [
+            '{"evaluation_name": %s, "metric_config": {"evaluation_description": %s, '
+            '"lower_is_better": false, "score_type": "continuous", "min_score": 0, '
+            '"max_score": 1}, "score_details": {"score": '
+            % (json.dumps(name), json.dumps(f"Synthetic {name} accuracy"))
+            for name in self.evaluations
+        ]
+
+    def _draw_batch(self, start_index: int, size: int) -> Dict[str, np.ndarray]:
+        rng = self._rng
+        day = rng.integers(0, self.num_days, size)
+        progress = day / max(self.num_days - 1, 1)
+        ability = 3.0 * progress - 1.5 + rng.normal(0.0, 1.0, size)
+        logits = 1.5 * (ability[:, None] - self.difficulty[None, :])
+        scores = self.floor + (self.ceiling - self.floor) / (1.0 + np.exp(-logits))
+        scores = np.clip(scores + rng.normal(0.0, self.noise, scores.shape), 0.0, 1.0)
+        reported = rng.random(scores.shape) < self.coverage
+        # Every record reports at least one evaluation
+        empty = ~reported.any(axis=1)
+        reported[empty, rng.integers(0, len(self.evaluations), int(empty.sum()))] = True
+        return {
+            "index": np.arange(start_index, start_index + size),
+            "day": day,
+            "dated": rng.random(size) >= self.missing_date_rate,
+            "developer": rng.integers(0, NUM_DEVELOPERS, size),
+            "params": rng.integers(0, len(PARAM_SIZES), size),
+            "architecture": rng.integers(0, len(ARCHITECTURES), size),
+            "precision": rng.integers(0, len(PRECISIONS), size),
+            "scores": np.round(scores, 4),
+            "reported": reported,
+        }
+
+    def _format_batch(self, batch: Dict[str, np.ndarray]) -> Iterator[str]:
+        columns = [batch[key].tolist() for key in (
+            "index", "day", "dated", "developer", "params", "architecture", "precision", "scores", "reported"
+        )]
+        prefixes = self._eval_prefixes
+        for index, day, dated, developer, params, architecture, precision, scores, reported in zip(*columns):
+            name = f"model-{index:08d}"
+            org = f"org-{developer:03d}"
+            results = ", ".join(
+                f"{prefixes[e]}{scores[e]}}}}}" for e in range(len(prefixes)) if reported[e]
+            )
+            date_field = f', "submission_date": "{self._dates[day]}"' if dated else ""
+            yield (
+                f'{{"model_info": {{"name": "{name}", "id": "{org}/{name}", "developer": "{org}", '
+                f'"inference_platform": "unknown"}}, "evaluation_results": [{results}]{date_field}, '
+                f'"additional_details": {{"params_billions": {PARAM_SIZES[params]}, '
+                f'"architecture": "{ARCHITECTURES[architecture]}", "precision": "{PRECISIONS[precision]}"}}}}\n'
+            )
+
+    def iter_lines(self, num_records: int, batch_size: int = BATCH_SIZE) -> Iterator[str]:
+        """
+        Generate JSONL lines.
+
+        Args:
+            num_records: Number of records (lines)
+            batch_size: Records drawn per batch
+
+        Yields:
+            str: One JSON record, newline-terminated
+        """
+        for start in range(0, num_records, batch_size):
+            size = min(batch_size, num_records - start)
+            yield from self._format_batch(self._draw_batch(start, size))
+
+    def write(self, path: str, num_records: int, batch_size: int = BATCH_SIZE) -> int:
+        """
+        Write a JSONL dump.
+
+        Args:
+            path: Output file
+            num_records: Number of records
+            batch_size: Records drawn and written per batch
+
+        Returns:
+            int: Bytes written
+        """
+        written = 0
+        with open(path, "w", encoding="utf-8") as f:
+            for start in range(0, num_records, batch_size):
+                size = min(batch_size, num_records - start)
+                chunk = "".join(self._format_batch(self._draw_batch(start, size)))
+                f.write(chunk)
+                written += len(chunk)
+        return written
+
+
+def write_synthetic_leaderboard(
+    path: str,
+    num_records: int,
+    evaluations: Optional[Sequence[str]] = None,
+    seed: int = 0,
+    **kwargs,
+) -> int:
+    """
+    Write a seeded synthetic leaderboard JSONL file.
+
+    Args:
+        path: Output file
+        num_records: Number of records (models)
+        evaluations: Evaluation names (default: the hf_openllm_v2 ones)
+        seed: Random seed
+        **kwargs: Other SyntheticLeaderboard options
+
+    Returns:
+        int: Bytes written
+    """
+    generator = SyntheticLeaderboard(evaluations or DEFAULT_EVALUATIONS, seed=seed, **kwargs)
+    return generator.write(path, num_records)
+
+
+def main():
+    """CLI entry point."""
+    parser = argparse.ArgumentParser(description="Write a synthetic leaderboard JSONL dump")
+    parser.add_argument("--records", type=int, required=True, help="Number of records (models)")
+    parser.add_argument("--output", required=True, help="Output JSONL file")
+    parser.add_argument("--seed", type=int, default=0, help="Random seed (default 0)")
+    group = parser.add_mutually_exclusive_group()
+    group.add_argument("--leaderboard", help="Use a registered leaderboard's evaluation names")
+    group.add_argument("--evaluations", nargs="+", help="Evaluation names (default: hf_openllm_v2's)")
+    parser.add_argument("--start-date", default=DEFAULT_START_DATE, help="Earliest submission date")
+    parser.add_argument("--end-date", default=DEFAULT_END_DATE, help="Latest submission date")
+    parser.add_argument("--coverage", type=float, default=0.85, help="Chance a model reports an evaluation")
+    args = parser.parse_args()
+
+    evaluations = args.evaluations
+    if args.leaderboard:
+        evaluations = leaderboard_evaluations(args.leaderboard)
+    written = write_synthetic_leaderboard(
+        args.output,
+        args.records,
+        evaluations=evaluations,
+        seed=args.seed,
+        start_date=args.start_date,
+        end_date=args.end_date,
+        coverage=args.coverage,
+    )
+    print(f"✓ Wrote {args.records:,} records ({written / 1e6:.1f} MB) to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
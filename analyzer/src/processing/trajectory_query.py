@@ -0,0 +1,267 @@
+"""
+Point-in-time queries over stored saturation trajectories.
+
+TemporalSaturationMetric writes one trajectory per evaluation (see
+trajectory_store.py). This module answers questions about them without
+recomputing anything:
+
+- as_of: the window in effect on a date (the last one ending on or before it)
+- between: every window ending within a date range
+- first_crossing: the first window whose S_index reaches any threshold
+
+Window end dates never decrease along a trajectory, so they serve as a
+sorted date index and date lookups are binary searches. For first crossings,
+a running maximum of S_index is kept next to it. It never decreases either,
+so the first window reaching a threshold is found by a binary search too.
+Each query takes O(log n) plus the size of its answer.
+
+Indexes are built once per trajectory and reused until the trajectory
+changes on disk, so dashboards can issue many queries cheaply:
+
+    from analyzer.src.processing.trajectory_query import TrajectoryQuery
+    query = TrajectoryQuery("results/saturation_trajectories")
+    query.as_of("MMLU-PRO", "2024-06-01")["S_index"]
+    query.first_crossing("MMLU-PRO", 0.5)
+
+Usage:
+    python -m analyzer.src.processing.trajectory_query MMLU-PRO --as-of 2024-06-01
+    python -m analyzer.src.processing.trajectory_query BBH --first-crossing 0.5
+    python -m analyzer.src.processing.trajectory_query BBH --between 2024-01-01 2024-03-31
+"""
+
+import argparse
+import json
+import os
+import threading
+from datetime import date, datetime
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+import numpy as np
+
+from analyzer.src.processing.trajectory_store import (
+    METADATA_FILE,
+    TrajectoryStore,
+    trajectory_path,
+)
+
+DateLike = Union[str, date, datetime]
+
+
+def _normalize_date(value: DateLike) -> str:
+    # Trajectory dates are ISO strings, which sort like the dates they name
+    if isinstance(value, datetime):
+        return value.date().isoformat()
+    if isinstance(value, date):
+        return value.isoformat()
+    return date.fromisoformat(str(value)[:10]).isoformat()
+
+
+class TrajectoryIndex:
+    """
+    Sorted date index over one evaluation's trajectory.
+
+    Parquet trajectories hold every window. JSON trajectories hold every
+    sampling_interval-th window, so their answers are only as fine as the
+    sampling.
+    """
+
+    def __init__(self, path: str):
+        """
+        Load a trajectory and build its index.
+
+        Args:
+            path: Parquet trajectory directory or JSON trajectory file
+
+        Raises:
+            FileNotFoundError: If there is no trajectory at the path
+        """
+        self.path = path
+        if os.path.isdir(path):
+            store = TrajectoryStore(path)
+            self.metadata = store.read_metadata()
+            if self.metadata is None:
+                raise FileNotFoundError(f"No trajectory in {path}")
+            # Converted once here so each query is a plain list lookup
+            self._windows: List[Dict[str, Any]] = store.read(metadata=self.metadata).to_pylist()
+        else:
+            with open(path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            self.metadata = data["metadata"]
+            self._windows = data["trajectory"]
+
+        self.end_dates = np.array([window["window_end_date"] for window in self._windows], dtype=str)
+        s_index = np.array([window["S_index"] for window in self._windows], dtype=np.float64)
+        # Running maximum: entry i is the highest S_index of windows 0..i
+        self.max_s_index = np.maximum.accumulate(s_index) if len(s_index) else s_index
+
+    def __len__(self) -> int:
+        return len(self.end_dates)
+
+    def as_of(self, when: DateLike) -> Optional[Dict[str, Any]]:
+        """
+        Get the window in effect on a date.
+
+        Args:
+            when: Date (ISO string, date or datetime)
+
+        Returns:
+            The last window ending on or before the date, or None if the
+            trajectory starts later
+        """
+        position = int(np.searchsorted(self.end_dates, _normalize_date(when), side="right")) - 1
+        if position < 0:
+            return None
+        return self._windows[position]
+
+    def between(self, start: DateLike, end: DateLike) -> List[Dict[str, Any]]:
+        """
+        Get the windows ending within a date range.
+
+        Args:
+            start: First date, inclusive
+            end: Last date, inclusive
+
+        Returns:
+            List of windows in date order
+        """
+        lo = int(np.searchsorted(self.end_dates, _normalize_date(start), side="left"))
+        hi = int(np.searchsorted(self.end_dates, _normalize_date(end), side="right"))
+        return self._windows[lo:hi]
+
+    def first_crossing(self, threshold: float) -> Optional[Dict[str, Any]]:
+        """
+        Get the first window whose S_index reaches a threshold.
+
+        Args:
+            threshold: S_index threshold, e.g. 0.7 for time-to-saturation
+
+        Returns:
+            The first window with S_index >= threshold, or None if none reaches it
+        """
+        position = int(np.searchsorted(self.max_s_index, threshold, side="left"))
+        if position >= len(self.max_s_index):
+            return None
+        return self._windows[position]
+
+
+class TrajectoryQuery:
+    """
+    Queries across the trajectories in an output directory.
+
+    Each evaluation's index is built on its first query and kept until the
+    trajectory's metadata (or JSON file) changes on disk. Thread-safe.
+    """
+
+    def __init__(self, output_dir: str = "results/saturation_trajectories"):
+        """
+        Initialize the query layer.
+
+        Args:
+            output_dir: Directory the temporal saturation metric writes to
+        """
+        self.output_dir = output_dir
+        self._indexes: Dict[str, Tuple[int, TrajectoryIndex]] = {}
+        self._lock = threading.Lock()
+
+    def _locate(self, eval_name: str) -> Tuple[str, str]:
+        # Prefer the Parquet trajectory; fall back to a JSON one
+        directory = trajectory_path(self.output_dir, eval_name)
+        stamp_file = os.path.join(directory, METADATA_FILE)
+        if os.path.exists(stamp_file):
+            return directory, stamp_file
+        json_file = trajectory_path(self.output_dir, eval_name, ".json")
+        if os.path.exists(json_file):
+            return json_file, json_file
+        raise FileNotFoundError(f"No trajectory for {eval_name!r} in {self.output_dir}")
+
+    def index(self, eval_name: str) -> TrajectoryIndex:
+        """
+        Get the index for an evaluation, loading it if it is new or changed.
+
+        Args:
+            eval_name: Evaluation name, e.g. "MMLU-PRO"
+
+        Returns:
+            TrajectoryIndex
+
+        Raises:
+            FileNotFoundError: If the evaluation has no stored trajectory
+        """
+        path, stamp_file = self._locate(eval_name)
+        mtime = os.stat(stamp_file).st_mtime_ns
+        with self._lock:
+            cached = self._indexes.get(eval_name)
+            if cached is not None and cached[0] == mtime and cached[1].path == path:
+                return cached[1]
+            index = TrajectoryIndex(path)
+            self._indexes[eval_name] = (mtime, index)
+            return index
+
+    def as_of(self, eval_name: str, when: DateLike) -> Optional[Dict[str, Any]]:
+        """
+        Get the window in effect for an evaluation on a date.
+
+        Args:
+            eval_name: Evaluation name
+            when: Date (ISO string, date or datetime)
+
+        Returns:
+            The last window ending on or before the date, or None
+        """
+        return self.index(eval_name).as_of(when)
+
+    def between(self, eval_name: str, start: DateLike, end: DateLike) -> List[Dict[str, Any]]:
+        """
+        Get an evaluation's windows ending within a date range.
+
+        Args:
+            eval_name: Evaluation name
+            start: First date, inclusive
+            end: Last date, inclusive
+
+        Returns:
+            List of windows in date order
+        """
+        return self.index(eval_name).between(start, end)
+
+    def first_crossing(self, eval_name: str, threshold: float) -> Optional[Dict[str, Any]]:
+        """
+        Get an evaluation's first window whose S_index reaches a threshold.
+
+        Args:
+            eval_name: Evaluation name
+            threshold: S_index threshold
+
+        Returns:
+            The first window with S_index >= threshold, or None
+        """
+        return self.index(eval_name).first_crossing(threshold)
+
+
+def main():
+    """CLI entry point."""
+    parser = argparse.ArgumentParser(description="Query stored saturation trajectories")
+    parser.add_argument("evaluation", help="Evaluation name, e.g. MMLU-PRO")
+    parser.add_argument(
+        "--output-dir",
+        default="results/saturation_trajectories",
+        help="Trajectory directory (default: results/saturation_trajectories)",
+    )
+    group = parser.add_mutually_exclusive_group(required=True)
+    group.add_argument("--as-of", metavar="DATE", help="Window in effect on DATE")
+    group.add_argument("--between", nargs=2, metavar=("START", "END"), help="Windows ending in [START, END]")
+    group.add_argument("--first-crossing", type=float, metavar="THRESHOLD", help="First window with S_index >= THRESHOLD")
+    args = parser.parse_args()
+
+    query = TrajectoryQuery(args.output_dir)
+    if args.as_of is not None:
+        result = query.as_of(args.evaluation, args.as_of)
+    elif args.between is not None:
+        result = query.between(args.evaluation, *args.between)
+    else:
+        result = query.first_crossing(args.evaluation, args.first_crossing)
+    print(json.dumps(result, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,245 @@
+"""
+Columnar, appendable storage for saturation trajectories.
+
+A trajectory is a directory with one row per sliding window, split over
+zstd-compressed Parquet parts:
+
+    results/saturation_trajectories/BBH_saturation_trajectory/
+        _metadata.json
+        part-00000.parquet
+        part-00001.parquet
+
+`_metadata.json` holds the run's parameters and summary fields and lists
+the parts in row order. When new submissions arrive after the stored ones,
+only their windows are written, as one more part. Parts are merged into
+one once there are more than MAX_PARTS of them. Readers load only the
+columns they ask for:
+
+    from analyzer.src.processing.trajectory_store import read_trajectory
+    table = read_trajectory(path, columns=["window_end_date", "S_index"])
+    df = table.to_pandas()
+
+pyarrow is only imported when trajectories are read or written.
+"""
+
+import json
+import os
+import re
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+from analyzer.src.processing.run_profile import profiled
+
+METADATA_FILE = "_metadata.json"
+FORMAT_VERSION = 1
+COMPRESSION = "zstd"
+MAX_PARTS = 64
+
+_PART_PATTERN = re.compile(r"^part-(\d+)\.parquet$")
+
+
+def _import_pyarrow():
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet  # noqa: F401
+    except ImportError as e:
+        raise ImportError(
+            "Parquet trajectories need pyarrow; install it with `pip install pyarrow` "
+            "or set trajectory_format = \"json\""
+        ) from e
+    return pa
+
+
+def _to_arrow(pa, values: Any):
+    # 2-D arrays (e.g. the top-N scores of every window) become list columns
+    if isinstance(values, np.ndarray) and values.ndim == 2:
+        rows, width = values.shape
+        offsets = pa.array(np.arange(0, rows * width + 1, width, dtype=np.int32))
+        return pa.ListArray.from_arrays(offsets, pa.array(values.ravel()))
+    return pa.array(values)
+
+
+class TrajectoryStore:
+    """
+    One evaluation's trajectory directory.
+
+    Parts are written before the metadata that lists them, and the metadata
+    is replaced atomically, so an interrupted write leaves the previous
+    trajectory readable. Parts not listed in the metadata are removed on the
+    next write.
+    """
+
+    def __init__(self, directory: str):
+        """
+        Initialize the store. The directory is created on first write.
+
+        Args:
+            directory: Trajectory directory
+        """
+        self.directory = directory
+
+    def read_metadata(self) -> Optional[Dict[str, Any]]:
+        """
+        Read the trajectory metadata.
+
+        Returns:
+            Dict, or None if there is no readable trajectory
+        """
+        path = os.path.join(self.directory, METADATA_FILE)
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                metadata = json.load(f)
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as e:
+            print(f"Warning: Ignoring unreadable trajectory metadata {path}: {e}")
+            return None
+        if metadata.get("format_version") != FORMAT_VERSION:
+            return None
+        return metadata
+
+    def read(self, columns: Optional[List[str]] = None, metadata: Optional[Dict[str, Any]] = None):
+        """
+        Read the windows.
+
+        Args:
+            columns: Columns to load (None loads every column)
+            metadata: Metadata from read_metadata, to skip reading it again
+
+        Returns:
+            pyarrow.Table: One row per window, in window order
+
+        Raises:
+            FileNotFoundError: If there is no trajectory in the directory
+        """
+        pa = _import_pyarrow()
+        metadata = metadata or self.read_metadata()
+        if metadata is None:
+            raise FileNotFoundError(f"No trajectory in {self.directory}")
+        tables = [
+            # ParquetFile skips the dataset discovery read_table does per call
+            pa.parquet.ParquetFile(os.path.join(self.directory, part)).read(columns=columns)
+            for part in metadata["parts"]
+        ]
+        if not tables:
+            return pa.table({name: [] for name in columns or []})
+        return pa.concat_tables(tables)
+
+    def last_window(self, metadata: Optional[Dict[str, Any]] = None) -> Optional[Dict[str, Any]]:
+        """
+        Read the last stored window.
+
+        Args:
+            metadata: Metadata from read_metadata, to skip reading it again
+
+        Returns:
+            Dict of the window's columns, or None if no windows are stored
+        """
+        pa = _import_pyarrow()
+        metadata = metadata or self.read_metadata()
+        if not metadata or not metadata["parts"]:
+            return None
+        table = pa.parquet.ParquetFile(os.path.join(self.directory, metadata["parts"][-1])).read()
+        if table.num_rows == 0:
+            return None
+        return table.slice(table.num_rows - 1).to_pylist()[0]
+
+    @profiled("trajectory_write")
+    def write(
+        self,
+        windows: Optional[Dict[str, Any]],
+        metadata: Dict[str, Any],
+        append: bool = False,
+    ) -> None:
+        """
+        Store windows and metadata.
+
+        Args:
+            windows: Column name -> values for the new windows (1-D arrays or
+                lists, or 2-D arrays for list columns), or None to only
+                update the metadata
+            metadata: Trajectory metadata; "parts" and "format_version" are set here
+            append: Add the windows after the stored ones instead of replacing them
+        """
+        pa = _import_pyarrow()
+        os.makedirs(self.directory, exist_ok=True)
+
+        stored = self.read_metadata() if append else None
+        parts = list(stored["parts"]) if stored else []
+
+        if windows is not None:
+            table = pa.table({name: _to_arrow(pa, values) for name, values in windows.items()})
+            if len(parts) >= MAX_PARTS:
+                # Merge everything into one part rather than growing the list
+                table = pa.concat_tables([self.read(metadata=stored), table])
+                parts = []
+            part = f"part-{self._next_part_number():05d}.parquet"
+            tmp_path = os.path.join(self.directory, part + ".tmp")
+            pa.parquet.write_table(table, tmp_path, compression=COMPRESSION)
+            os.replace(tmp_path, os.path.join(self.directory, part))
+            parts.append(part)
+
+        metadata = dict(metadata, parts=parts, format_version=FORMAT_VERSION)
+        path = os.path.join(self.directory, METADATA_FILE)
+        with open(path + ".tmp", "w", encoding="utf-8") as f:
+            json.dump(metadata, f, indent=2)
+        os.replace(path + ".tmp", path)
+
+        self._remove_unlisted(parts)
+
+    def _part_files(self) -> List[str]:
+        return [name for name in os.listdir(self.directory) if _PART_PATTERN.match(name)]
+
+    def _next_part_number(self) -> int:
+        numbers = [int(_PART_PATTERN.match(name).group(1)) for name in self._part_files()]
+        return max(numbers, default=-1) + 1
+
+    def _remove_unlisted(self, parts: List[str]) -> None:
+        listed = set(parts)
+        for name in self._part_files():
+            if name not in listed:
+                os.unlink(os.path.join(self.directory, name))
+
+
+def trajectory_path(output_dir: str, eval_name: str, suffix: str = "") -> str:
+    """
+    Path of an evaluation's trajectory directory (or, with a suffix, file).
+
+    Args:
+        output_dir: Trajectory output directory
+        eval_name: Evaluation name
+        suffix: File suffix, e.g. ".json" for JSON trajectories
+
+    Returns:
+        str: `{output_dir}/{eval_name}_saturation_trajectory{suffix}`, spaces replaced
+    """
+    filename = f"{eval_name.replace(' ', '_')}_saturation_trajectory{suffix}"
+    return os.path.join(output_dir, filename)
+
+
+def read_trajectory(directory: str, columns: Optional[List[str]] = None):
+    """
+    Read a stored trajectory.
+
+    Args:
+        directory: Trajectory directory (the metric's trajectory_file_path)
+        columns: Columns to load (None loads every column)
+
+    Returns:
+        pyarrow.Table: One row per window; call .to_pandas() for a DataFrame
+    """
+    return TrajectoryStore(directory).read(columns)
+
+
+def read_trajectory_metadata(directory: str) -> Optional[Dict[str, Any]]:
+    """
+    Read a stored trajectory's metadata.
+
+    Args:
+        directory: Trajectory directory
+
+    Returns:
+        Dict, or None if there is no trajectory
+    """
+    return TrajectoryStore(directory).read_metadata()
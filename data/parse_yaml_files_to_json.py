@@ -1,24 +1,58 @@
-import yaml
+import argparse
 import json
 import os
-from pathlib import Path
 import re
+import shutil
+import sys
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import yaml
+
+DATASET_START = re.compile(r"^datasetId:\s+")
 
+TAG_FIELDS = [
+    "language_from_tags",
+    "license_from_tags",
+    "size_categories_from_tags",
+    "format_from_tags",
+    "modality_from_tags",
+    "library_from_tags",
+    "region_from_tags",
+]
 
-def parse_yaml_files_to_json():
+
+def parse_yaml_files_to_json(
+    output_format="json", output_file=None, max_workers=None, arrow_file=None
+):
     """
     Parse all YAML files from the split_yaml folder and convert them to JSON format
     where datasetId is the key and the rest of the fields are the values.
+
+    Each part file is parsed in its own worker process and streamed, block by
+    block, into a JSON Lines shard, so memory stays bounded no matter how many
+    datasets the parts hold. The shards are then concatenated into the output:
+    either a single JSON object (the historical all_datasets.json layout) or
+    JSON Lines with one record per line. When a datasetId appears more than
+    once, the last occurrence wins, as before.
+
+    Args:
+        output_format: "json" or "jsonl"
+        output_file: Output path (defaults to all_datasets.json / all_datasets.jsonl
+            next to this script)
+        max_workers: Number of worker processes (None uses every core)
+        arrow_file: If set, also export the result as a compact Arrow IPC
+            catalog (see analyzer/src/processing/catalog_arrow.py)
     """
 
     # Define paths
     # Use relative path based on script location
     script_dir = Path(__file__).parent
     split_yaml_dir = script_dir / "split_yaml"
-    output_file = script_dir / "all_datasets.json"
-
-    # Dictionary to store all datasets with datasetId as key
-    all_datasets = {}
+    if output_file is None:
+        output_file = script_dir / f"all_datasets.{output_format}"
+    output_file = Path(output_file)
 
     # Get all YAML files in the split_yaml directory
     yaml_files = sorted(split_yaml_dir.glob("all_dataset_info_part*.yaml"))
@@ -27,144 +61,258 @@ def parse_yaml_files_to_json():
     for file in yaml_files:
         print(f"  - {file.name}")
 
-    # Process each YAML file
-    for yaml_file in yaml_files:
-        print(f"\nProcessing {yaml_file.name}...")
-
+    shard_dir = Path(tempfile.mkdtemp(prefix="all_datasets_", dir=str(output_file.parent)))
+    try:
+        shard_paths = [shard_dir / f"{yaml_file.stem}.jsonl" for yaml_file in yaml_files]
+
+        # Parse every part file in parallel, each into its own shard
+        with ProcessPoolExecutor(max_workers=max_workers) as pool:
+            part_results = list(
+                pool.map(parse_yaml_file, yaml_files, shard_paths)
+            )
+
+        # Resolve duplicates across shards: the last occurrence of an id wins
+        last_occurrence = {}
+        for shard_index, result in enumerate(part_results):
+            for dataset_id, offset in zip(result["dataset_ids"], result["offsets"]):
+                if dataset_id in last_occurrence:
+                    print(f"  Warning: Duplicate datasetId found: {dataset_id}")
+                last_occurrence[dataset_id] = (shard_index, offset)
+
+        print(f"\nSaving {len(last_occurrence)} datasets to {output_file}...")
         try:
-            with open(yaml_file, "r", encoding="utf-8") as f:
-                content = f.read()
-
-            # Split content by dataset entries (each starts with "datasetId:" at beginning of line)
-            dataset_blocks = []
-            current_block = []
-
-            lines = content.split("\n")
-            for line in lines:
-                # Check if this line starts a new dataset (datasetId at start of line, not indented)
-                if re.match(r"^datasetId:\s+", line) and current_block:
-                    # Save previous dataset block, removing empty lines at start/end
-                    block_content = "\n".join(current_block).strip()
-                    if block_content:
-                        dataset_blocks.append(block_content)
-                    current_block = [line]
-                else:
-                    current_block.append(line)
+            stats = write_output(shard_paths, last_occurrence, output_file, output_format)
+            print(f"Successfully saved {len(last_occurrence)} datasets to {output_file}")
+        except Exception as e:
+            print(f"Error saving to {output_format.upper()} file: {str(e)}")
+            return
+    finally:
+        shutil.rmtree(shard_dir, ignore_errors=True)
+
+    # Print some statistics
+    print(f"\nStatistics:")
+    print(f"  Total datasets: {len(last_occurrence)}")
+
+    # Show datasets with task_categories to verify the fix
+    print(f"  Datasets with task_categories: {stats['with_task_categories']}")
+
+    # Show statistics for parsed tag fields
+    for field in TAG_FIELDS:
+        print(f"  Datasets with {field}: {stats['tag_field_counts'][field]}")
 
-            # Don't forget the last block
-            if current_block:
+    # Show a sample dataset with task_categories
+    if stats["sample"] is not None:
+        sample_id, sample_dataset = stats["sample"]
+        print(f"\nSample dataset with task_categories ({sample_id}):")
+        print(f"  task_categories: {sample_dataset.get('task_categories')}")
+        print(f"  language_from_tags: {sample_dataset.get('language_from_tags')}")
+        print(f"  license_from_tags: {sample_dataset.get('license_from_tags')}")
+
+    if arrow_file is not None:
+        export_arrow(output_file, arrow_file)
+
+
+def export_arrow(catalog_file, arrow_file):
+    """Export a built catalog to Arrow IPC, with heavy text fields in a side file."""
+    # The exporter lives in the analyzer package; make the project root importable
+    sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+    from analyzer.src.processing.catalog import DatasetCatalog
+    from analyzer.src.processing.catalog_arrow import export_catalog_arrow, heavy_path_for
+
+    print(f"\nExporting Arrow catalog to {arrow_file}...")
+    count = export_catalog_arrow(DatasetCatalog(str(catalog_file)), str(arrow_file))
+    print(f"Exported {count} datasets (heavy fields in {heavy_path_for(str(arrow_file))})")
+
+
+def iter_dataset_blocks(yaml_file):
+    """
+    Lazily split a YAML part file into dataset blocks.
+
+    Each block starts with a "datasetId:" line at the beginning of a line.
+    Only the block being assembled is held in memory.
+    """
+    current_block = []
+    with open(yaml_file, "r", encoding="utf-8") as f:
+        for line in f:
+            line = line.rstrip("\n")
+            # Check if this line starts a new dataset (datasetId at start of line, not indented)
+            if DATASET_START.match(line) and current_block:
+                # Emit previous dataset block, removing empty lines at start/end
                 block_content = "\n".join(current_block).strip()
                 if block_content:
-                    dataset_blocks.append(block_content)
+                    yield block_content
+                current_block = [line]
+            else:
+                current_block.append(line)
 
-            print(f"  Found {len(dataset_blocks)} dataset blocks in {yaml_file.name}")
+    # Don't forget the last block
+    if current_block:
+        block_content = "\n".join(current_block).strip()
+        if block_content:
+            yield block_content
 
-            # Parse each dataset block as YAML
-            for i, block in enumerate(dataset_blocks):
-                try:
-                    # Clean the block - remove any document separators or invalid characters
-                    cleaned_block = block.strip()
 
-                    if not cleaned_block:
-                        continue
+def parse_dataset_block(block):
+    """
+    Parse one dataset block, falling back from the manual parser to YAML.
 
-                    # Try manual parsing first for better control
-                    try:
-                        dataset = parse_dataset_manually(cleaned_block)
-                        if not dataset or "datasetId" not in dataset:
-                            # Fall back to YAML parsing if manual parsing fails
-                            dataset = yaml.safe_load(cleaned_block)
-                    except Exception:
-                        # If manual parsing fails, try YAML parsing
-                        try:
-                            dataset = yaml.safe_load(cleaned_block)
-                        except yaml.scanner.ScannerError:
-                            # If YAML parsing also fails due to document separators, try FullLoader
-                            try:
-                                dataset = yaml.load(
-                                    cleaned_block, Loader=yaml.FullLoader
-                                )
-                            except:
-                                print(f"  Skipping block {i+1}: Unable to parse")
-                                continue
-
-                    if dataset and isinstance(dataset, dict) and "datasetId" in dataset:
-                        dataset_id = dataset["datasetId"]
-
-                        # Parse tags into separate key-value pairs
-                        if "tags" in dataset and isinstance(dataset["tags"], list):
-                            parsed_tags = parse_tags_to_fields(dataset["tags"])
-
-                            # Add parsed tag fields to the dataset
-                            for key, value in parsed_tags.items():
-                                # Only add if the field doesn't already exist or is None
-                                if key not in dataset or dataset[key] is None:
-                                    dataset[key] = value
-
-                            # Keep only non-metadata tags in the tags field
-                            remaining_tags = parsed_tags.get("remaining_tags", [])
-                            dataset["tags"] = remaining_tags if remaining_tags else None
-
-                        if dataset_id in all_datasets:
-                            print(f"  Warning: Duplicate datasetId found: {dataset_id}")
-
-                        all_datasets[dataset_id] = dataset
+    Returns:
+        dict: The dataset with tag fields split out, or None if unparseable
+    """
+    # Try manual parsing first for better control
+    try:
+        dataset = parse_dataset_manually(block)
+        if not dataset or "datasetId" not in dataset:
+            # Fall back to YAML parsing if manual parsing fails
+            dataset = yaml.safe_load(block)
+    except Exception:
+        # If manual parsing fails, try YAML parsing
+        try:
+            dataset = yaml.safe_load(block)
+        except yaml.scanner.ScannerError:
+            # If YAML parsing also fails due to document separators, try FullLoader
+            try:
+                dataset = yaml.load(block, Loader=yaml.FullLoader)
+            except Exception:
+                return None
+
+    if not (dataset and isinstance(dataset, dict) and "datasetId" in dataset):
+        return None
+
+    # Parse tags into separate key-value pairs
+    if "tags" in dataset and isinstance(dataset["tags"], list):
+        parsed_tags = parse_tags_to_fields(dataset["tags"])
+
+        # Add parsed tag fields to the dataset
+        for key, value in parsed_tags.items():
+            # Only add if the field doesn't already exist or is None
+            if key not in dataset or dataset[key] is None:
+                dataset[key] = value
+
+        # Keep only non-metadata tags in the tags field
+        remaining_tags = parsed_tags.get("remaining_tags", [])
+        dataset["tags"] = remaining_tags if remaining_tags else None
 
+    return dataset
+
+
+def parse_yaml_file(yaml_file, shard_path):
+    """
+    Parse one YAML part file into a JSON Lines shard. Runs in a worker process.
+
+    Returns:
+        dict: The datasetIds in shard order and the byte offset of each line
+    """
+    print(f"\nProcessing {Path(yaml_file).name}...")
+    result = {"dataset_ids": [], "offsets": []}
+    num_blocks = 0
+
+    try:
+        with open(shard_path, "wb") as out:
+            for i, block in enumerate(iter_dataset_blocks(yaml_file)):
+                num_blocks += 1
+                try:
+                    dataset = parse_dataset_block(block)
+                    if dataset is None:
+                        print(f"  Skipping block {i+1}: Unable to parse")
+                        continue
+                    line = json.dumps(dataset, ensure_ascii=False).encode("utf-8")
                 except Exception as e:
                     print(f"  Error processing block {i+1}: {str(e)}")
                     continue
 
-        except Exception as e:
-            print(f"  Error processing {yaml_file.name}: {str(e)}")
-            continue
+                result["dataset_ids"].append(dataset["datasetId"])
+                result["offsets"].append(out.tell())
+                out.write(line + b"\n")
+    except Exception as e:
+        print(f"  Error processing {Path(yaml_file).name}: {str(e)}")
+
+    print(
+        f"  Parsed {len(result['dataset_ids'])} of {num_blocks} dataset blocks "
+        f"in {Path(yaml_file).name}"
+    )
+    return result
+
 
-    # Save to JSON file
-    print(f"\nSaving {len(all_datasets)} datasets to {output_file}...")
+def iter_shard_records(shard_paths, last_occurrence):
+    """
+    Yield each surviving record once, in order of first appearance.
 
+    Like assigning into a dict, a duplicated datasetId keeps the position of
+    its first occurrence and the value of its last one, which is read back
+    from its shard by offset.
+    """
+    handles = {}
+    emitted = set()
     try:
-        with open(str(output_file), "w", encoding="utf-8") as f:
-            json.dump(all_datasets, f, indent=2, ensure_ascii=False)
-
-        print(f"Successfully saved {len(all_datasets)} datasets to {output_file}")
-
-        # Print some statistics
-        print(f"\nStatistics:")
-        print(f"  Total datasets: {len(all_datasets)}")
-
-        # Show datasets with task_categories to verify the fix
-        datasets_with_task_categories = {
-            k: v
-            for k, v in all_datasets.items()
-            if v.get("task_categories") is not None
-        }
-        print(f"  Datasets with task_categories: {len(datasets_with_task_categories)}")
-
-        # Show statistics for parsed tag fields
-        tag_fields = [
-            "language_from_tags",
-            "license_from_tags",
-            "size_categories_from_tags",
-            "format_from_tags",
-            "modality_from_tags",
-            "library_from_tags",
-            "region_from_tags",
-        ]
-
-        for field in tag_fields:
-            count = sum(1 for d in all_datasets.values() if d.get(field) is not None)
-            print(f"  Datasets with {field}: {count}")
-
-        # Show a sample dataset with task_categories
-        if datasets_with_task_categories:
-            sample_id = list(datasets_with_task_categories.keys())[0]
-            sample_dataset = datasets_with_task_categories[sample_id]
-            print(f"\nSample dataset with task_categories ({sample_id}):")
-            print(f"  task_categories: {sample_dataset.get('task_categories')}")
-            print(f"  language_from_tags: {sample_dataset.get('language_from_tags')}")
-            print(f"  license_from_tags: {sample_dataset.get('license_from_tags')}")
+        for shard_index, shard_path in enumerate(shard_paths):
+            if not os.path.exists(shard_path):
+                continue
+            with open(shard_path, "rb") as f:
+                offset = 0
+                for line in f:
+                    line_offset, offset = offset, offset + len(line)
+                    record = json.loads(line)
+                    dataset_id = record["datasetId"]
+                    if dataset_id in emitted:
+                        continue
+                    emitted.add(dataset_id)
+
+                    last_shard, last_offset = last_occurrence[dataset_id]
+                    if (last_shard, last_offset) != (shard_index, line_offset):
+                        if last_shard not in handles:
+                            handles[last_shard] = open(shard_paths[last_shard], "rb")
+                        handle = handles[last_shard]
+                        handle.seek(last_offset)
+                        line = handle.readline()
+                        record = json.loads(line)
+                    yield dataset_id, record, line
+    finally:
+        for handle in handles.values():
+            handle.close()
+
+
+def write_output(shard_paths, last_occurrence, output_file, output_format):
+    """
+    Stream the shards into the final output file, replacing it atomically.
 
-    except Exception as e:
-        print(f"Error saving to JSON file: {str(e)}")
+    "json" writes the same indent=2 object layout json.dump would produce,
+    one record at a time; "jsonl" writes one record per line.
+
+    Returns:
+        dict: Summary statistics over the written records
+    """
+    if output_format not in ("json", "jsonl"):
+        raise ValueError(f"Unknown output format {output_format!r}")
+
+    stats = {
+        "with_task_categories": 0,
+        "tag_field_counts": {field: 0 for field in TAG_FIELDS},
+        "sample": None,
+    }
+    tmp_file = output_file.with_name(output_file.name + ".tmp")
+    with open(tmp_file, "w", encoding="utf-8") as f:
+        first = True
+        for dataset_id, record, line in iter_shard_records(shard_paths, last_occurrence):
+            if output_format == "jsonl":
+                f.write(line.decode("utf-8"))
+            else:
+                body = json.dumps(record, indent=2, ensure_ascii=False).replace("\n", "\n  ")
+                f.write("{\n  " if first else ",\n  ")
+                f.write(f"{json.dumps(dataset_id, ensure_ascii=False)}: {body}")
+            first = False
+
+            if record.get("task_categories") is not None:
+                stats["with_task_categories"] += 1
+                if stats["sample"] is None:
+                    stats["sample"] = (dataset_id, record)
+            for field in TAG_FIELDS:
+                if record.get(field) is not None:
+                    stats["tag_field_counts"][field] += 1
+        if output_format == "json":
+            f.write("{}" if first else "\n}")
+    os.replace(tmp_file, output_file)
+    return stats
 
 
 def parse_tags_to_fields(tags):
@@ -367,5 +515,39 @@ def parse_simple_value(value):
         return value
 
 
+def main():
+    parser = argparse.ArgumentParser(
+        description="Build the dataset metadata catalog from split_yaml/all_dataset_info_part*.yaml"
+    )
+    parser.add_argument(
+        "--format",
+        choices=["json", "jsonl"],
+        default="json",
+        help="json: one object keyed by datasetId (default); jsonl: one record per line",
+    )
+    parser.add_argument("--output", default=None, help="Output file path")
+    parser.add_argument(
+        "--workers", type=int, default=None, help="Worker processes (default: all cores)"
+    )
+    parser.add_argument(
+        "--arrow",
+        nargs="?",
+        const="",
+        default=None,
+        metavar="PATH",
+        help="Also export an Arrow IPC catalog (default path: all_datasets.arrow)",
+    )
+    args = parser.parse_args()
+    arrow_file = None
+    if args.arrow is not None:
+        arrow_file = args.arrow or Path(__file__).parent / "all_datasets.arrow"
+    parse_yaml_files_to_json(
+        output_format=args.format,
+        output_file=args.output,
+        max_workers=args.workers,
+        arrow_file=arrow_file,
+    )
+
+
 if __name__ == "__main__":
-    parse_yaml_files_to_json()
+    main()
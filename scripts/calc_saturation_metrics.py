@@ -19,15 +19,34 @@ Adds columns:
 - R_norm                     ((s1 - s5) / SE_delta)
 - Saturation Index           (exp(-(R_norm**2)))
 
+With --bootstrap N, also adds (percentile intervals over N binomial resamples):
+- Saturation Index CI low / Saturation Index CI high
+- R_norm CI low / R_norm CI high
+- Category stability         (share of resamples in the point estimate's category)
+
 Notes:
 - Assumes scores are in percentage points (0..100). Converts to proportions (0..1) for SE.
 - Saturation Index is only computed when all 5 scores are present and n_test_used is valid.
+- The formula itself lives in analyzer.src.metrics.dynamic.saturation_utils
+  (compute_saturation_metrics_batch) and is shared with the analyzer metrics.
 """
 
 import argparse
+import sys
+from pathlib import Path
+
 import numpy as np
 import pandas as pd
 
+# Add project root to Python path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from analyzer.src.metrics.dynamic.saturation_utils import (
+    bootstrap_saturation_metrics_batch,
+    compute_saturation_metrics_batch,
+)
+
 
 def to_numeric_n_test(series: pd.Series) -> pd.Series:
     """
@@ -91,6 +110,25 @@ def main():
         default=0.5,
         help="Exponent for effective test size n_eff = n**alpha (default: 0.5 => sqrt(n))",
     )
+    ap.add_argument(
+        "--bootstrap",
+        type=int,
+        default=0,
+        help="Resamples for confidence intervals on the Saturation Index (default: 0, off)",
+    )
+    ap.add_argument(
+        "--confidence",
+        type=float,
+        default=0.95,
+        help="Coverage of the bootstrap intervals (default: 0.95)",
+    )
+    ap.add_argument("--seed", type=int, default=0, help="Bootstrap seed (default: 0)")
+    ap.add_argument(
+        "--workers",
+        type=int,
+        default=None,
+        help="Processes for the bootstrap on large inputs (default: run inline)",
+    )
     args = ap.parse_args()
 
     df = pd.read_csv(args.inp)
@@ -147,32 +185,42 @@ def main():
     s5 = df["top model 5"] / 100.0
     n = df["n_test_used"]
 
-    # Validity for SE computations
-    valid_n = n.notna() & (n > 0)
-    valid_scores = has_all5 & s1.notna() & s5.notna()
-
-    # Effective test size to reduce n impact
-    # (alpha=0.5 => sqrt(n))
-    n_eff = np.where(valid_n, np.power(n, args.alpha), np.nan)
-
     # Clip proportions to [0,1] to avoid negative SE from bad data
     s1c = s1.clip(0.0, 1.0)
     s5c = s5.clip(0.0, 1.0)
 
-    # SE_delta = sqrt( s1(1-s1)/n_eff + s5(1-s5)/n_eff )
-    se_delta = np.sqrt((s1c * (1.0 - s1c)) / n_eff + (s5c * (1.0 - s5c)) / n_eff)
+    # Rows without all five scores are left out of the saturation metrics
+    s1c = s1c.where(has_all5)
+    s5c = s5c.where(has_all5)
 
+    # n_eff = n**alpha (alpha=0.5 => sqrt(n))
+    # SE_delta = sqrt( s1(1-s1)/n_eff + s5(1-s5)/n_eff )
     # R_norm = (s1 - s5) / SE_delta
-    delta = (s1c - s5c)
-
-    # Avoid divide-by-zero
-    safe = valid_scores & valid_n & np.isfinite(se_delta) & (se_delta > 0)
-
-    df["SE_delta"] = np.where(safe, se_delta, np.nan)
-    df["R_norm"] = np.where(safe, delta / se_delta, np.nan)
-
     # Saturation Index = exp(-(R_norm^2))
-    df["Saturation Index"] = np.where(safe, np.exp(-(df["R_norm"] ** 2)), np.nan)
+    metrics = compute_saturation_metrics_batch(
+        s1c.to_numpy(), s5c.to_numpy(), n.to_numpy(), alpha=args.alpha
+    )
+
+    df["SE_delta"] = metrics["se_delta"]
+    df["R_norm"] = metrics["r_norm"]
+    df["Saturation Index"] = metrics["s_index"]
+
+    if args.bootstrap:
+        intervals = bootstrap_saturation_metrics_batch(
+            s1c.to_numpy(),
+            s5c.to_numpy(),
+            n.to_numpy(),
+            n_resamples=args.bootstrap,
+            alpha=args.alpha,
+            confidence=args.confidence,
+            seed=args.seed,
+            max_workers=args.workers,
+        )
+        df["Saturation Index CI low"] = intervals["s_index_low"]
+        df["Saturation Index CI high"] = intervals["s_index_high"]
+        df["R_norm CI low"] = intervals["r_norm_low"]
+        df["R_norm CI high"] = intervals["r_norm_high"]
+        df["Category stability"] = intervals["category_stability"]
 
     df.to_csv(args.out, index=False)
 
@@ -0,0 +1,45 @@
+"""
+Deprecated DataFrame view of Dataset metadata.
+"""
+
+import pandas as pd
+import pytest
+
+from analyzer.src.metrics.base import Dataset, DatasetMetadata
+
+
+class PlainDataset(Dataset):
+    def refresh(self):
+        pass
+
+    def download(self):
+        return {}
+
+    def process(self, data):
+        self.metadata = DatasetMetadata.from_dict(data)
+        return self.metadata
+
+
+def test_data_is_a_deprecated_copy():
+    dataset = PlainDataset(name="boolq")
+    dataset.process({"total_samples": 500, "source": "catalog"})
+
+    with pytest.warns(DeprecationWarning):
+        frame = dataset.data
+    assert frame.to_dict("records") == [dataset.metadata.to_dict()]
+
+    frame["total_samples"] = 1
+    assert dataset.metadata.total_samples == 500
+
+
+def test_data_setter_takes_one_row_only():
+    dataset = PlainDataset(name="boolq")
+
+    with pytest.warns(DeprecationWarning):
+        dataset.data = pd.DataFrame([{"total_samples": 500, "source": "catalog"}])
+    assert dataset.metadata.total_samples == 500
+    assert dataset.metadata.extra == {"source": "catalog"}
+
+    with pytest.warns(DeprecationWarning), pytest.raises(ValueError):
+        dataset.data = pd.DataFrame([{"total_samples": 500}, {"total_samples": 600}])
+    assert dataset.metadata.total_samples == 500
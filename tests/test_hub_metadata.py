@@ -0,0 +1,209 @@
+"""
+Hub metadata refresher against a local stub HF_ENDPOINT.
+
+The stub serves GET /api/datasets/<id> on a background thread, answers
+conditional requests with 304 when the validators match, and logs every
+request, so the tests can check what was sent and how often.
+"""
+
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import unquote, urlparse
+
+import pytest
+
+from analyzer.src.metrics.base import Dataset, DatasetMetadata
+from analyzer.src.processing.hub_metadata import HubMetadataRefresher, refresh_datasets
+from analyzer.src.processing.metric_history import InMemoryHistory
+
+LAST_MODIFIED = "Wed, 01 Oct 2025 00:00:00 GMT"
+HUB_DATASETS = {
+    "cais/mmlu": {"downloads": 100, "likes": 10, "trendingScore": 1.5, "lastModified": "2025-10-01T00:00:00.000Z"},
+    "google/boolq": {"downloads": 200, "likes": 20, "trendingScore": 0.5, "lastModified": "2025-09-01T00:00:00.000Z"},
+}
+
+
+class StubHub:
+    """Hub stand-in; set `throttle` to answer that many requests with 429."""
+
+    def __init__(self):
+        self.datasets = {key: dict(value) for key, value in HUB_DATASETS.items()}
+        self.requests = []
+        self.throttle = 0
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                hf_dataset_id = unquote(urlparse(self.path).path[len("/api/datasets/"):])
+                stub.requests.append((hf_dataset_id, self.headers.get("If-None-Match"), self.headers.get("If-Modified-Since")))
+                if stub.throttle:
+                    stub.throttle -= 1
+                    self._reply(429, {"Retry-After": "0"})
+                elif hf_dataset_id not in stub.datasets:
+                    self._reply(404)
+                else:
+                    etag = f'"{hf_dataset_id}-{stub.datasets[hf_dataset_id]["downloads"]}"'
+                    headers = {"ETag": etag, "Last-Modified": LAST_MODIFIED}
+                    if self.headers.get("If-None-Match") == etag:
+                        self._reply(304, headers)
+                    else:
+                        self._reply(200, headers, stub.datasets[hf_dataset_id])
+
+            def _reply(self, status, headers=None, body=None):
+                payload = json.dumps(body).encode() if body is not None else b""
+                self.send_response(status)
+                for key, value in (headers or {}).items():
+                    self.send_header(key, value)
+                if status != 304:
+                    self.send_header("Content-Type", "application/json")
+                    self.send_header("Content-Length", str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def log_message(self, *args):
+                pass
+
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.url = f"http://127.0.0.1:{self._server.server_address[1]}"
+
+    def start(self):
+        threading.Thread(target=self._server.serve_forever, args=(0.05,), daemon=True).start()
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+
+@pytest.fixture
+def hub(monkeypatch):
+    server = StubHub()
+    server.start()
+    monkeypatch.setenv("HF_ENDPOINT", server.url)
+    for var in ("ANALYZER_OFFLINE", "HF_DATASETS_OFFLINE", "HF_HUB_OFFLINE"):
+        monkeypatch.delenv(var, raising=False)
+    yield server
+    server.stop()
+
+
+@pytest.fixture
+def refresher(hub, tmp_path):
+    refresher = HubMetadataRefresher(token="", overlay_path=str(tmp_path / "hub_metadata.json"))
+    yield refresher
+    refresher.close()
+
+
+class HubDataset(Dataset):
+    def refresh(self):
+        pass
+
+    def download(self):
+        return {}
+
+    def process(self, data):
+        self.metadata = DatasetMetadata()
+        return self.metadata
+
+
+class CountingHistory(InMemoryHistory):
+    def __init__(self):
+        super().__init__()
+        self.writes = []
+
+    def append(self, metric_name, target_id, timestamp, value):
+        self.writes.append((metric_name, 1))
+        super().append(metric_name, target_id, timestamp, value)
+
+    def append_many(self, metric_name, entries):
+        entries = list(entries)
+        self.writes.append((metric_name, len(entries)))
+        for target_id, timestamp, value in entries:
+            super().append(metric_name, target_id, timestamp, value)
+
+
+def test_fetches_and_stores_fields(refresher, hub, tmp_path):
+    results = refresher.refresh(["cais/mmlu", "google/boolq", "missing/dataset"])
+
+    assert results["cais/mmlu"] == {
+        "downloads": 100,
+        "likes": 10,
+        "trending_score": 1.5,
+        "last_modified": "2025-10-01T00:00:00.000Z",
+    }
+    assert results["google/boolq"]["downloads"] == 200
+    assert results["missing/dataset"] is None
+    assert all(etag is None and since is None for _, etag, since in hub.requests)
+
+    # The overlay is persisted for later processes
+    reloaded = HubMetadataRefresher(token="", overlay_path=str(tmp_path / "hub_metadata.json"))
+    assert reloaded.get("cais/mmlu") == results["cais/mmlu"]
+
+
+def test_revalidates_with_etag_and_last_modified(refresher, hub):
+    refresher.refresh(["cais/mmlu"])
+    hub.requests.clear()
+
+    assert refresher.refresh(["cais/mmlu"])["cais/mmlu"]["downloads"] == 100
+    assert hub.requests == [("cais/mmlu", '"cais/mmlu-100"', LAST_MODIFIED)]
+
+    # A changed dataset gets a new ETag and a full response
+    hub.datasets["cais/mmlu"]["downloads"] = 150
+    assert refresher.refresh(["cais/mmlu"])["cais/mmlu"]["downloads"] == 150
+    assert refresher.get("cais/mmlu")["downloads"] == 150
+
+
+def test_retries_rate_limited_requests(refresher, hub):
+    hub.throttle = 2
+
+    assert refresher.refresh(["google/boolq"])["google/boolq"]["likes"] == 20
+    assert len(hub.requests) == 3
+
+
+def test_offline_serves_the_overlay(refresher, hub, monkeypatch):
+    refresher.refresh(["cais/mmlu"])
+    hub.requests.clear()
+    monkeypatch.setenv("ANALYZER_OFFLINE", "1")
+
+    results = refresher.refresh(["cais/mmlu", "google/boolq"])
+
+    assert results == {"cais/mmlu": refresher.get("cais/mmlu"), "google/boolq": None}
+    assert hub.requests == []
+
+
+def test_refresh_datasets_writes_history_in_one_batch(refresher, hub):
+    datasets = []
+    for name, hf_dataset_id in [("mmlu", "cais/mmlu"), ("boolq", "google/boolq"), ("local", None)]:
+        dataset = HubDataset(name=name, hf_dataset_id=hf_dataset_id)
+        dataset.process({})
+        datasets.append(dataset)
+    history = CountingHistory()
+
+    results = refresh_datasets(datasets, refresher=refresher, history=history)
+
+    assert set(results) == {"mmlu", "boolq"}
+    assert datasets[0].metadata.downloads == 100
+    assert datasets[1].metadata.likes == 20
+    # One write per metric, covering both refreshed datasets
+    assert sorted(history.writes) == [
+        ("dataset_downloads", 2),
+        ("dataset_freshness", 2),
+        ("dataset_likes", 2),
+        ("trending_score", 2),
+    ]
+
+
+def test_sweep_decay_follows_refreshed_history(refresher, hub):
+    # Imported here so the other tests don't load the registry
+    from analyzer.src.automation.sweep import CatalogSweep, default_metrics
+    from analyzer.src.leaderboards.catalog_dataset import CatalogDataset
+
+    adapter = HubDataset(name="mmlu", hf_dataset_id="cais/mmlu")
+    adapter.process({})
+    history = InMemoryHistory()
+    refresh_datasets([adapter], refresher=refresher, history=history)
+
+    # The sweep's CatalogDataset is a different class and name for the same Hub dataset
+    sweep = CatalogSweep(metrics=default_metrics(history), saturation_targets={})
+    columns = sweep.compute_batch([CatalogDataset.from_record("cais/mmlu", {"downloads": 75})])
+
+    assert columns["popularity_decay"] == [0.25]
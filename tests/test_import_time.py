@@ -0,0 +1,68 @@
+"""
+Import-time budget for the analyzer CLI.
+
+A saturation-only run (registry runner, leaderboard adapters and the
+saturation metrics) must start without loading pandas, `datasets`, pyarrow
+or the HTTP clients; those are imported by the code paths that need them.
+Each check runs in a fresh interpreter so earlier imports can't hide a
+regression.
+"""
+
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+
+# Seconds; override on slow machines with ANALYZER_IMPORT_BUDGET
+IMPORT_BUDGET_SECONDS = float(os.environ.get("ANALYZER_IMPORT_BUDGET", "0.5"))
+
+HEAVY_MODULES = ("pandas", "datasets", "pyarrow", "requests", "aiohttp", "dotenv", "scipy")
+
+SATURATION_RUN_IMPORTS = """
+import json, sys, time
+start = time.perf_counter()
+from analyzer.src.automation.registry import import_object, load_config
+for leaderboard_id in ("helm", "hf_openllm_v2"):
+    config = load_config(leaderboard_id)
+    for spec in config["datasets"]:
+        import_object(spec["class"])
+    import_object(config["leaderboard"]["class"])
+for path in (
+    "analyzer.src.metrics.dynamic.top_n_models_metric:TopNModelsMetric",
+    "analyzer.src.metrics.dynamic.is_saturated_metric:IsSaturatedMetric",
+    "analyzer.src.metrics.dynamic.saturation_index_metric:SaturationIndexMetric",
+    "analyzer.src.metrics.dynamic.temporal_saturation_metric:TemporalSaturationMetric",
+):
+    import_object(path)
+elapsed = time.perf_counter() - start
+print(json.dumps({"elapsed": elapsed, "modules": sorted(sys.modules)}))
+"""
+
+
+def _run_imports(code: str) -> dict:
+    result = subprocess.run(
+        [sys.executable, "-c", code],
+        cwd=PROJECT_ROOT,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def test_saturation_run_skips_heavy_dependencies():
+    loaded = set(_run_imports(SATURATION_RUN_IMPORTS)["modules"])
+    assert [module for module in HEAVY_MODULES if module in loaded] == []
+
+
+def test_saturation_run_import_budget():
+    # Best of three, so one slow start on a busy machine doesn't fail the run
+    elapsed = min(_run_imports(SATURATION_RUN_IMPORTS)["elapsed"] for _ in range(3))
+    assert elapsed < IMPORT_BUDGET_SECONDS, (
+        f"Importing a saturation-only run took {elapsed:.3f}s "
+        f"(budget {IMPORT_BUDGET_SECONDS}s)"
+    )
+
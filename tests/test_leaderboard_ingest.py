@@ -0,0 +1,94 @@
+"""
+Incremental leaderboard ingestion: resuming grown dumps and catching edits.
+
+The dumps are small hand-written JSONL files whose scores all have two
+decimals, so a score can be edited without changing the file size.
+"""
+
+import json
+import os
+
+import pytest
+
+from analyzer.src.processing.leaderboard_ingest import LeaderboardIngestor
+
+EVALUATION = "BBH"
+SCORES = [0.31, 0.42, 0.27, 0.55, 0.18, 0.63, 0.49, 0.36, 0.71, 0.24]
+
+
+def model_line(index, score):
+    record = {
+        "model_info": {"name": f"model-{index}", "id": f"org/model-{index}", "developer": "org"},
+        "evaluation_results": [{"evaluation_name": EVALUATION, "score_details": {"score": score}}],
+        "submission_date": f"2024-01-{index + 1:02d}",
+    }
+    return json.dumps(record) + "\n"
+
+
+def write_dump(path, lines):
+    with open(path, "w", encoding="utf-8") as f:
+        f.writelines(lines)
+    # Edits within one timestamp tick would otherwise look like an unchanged file
+    stat = os.stat(path)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+
+@pytest.fixture
+def dump(tmp_path):
+    path = tmp_path / "leaderboard.jsonl"
+    lines = [model_line(index, score) for index, score in enumerate(SCORES)]
+    write_dump(path, lines)
+    return path, lines
+
+
+@pytest.fixture
+def ingestor(dump, tmp_path):
+    ingestor = LeaderboardIngestor(str(dump[0]), store_path=str(tmp_path / "ingest.sqlite"), top_n=3)
+    yield ingestor
+    ingestor.close()
+
+
+def top_scores(ingestor):
+    return [model["score"] for model in ingestor.top_n_models(EVALUATION)]
+
+
+def test_same_size_edit_is_rescanned(dump, ingestor):
+    path, lines = dump
+    assert ingestor.ingest().added == 10
+    assert top_scores(ingestor) == [0.71, 0.63, 0.55]
+    size = os.path.getsize(path)
+
+    write_dump(path, lines[:4] + [model_line(4, 0.99)] + lines[5:])
+    assert os.path.getsize(path) == size
+
+    report = ingestor.ingest()
+
+    assert report.resumed_at == 0
+    assert (report.parsed, report.changed, report.unchanged) == (1, 1, 9)
+    assert report.top_n_changed == [EVALUATION]
+    assert top_scores(ingestor) == [0.99, 0.71, 0.63]
+
+
+def test_appended_lines_resume_at_the_previous_end(dump, ingestor):
+    path, lines = dump
+    ingestor.ingest()
+    size = os.path.getsize(path)
+
+    write_dump(path, lines + [model_line(10, 0.95)])
+    report = ingestor.ingest()
+
+    assert report.resumed_at == size
+    assert (report.parsed, report.added) == (1, 1)
+    assert top_scores(ingestor) == [0.95, 0.71, 0.63]
+
+
+def test_edit_before_an_append_is_rescanned(dump, ingestor):
+    path, lines = dump
+    ingestor.ingest()
+
+    write_dump(path, lines[:4] + [model_line(4, 0.99)] + lines[5:] + [model_line(10, 0.15)])
+    report = ingestor.ingest()
+
+    assert report.resumed_at == 0
+    assert (report.parsed, report.added, report.changed) == (2, 1, 1)
+    assert top_scores(ingestor) == [0.99, 0.71, 0.63]
@@ -0,0 +1,261 @@
+"""
+Scale benchmarks for the leaderboard metrics.
+
+Runs TopNModelsMetric, IsSaturatedMetric, SaturationIndexMetric and
+TemporalSaturationMetric end to end, with hf_openllm_v2's configured
+parameters, on synthetic leaderboard dumps (see
+analyzer.src.processing.synthetic_leaderboard). Each run includes parsing
+the dump, and goes through run_on_leaderboard without the result cache. It
+is measured in a fresh interpreter, so one run's parsed tables or memory
+high-water mark can't leak into the next. A run records:
+
+- wall and CPU seconds
+- peak RSS, and its growth over the resident size before the run (MB)
+
+Environment variables:
+    ANALYZER_BENCH_SCALES: Comma-separated record counts (default "1000";
+        up to 10^7, which needs about 15 GB of disk for the dump)
+    ANALYZER_BENCH_OUTPUT: Write the measurements here as JSON
+    ANALYZER_BENCH_SEED: Generator seed (default 0)
+
+Usage:
+    ANALYZER_BENCH_SCALES=1000,10000,100000 python -m pytest tests/test_metric_benchmarks.py
+    python tests/test_metric_benchmarks.py --scales 1000 100000 --output bench.json
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence
+
+import pytest
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+
+LEADERBOARD_ID = "hf_openllm_v2"
+BENCHMARK_METRICS = ("top_5_models", "is_saturated", "saturation_index", "temporal_saturation")
+# Benchmark test sets get a fixed size so R_norm doesn't depend on the catalog
+TEST_SET_SIZE = 1000
+
+SCALES = [int(value) for value in os.environ.get("ANALYZER_BENCH_SCALES", "1000").split(",") if value]
+SEED = int(os.environ.get("ANALYZER_BENCH_SEED", "0"))
+
+BENCHMARK_RUN = """
+import json, os, resource, sys, time
+from analyzer.src.automation.registry import build_metrics, load_config
+from analyzer.src.metrics.base import Dataset, DatasetMetadata, Leaderboard
+
+args = json.loads(sys.argv[1])
+
+
+class BenchmarkDataset(Dataset):
+    def refresh(self):
+        pass
+
+    def download(self):
+        return {}
+
+    def process(self, data):
+        self.metadata = DatasetMetadata(total_samples=args["test_set_size"])
+        return self.metadata
+
+
+class BenchmarkLeaderboard(Leaderboard):
+    def refresh(self):
+        pass
+
+    def compute_rankings(self):
+        return None
+
+
+config = load_config(args["leaderboard"])
+config["leaderboard"] = dict(
+    config["leaderboard"], jsonl_path=args["jsonl_path"], output_dir=args["output_dir"]
+)
+leaderboard = BenchmarkLeaderboard(name="benchmark")
+dataset_to_eval_map = {}
+for spec in config["datasets"]:
+    dataset = BenchmarkDataset(name=spec["name"])
+    dataset.process({})
+    leaderboard.add_dataset(dataset)
+    dataset_to_eval_map[spec["name"]] = spec["eval_name"]
+(metric,) = build_metrics(config, dataset_to_eval_map, metrics=[args["metric"]])
+
+
+def current_rss_kb():
+    # The high-water mark may already include a transient peak from imports,
+    # so growth is measured from the resident size right before the run
+    with open("/proc/self/status") as f:
+        for line in f:
+            if line.startswith("VmRSS:"):
+                return int(line.split()[1])
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+
+baseline_kb = current_rss_kb()
+cpu_start = time.process_time()
+start = time.perf_counter()
+results = metric.run_on_leaderboard(leaderboard)
+wall = time.perf_counter() - start
+cpu = time.process_time() - cpu_start
+peak_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+print(json.dumps({
+    "wall_seconds": wall,
+    "cpu_seconds": cpu,
+    "peak_rss_mb": peak_kb / 1024,
+    "peak_rss_growth_mb": max(peak_kb - baseline_kb, 0) / 1024,
+    "datasets": len(results),
+    "missing": sorted(name for name, value in results.items() if value is None),
+}))
+"""
+
+
+def generate_dump(directory: Path, records: int, seed: int = SEED) -> Path:
+    """
+    Write the synthetic dump for one scale, with hf_openllm_v2's evaluations.
+
+    Args:
+        directory: Output directory
+        records: Number of records
+        seed: Generator seed
+
+    Returns:
+        Path: The JSONL file
+    """
+    # Imported here so collecting the tests doesn't load numpy or the registry
+    from analyzer.src.processing.synthetic_leaderboard import (
+        leaderboard_evaluations,
+        write_synthetic_leaderboard,
+    )
+
+    path = directory / f"synthetic_{records}_seed{seed}.jsonl"
+    if not path.exists():
+        write_synthetic_leaderboard(
+            str(path), records, evaluations=leaderboard_evaluations(LEADERBOARD_ID), seed=seed
+        )
+    return path
+
+
+def run_benchmark(metric: str, jsonl_path: Path, output_dir: Path) -> Dict[str, Any]:
+    """
+    Run one metric end to end on a dump in a fresh interpreter.
+
+    Args:
+        metric: Metric name in the leaderboard config
+        jsonl_path: Leaderboard dump
+        output_dir: Trajectory output directory
+
+    Returns:
+        Dict with wall_seconds, cpu_seconds, peak_rss_mb, peak_rss_growth_mb,
+        datasets and missing
+    """
+    args = {
+        "leaderboard": LEADERBOARD_ID,
+        "metric": metric,
+        "jsonl_path": str(jsonl_path),
+        "output_dir": str(output_dir),
+        "test_set_size": TEST_SET_SIZE,
+    }
+    env = dict(os.environ, METRIC_CACHE="off", METRIC_HISTORY_BACKEND="memory")
+    result = subprocess.run(
+        [sys.executable, "-c", BENCHMARK_RUN, json.dumps(args)],
+        cwd=PROJECT_ROOT,
+        env=env,
+        capture_output=True,
+        text=True,
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"Benchmark of {metric} failed:\n{result.stderr}")
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+TABLE_HEADER = f"{'records':>10}  {'metric':<20} {'wall s':>9} {'cpu s':>9} {'peak MB':>9} {'growth MB':>10}"
+
+
+def format_row(row: Dict[str, Any]) -> str:
+    """
+    Format one measurement as a line under TABLE_HEADER.
+
+    Args:
+        row: Measurement with records and metric keys
+
+    Returns:
+        str: The line
+    """
+    return (
+        f"{row['records']:>10,}  {row['metric']:<20} {row['wall_seconds']:>9.3f} "
+        f"{row['cpu_seconds']:>9.3f} {row['peak_rss_mb']:>9.1f} {row['peak_rss_growth_mb']:>10.1f}"
+    )
+
+
+_measurements: List[Dict[str, Any]] = []
+
+
+@pytest.fixture(scope="session")
+def dump_dir(tmp_path_factory):
+    return tmp_path_factory.mktemp("synthetic_leaderboards")
+
+
+@pytest.fixture(scope="session", autouse=True)
+def benchmark_report():
+    yield
+    output = os.environ.get("ANALYZER_BENCH_OUTPUT")
+    if output and _measurements:
+        with open(output, "w", encoding="utf-8") as f:
+            json.dump(_measurements, f, indent=2)
+
+
+def test_synthetic_dump_is_seeded(tmp_path):
+    paths = []
+    for name in ("first", "second"):
+        (tmp_path / name).mkdir()
+        paths.append(generate_dump(tmp_path / name, 200))
+    assert paths[0].read_bytes() == paths[1].read_bytes()
+    for line in paths[0].read_text(encoding="utf-8").splitlines():
+        record = json.loads(line)
+        assert set(record["model_info"]) >= {"name", "id", "developer"}
+        assert all(0.0 <= result["score_details"]["score"] <= 1.0 for result in record["evaluation_results"])
+
+
+@pytest.mark.parametrize("records", SCALES)
+@pytest.mark.parametrize("metric", BENCHMARK_METRICS)
+def test_metric_at_scale(metric, records, dump_dir, tmp_path):
+    jsonl_path = generate_dump(dump_dir, records)
+    measurement = run_benchmark(metric, jsonl_path, tmp_path / "trajectories")
+    _measurements.append(dict(measurement, metric=metric, records=records))
+    assert measurement["datasets"] > 0
+    assert measurement["missing"] == []
+
+
+def main(argv: Optional[Sequence[str]] = None):
+    """CLI entry point."""
+    parser = argparse.ArgumentParser(description="Benchmark the leaderboard metrics on synthetic dumps")
+    parser.add_argument("--scales", type=int, nargs="+", default=SCALES, help="Record counts")
+    parser.add_argument("--metrics", nargs="+", default=list(BENCHMARK_METRICS), choices=BENCHMARK_METRICS)
+    parser.add_argument("--dump-dir", default="results/benchmarks", help="Where to keep the dumps")
+    parser.add_argument("--seed", type=int, default=SEED, help="Generator seed")
+    parser.add_argument("--output", help="Write the measurements here as JSON")
+    args = parser.parse_args(argv)
+
+    dump_dir = Path(args.dump_dir)
+    dump_dir.mkdir(parents=True, exist_ok=True)
+    rows = []
+    print(TABLE_HEADER)
+    for records in args.scales:
+        jsonl_path = generate_dump(dump_dir, records, seed=args.seed)
+        for metric in args.metrics:
+            measurement = run_benchmark(metric, jsonl_path, dump_dir / f"trajectories_{records}")
+            rows.append(dict(measurement, metric=metric, records=records))
+            print(format_row(rows[-1]), flush=True)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(rows, f, indent=2)
+
+
+if __name__ == "__main__":
+    sys.path.insert(0, str(PROJECT_ROOT))
+    main()
@@ -0,0 +1,85 @@
+"""
+Columnar metric history: sorted parts, indexed reads and part merging.
+"""
+
+import datetime
+import os
+
+import pytest
+
+pa = pytest.importorskip("pyarrow")
+import pyarrow.ipc  # noqa: E402
+
+from analyzer.src.processing import metric_history  # noqa: E402
+from analyzer.src.processing.metric_history import ColumnarHistory  # noqa: E402
+
+DAY = datetime.datetime(2025, 1, 1)
+
+
+def day(offset):
+    return DAY + datetime.timedelta(days=offset)
+
+
+def read_part(path):
+    return pa.ipc.open_file(pa.memory_map(path, "r")).read_all()
+
+
+@pytest.fixture
+def history(tmp_path):
+    history = ColumnarHistory(str(tmp_path / "history"), flush_every=1000)
+    yield history
+    history.close()
+
+
+def test_range_and_latest_queries_across_parts(history):
+    # Three flushes, each appending the targets out of order
+    for offset in range(3):
+        history.append_many("downloads", [("hf:b", day(offset), 20 + offset), ("hf:a", day(offset), 10 + offset)])
+        history.append("likes", "hf:a", day(offset), offset)
+        history.flush()
+    history.append("downloads", "hf:a", day(3), 13)
+
+    assert history.query("downloads", "hf:a", start=day(1), end=day(2)) == [(day(1), 11), (day(2), 12)]
+    assert [value for _, value in history.query("downloads", "hf:a")] == [10, 11, 12, 13]
+    assert history.latest_values("downloads", ["hf:a", "hf:b", "hf:missing"]) == {
+        "hf:a": (day(3), 13),
+        "hf:b": (day(2), 22),
+    }
+    assert history.latest_timestamp("likes", "hf:a") == day(2)
+
+    for path in history._part_files():
+        rows = list(zip(*(read_part(path).column(name).to_pylist() for name in ("metric", "target", "ts"))))
+        assert rows == sorted(rows)
+
+
+def test_unsorted_legacy_parts_are_sorted_on_first_read(history):
+    os.makedirs(history.directory)
+    table = pa.table({
+        "metric": ["downloads", "downloads", "downloads"],
+        "target": ["hf:b", "hf:a", "hf:a"],
+        "ts": [day(0).isoformat(timespec="microseconds"), day(1).isoformat(timespec="microseconds"),
+               day(0).isoformat(timespec="microseconds")],
+        "value": ["2", "11", "10"],
+    })
+    path = os.path.join(history.directory, "part-legacy.arrow")
+    with pa.OSFile(path, "wb") as sink, pa.ipc.new_file(sink, table.schema) as writer:
+        writer.write_table(table)
+
+    assert history.query("downloads", "hf:a") == [(day(0), 10), (day(1), 11)]
+    assert read_part(path).column("target").to_pylist() == ["hf:a", "hf:a", "hf:b"]
+
+
+def test_parts_are_merged_past_the_limit(history, monkeypatch):
+    monkeypatch.setattr(metric_history, "MAX_PARTS", 3)
+    reader = ColumnarHistory(history.directory)
+    for offset in range(5):
+        history.append("downloads", "hf:a", day(offset), offset)
+        history.flush()
+        # The reader has indexed parts that later get merged away
+        assert reader.latest_timestamp("downloads", "hf:a") == day(offset)
+
+    assert len(history._part_files()) <= 3
+    assert not os.path.exists(os.path.join(history.directory, metric_history.MERGE_LOCK_NAME))
+    assert [value for _, value in history.query("downloads", "hf:a")] == [0, 1, 2, 3, 4]
+    assert reader.query("downloads", "hf:a") == history.query("downloads", "hf:a")
+    assert reader.latest_values("downloads", ["hf:a"]) == {"hf:a": (day(4), 4)}
@@ -0,0 +1,176 @@
+"""
+Semantic Scholar client and CitationMetric against a local stub server.
+
+The stub serves the two endpoints the client uses, POST /paper/batch and
+GET /paper/search/match, on a background thread and logs every request, so
+the tests can check how many requests a lookup took.
+"""
+
+import asyncio
+import csv
+import threading
+
+import pytest
+from aiohttp import web
+
+from analyzer.src.automation.runner import run_leaderboard
+from analyzer.src.metrics.base import Dataset, Leaderboard
+from analyzer.src.metrics.dynamic.citation_metric import CitationMetric
+from analyzer.src.processing.metric_history import InMemoryHistory
+from analyzer.src.processing.semantic_scholar import (
+    citation_counts_async,
+    fetch_citation_counts,
+    refresh_annotation_citations,
+)
+
+CITATIONS = {"p1": 10, "p2": 20, "p3": 30}
+TITLES = {"Paper One": "p1", "Paper Two": "p2"}
+
+
+class StubSemanticScholar:
+    """Semantic Scholar stand-in; set `throttle` to answer that many requests with 429."""
+
+    def __init__(self):
+        self.requests = []
+        self.throttle = 0
+        self.url = None
+        self._loop = asyncio.new_event_loop()
+        self._runner = None
+
+    async def _batch(self, request):
+        ids = (await request.json())["ids"]
+        self.requests.append(("batch", ids))
+        if self.throttle:
+            self.throttle -= 1
+            return web.Response(status=429, headers={"Retry-After": "0"})
+        return web.json_response(
+            [{"paperId": pid, "citationCount": CITATIONS[pid]} if pid in CITATIONS else None for pid in ids]
+        )
+
+    async def _match(self, request):
+        title = request.query["query"]
+        self.requests.append(("match", title))
+        if title not in TITLES:
+            return web.json_response({"error": "Title match not found"}, status=404)
+        return web.json_response({"data": [{"paperId": TITLES[title], "title": title}]})
+
+    def start(self):
+        app = web.Application()
+        app.router.add_post("/paper/batch", self._batch)
+        app.router.add_get("/paper/search/match", self._match)
+
+        async def serve():
+            self._runner = web.AppRunner(app)
+            await self._runner.setup()
+            site = web.TCPSite(self._runner, "127.0.0.1", 0)
+            await site.start()
+            port = site._server.sockets[0].getsockname()[1]
+            self.url = f"http://127.0.0.1:{port}"
+
+        threading.Thread(target=self._loop.run_forever, daemon=True).start()
+        asyncio.run_coroutine_threadsafe(serve(), self._loop).result()
+
+    def stop(self):
+        asyncio.run_coroutine_threadsafe(self._runner.cleanup(), self._loop).result()
+        self._loop.call_soon_threadsafe(self._loop.stop)
+
+
+@pytest.fixture
+def stub(tmp_path, monkeypatch):
+    server = StubSemanticScholar()
+    server.start()
+    monkeypatch.setenv("SEMANTIC_SCHOLAR_BASE_URL", server.url)
+    monkeypatch.setenv("SEMANTIC_SCHOLAR_CACHE_PATH", str(tmp_path / "semantic_scholar.json"))
+    monkeypatch.setenv("SEMANTIC_SCHOLAR_RPS", "1000")
+    monkeypatch.setenv("SEMANTIC_SCHOLAR_API_KEY", "")
+    yield server
+    server.stop()
+
+
+class PaperDataset(Dataset):
+    def refresh(self):
+        pass
+
+    def download(self):
+        return {}
+
+    def process(self, data):
+        return None
+
+
+class PaperLeaderboard(Leaderboard):
+    def refresh(self):
+        pass
+
+    def compute_rankings(self):
+        return None
+
+
+def test_batches_and_caches_lookups(stub):
+    assert fetch_citation_counts(["p1", "p2", "missing"]) == {"p1": 10, "p2": 20, "missing": None}
+    assert stub.requests == [("batch", ["p1", "p2", "missing"])]
+
+    # The second lookup is served from the cache
+    assert fetch_citation_counts(["p1", "p2"]) == {"p1": 10, "p2": 20}
+    assert len(stub.requests) == 1
+
+
+def test_retries_rate_limited_requests(stub):
+    stub.throttle = 2
+    assert fetch_citation_counts(["p3"], backoff_seconds=0) == {"p3": 30}
+    assert len(stub.requests) == 3
+
+
+def test_works_inside_a_running_loop(stub):
+    async def lookup():
+        sync_counts = fetch_citation_counts(["p1"], use_cache=False)
+        async_counts = await citation_counts_async(["p2"], use_cache=False)
+        return sync_counts, async_counts
+
+    assert asyncio.run(lookup()) == ({"p1": 10}, {"p2": 20})
+
+
+@pytest.mark.parametrize("executor", ["serial", "thread"])
+def test_registered_runs_send_one_batch(stub, executor):
+    leaderboard = PaperLeaderboard(name="papers")
+    for index, paper_id in enumerate(["p1", "p2", "p3"]):
+        leaderboard.add_dataset(
+            PaperDataset(name=f"d{index}", paper_url=f"https://www.semanticscholar.org/paper/Title/{paper_id}")
+        )
+    leaderboard.add_dataset(PaperDataset(name="no_paper"))
+    metric = CitationMetric(name="citation_count", api_key="", history=InMemoryHistory())
+
+    results = run_leaderboard(leaderboard, [metric], executor=executor)
+
+    assert results == {"citation_count": {"d0": 10, "d1": 20, "d2": 30, "no_paper": None}}
+    assert stub.requests == [("batch", ["p1", "p2", "p3"])]
+    # The batch path records the counts in the history like other updatable metrics
+    latest = metric.history.latest_values("citation_count", ["PaperDataset:d0", "PaperDataset:d2"])
+    assert {target: value for target, (_, value) in latest.items()} == {
+        "PaperDataset:d0": 10,
+        "PaperDataset:d2": 30,
+    }
+
+
+def test_refreshes_annotation_sheet(stub, tmp_path):
+    sheet = tmp_path / "annotations.csv"
+    with open(sheet, "w", encoding="utf-8", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(["ID", "Name", "Paper Citations", "Notes"])
+        writer.writerow(["1", "Paper One", "1", "multi\nline"])
+        writer.writerow(["2", "Paper Two", "2", ""])
+        writer.writerow(["3", "Unknown Benchmark", "3", ""])
+    output = tmp_path / "refreshed.csv"
+
+    report = refresh_annotation_citations(str(sheet), str(output))
+
+    assert report == {"updated": 2, "not_found": 1}
+    with open(output, encoding="utf-8", newline="") as f:
+        rows = list(csv.DictReader(f))
+    assert [row["Paper Citations"] for row in rows] == ["10", "20", "3"]
+    assert rows[0]["Notes"] == "multi\nline"
+
+    # Resolved titles and counts are cached; only the unmatched title is retried
+    stub.requests.clear()
+    refresh_annotation_citations(str(sheet), str(output))
+    assert stub.requests == [("match", "Unknown Benchmark")]
@@ -0,0 +1,156 @@
+"""
+Temporal saturation trajectories and the results cached from them.
+
+The dumps are small hand-written JSONL files with one model per day, so
+later-dated models can be appended to the end of a dump. An appended
+trajectory must match one computed from scratch on the final dump.
+"""
+
+import json
+import os
+
+import pytest
+
+from analyzer.src.metrics.base import Dataset, DatasetMetadata
+from analyzer.src.metrics.dynamic.temporal_saturation_metric import TemporalSaturationMetric
+from analyzer.src.processing import trajectory_store
+from analyzer.src.processing.trajectory_store import read_trajectory, read_trajectory_metadata
+
+EVALUATION = "BBH"
+SCORES = [0.31, 0.42, 0.27, 0.55, 0.18, 0.63, 0.49, 0.36, 0.71, 0.24, 0.58, 0.45]
+
+
+def model_line(index, score):
+    record = {
+        "model_info": {"name": f"model-{index}", "id": f"org/model-{index}", "developer": "org"},
+        "evaluation_results": [{"evaluation_name": EVALUATION, "score_details": {"score": score}}],
+        "submission_date": f"2024-01-{index + 1:02d}",
+    }
+    return json.dumps(record) + "\n"
+
+
+def write_dump(path, lines):
+    with open(path, "w", encoding="utf-8") as f:
+        f.writelines(lines)
+    # Edits within one timestamp tick would otherwise reuse the parsed table
+    stat = os.stat(path)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+
+class BenchmarkDataset(Dataset):
+    def refresh(self):
+        pass
+
+    def download(self):
+        return {}
+
+    def process(self, data):
+        self.metadata = DatasetMetadata(total_samples=1000)
+        return self.metadata
+
+
+@pytest.fixture
+def dump(tmp_path):
+    path = tmp_path / "leaderboard.jsonl"
+    lines = [model_line(index, score) for index, score in enumerate(SCORES)]
+    write_dump(path, lines)
+    return path, lines
+
+
+@pytest.fixture
+def dataset():
+    dataset = BenchmarkDataset(name="bbh")
+    dataset.process({})
+    return dataset
+
+
+def make_metric(path, output_dir, **kwargs):
+    return TemporalSaturationMetric(
+        name="temporal_saturation",
+        jsonl_path=str(path),
+        dataset_to_eval_map={"bbh": EVALUATION},
+        output_dir=str(output_dir),
+        **kwargs,
+    )
+
+
+@pytest.mark.parametrize("trajectory_format", ["parquet", "json"])
+def test_cached_result_needs_its_own_trajectory(dump, dataset, tmp_path, trajectory_format):
+    path, lines = dump
+    metric = make_metric(path, tmp_path / "trajectories", trajectory_format=trajectory_format)
+    result = metric.run_on_dataset(dataset)
+    assert result["status"] == "success"
+    assert metric.accepts_cached(result)
+
+    # Other parameters, same output_dir: the trajectory is replaced
+    other = make_metric(path, tmp_path / "trajectories", trajectory_format=trajectory_format, top_n=6)
+    assert other.run_on_dataset(dataset)["status"] == "success"
+    assert not metric.accepts_cached(result)
+
+    # Back to the original parameters, but with a newer dump
+    write_dump(path, lines + [model_line(len(SCORES), 0.66)])
+    assert metric.run_on_dataset(dataset)["status"] == "success"
+    assert not metric.accepts_cached(result)
+
+
+def stored_trajectory(result):
+    path = result["trajectory_file_path"]
+    return read_trajectory(path).to_pylist(), read_trajectory_metadata(path)["parts"]
+
+
+def from_scratch(path, dataset, tmp_path):
+    result = make_metric(path, tmp_path / "scratch").run_on_dataset(dataset)
+    return result, stored_trajectory(result)[0]
+
+
+def test_appended_models_add_one_part_each(dump, dataset, tmp_path):
+    path, lines = dump
+    metric = make_metric(path, tmp_path / "trajectories")
+    write_dump(path, lines[:8])
+    metric.run_on_dataset(dataset)
+
+    for end in (10, 12):
+        write_dump(path, lines[:end])
+        result = metric.run_on_dataset(dataset)
+
+    windows, parts = stored_trajectory(result)
+    assert len(parts) == 3
+    expected_result, expected_windows = from_scratch(path, dataset, tmp_path)
+    assert windows == expected_windows
+    assert result["S_index"] == expected_result["S_index"]
+    assert result["time_to_saturation"] == expected_result["time_to_saturation"]
+
+
+def test_edited_earlier_model_rewrites_the_trajectory(dump, dataset, tmp_path):
+    path, lines = dump
+    metric = make_metric(path, tmp_path / "trajectories")
+    write_dump(path, lines[:10])
+    metric.run_on_dataset(dataset)
+
+    # Models are appended too, but the stored prefix no longer matches
+    write_dump(path, lines[:2] + [model_line(2, 0.99)] + lines[3:])
+    result = metric.run_on_dataset(dataset)
+
+    windows, parts = stored_trajectory(result)
+    assert len(parts) == 1
+    assert windows == from_scratch(path, dataset, tmp_path)[1]
+    assert max(windows[-1]["top_n_scores"]) == 0.99
+
+
+def test_parts_are_merged_past_max_parts(dump, dataset, tmp_path, monkeypatch):
+    monkeypatch.setattr(trajectory_store, "MAX_PARTS", 2)
+    path, lines = dump
+    metric = make_metric(path, tmp_path / "trajectories")
+    write_dump(path, lines[:8])
+    metric.run_on_dataset(dataset)
+
+    part_counts = []
+    for end in range(9, 13):
+        write_dump(path, lines[:end])
+        result = metric.run_on_dataset(dataset)
+        part_counts.append(len(stored_trajectory(result)[1]))
+
+    assert part_counts == [2, 1, 2, 1]
+    # Merged-away parts are removed from the directory
+    assert sorted(os.listdir(result["trajectory_file_path"])) == ["_metadata.json", "part-00004.parquet"]
+    assert stored_trajectory(result)[0] == from_scratch(path, dataset, tmp_path)[1]